@@ -0,0 +1,12 @@
+"""
+Performance benchmarks for gcoordinator. Run the modules with ``python -m benchmarks.<name>``
+from the repository root:
+
+  suite               - timed stages of synthetic workloads with JSON baselines
+  bench_gcode_format  - G1 text emitter throughput, before/after
+  bench_kinematics    - BedRotate/BedTiltBC subdivision and extrusion throughput
+  bench_offset        - Transform.offset on 10k-vertex outlines, before/after
+  bench_bgcode        - .bgcode size reduction, encode throughput and round trip
+  bench_compression   - .gcode.gz/.xz/.bz2 output of GCode.save, size and throughput
+  bench_arc_fitting   - G2/G3 arc fitting of Cartesian paths, removed lines and time
+"""
@@ -0,0 +1,61 @@
+"""
+Benchmark of the G2/G3 arc fitting of Cartesian paths (Path.arc_tolerance).
+
+Generates the G-code of the cylinder workload with and without arc fitting and
+prints the number of lines, the number of arcs, the total extrusion and the
+generation time. The totals differ slightly, because the E values of the many
+G1 lines are rounded to 5 decimals one by one.
+
+Usage::
+
+    python -m benchmarks.bench_arc_fitting [--size small|medium|large] [--tolerance 0.01]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import gcoordinator as gc
+from benchmarks.suite     import write_settings
+from benchmarks.workloads import SIZES, WORKLOADS
+
+
+def total_extrusion(txt):
+    return sum(float(value) for value in re.findall(r'^G[123] [^\n]* E(-?[\d.]+)', txt, re.M))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', choices=list(SIZES), default='large')
+    parser.add_argument('--tolerance', type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name in ('start_gcode.txt', 'end_gcode.txt'):
+                open(name, 'w').close()
+            gc.load_settings(write_settings(directory, 'Cartesian'))
+            workload = WORKLOADS['cylinder'](args.size, 'Cartesian')
+            workload.build_walls()
+            workload.build_infill()
+            gcode = gc.GCode(workload.full_object)
+
+            print(f'{"arc_tolerance":<15}{"lines":>12}{"arcs":>10}{"lines removed":>16}{"E total":>12}{"time [s]":>10}')
+            for tolerance in (None, args.tolerance):
+                for path in gcode.full_object:
+                    path.arc_tolerance = tolerance
+                start = time.perf_counter()
+                txt = ''.join(gcode.iter_chunks())
+                seconds = time.perf_counter() - start
+                info = gcode.arc_fitting_info
+                print(f'{str(tolerance):<15}{txt.count(chr(10)):>12,}{info["arcs"]:>10,}'
+                      f'{info["lines_removed"]:>16,}{total_extrusion(txt):>12.3f}{seconds:>10.2f}')
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
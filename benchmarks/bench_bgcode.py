@@ -0,0 +1,70 @@
+"""
+Benchmark of the binary G-code (.bgcode) writer.
+
+Generates the G-code of a gyroid-infilled cylinder, encodes it as .bgcode with
+every combination of MeatPack encoding and Deflate compression, checks that the
+decoded file round-trips to the same text and prints the size reduction and the
+encode throughput.
+
+Usage::
+
+    python -m benchmarks.bench_bgcode [--size small|medium|large]
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import gcoordinator as gc
+from gcoordinator.bgcode  import BGCodeWriter, decode_bgcode, settings_metadata
+from gcoordinator.settings import template_settings
+from benchmarks.suite     import write_settings
+from benchmarks.workloads import SIZES, WORKLOADS
+
+
+def generate_text(size):
+    # the G-code text of the gyroid_infill workload, as GCode.save would write it
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name in ('start_gcode.txt', 'end_gcode.txt'):
+                open(name, 'w').close()
+            gc.load_settings(write_settings(directory, 'Cartesian'))
+            workload = WORKLOADS['gyroid_infill'](size, 'Cartesian')
+            workload.build_walls()
+            workload.build_infill()
+            return ''.join(gc.GCode(workload.full_object).iter_chunks())
+        finally:
+            os.chdir(cwd)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', choices=list(SIZES), default='medium')
+    args = parser.parse_args(argv)
+
+    text = generate_text(args.size)
+    print(f'G-code text: {len(text.encode()):,} bytes')
+    print(f'{"encoding":<10}{"compression":<13}{"file [bytes]":>14}{"ratio":>8}{"encode [MB/s]":>16}')
+    for encoding in ('meatpack', 'none'):
+        for compression in ('deflate', 'none'):
+            buffer = io.BytesIO()
+            writer = BGCodeWriter(buffer, settings_metadata(template_settings),
+                                  encoding=encoding, compression=compression)
+            start = time.perf_counter()
+            for offset in range(0, len(text), gc.GCode.CHUNK_SIZE):
+                writer.write(text[offset:offset + gc.GCode.CHUNK_SIZE])
+            writer.close()
+            seconds = time.perf_counter() - start
+            decoded = decode_bgcode(buffer.getvalue())['gcode']
+            if decoded.rstrip('\n') != text.rstrip('\n'):
+                raise AssertionError(f'{encoding}/{compression}: the decoded G-code differs')
+            info = writer.info()
+            print(f'{encoding:<10}{compression:<13}{info["file_bytes"]:>14,}{info["ratio"]:>8.3f}'
+                  f'{info["text_bytes"] / seconds / 1e6:>16.1f}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Benchmark of the compressed G-code output of GCode.save.
+
+Saves the G-code of a gyroid-infilled cylinder as plain text and as .gcode.gz,
+.gcode.xz and .gcode.bz2 at several compression levels, checks that every file
+decompresses to the plain text and prints the size reduction and the compression
+throughput (GCode.save_info).
+
+Usage::
+
+    python -m benchmarks.bench_compression [--size small|medium|large]
+"""
+import os
+import bz2
+import sys
+import gzip
+import lzma
+import time
+import argparse
+import tempfile
+import gcoordinator as gc
+from benchmarks.suite     import write_settings
+from benchmarks.workloads import SIZES, WORKLOADS
+
+
+CODECS = {
+    'gzip': ('.gcode.gz',  gzip.open, (1, 6, 9)),
+    'xz'  : ('.gcode.xz',  lzma.open, (0, 3, 6)),
+    'bz2' : ('.gcode.bz2', bz2.open,  (1, 9)),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', choices=list(SIZES), default='medium')
+    args = parser.parse_args(argv)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name in ('start_gcode.txt', 'end_gcode.txt'):
+                open(name, 'w').close()
+            gc.load_settings(write_settings(directory, 'Cartesian'))
+            workload = WORKLOADS['gyroid_infill'](args.size, 'Cartesian')
+            workload.build_walls()
+            workload.build_infill()
+            gcode = gc.GCode(workload.full_object)
+
+            start = time.perf_counter()
+            gcode.save('plain.gcode')
+            plain_seconds = time.perf_counter() - start
+            with open('plain.gcode', 'rb') as f:
+                text = f.read()
+            print(f'plain text: {len(text):,} bytes, saved in {plain_seconds:.2f} s')
+            print(f'{"codec":<7}{"level":>6}{"file [bytes]":>14}{"ratio":>8}{"compress [MB/s]":>18}{"save [s]":>10}')
+            for codec, (extension, open_function, levels) in CODECS.items():
+                for level in levels:
+                    file_path = 'out' + extension
+                    start = time.perf_counter()
+                    gcode.save(file_path, compression_level=level)
+                    seconds = time.perf_counter() - start
+                    with open_function(file_path, 'rb') as f:
+                        if f.read() != text:
+                            raise AssertionError(f'{codec} {level}: the decompressed G-code differs')
+                    info = gcode.save_info
+                    print(f'{codec:<7}{level:>6}{info["file_bytes"]:>14,}{info["ratio"]:>8.3f}'
+                          f'{info["throughput"] / 1e6:>18.1f}{seconds:>10.2f}')
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Benchmark of the G1 text emitter used by the kinematics classes.
+
+Compares the former per-segment f-string concatenation with the batched
+``format_g1_block`` for every kinematics, checks that both produce the same
+bytes and prints the throughput in lines per second.
+
+Usage::
+
+    python -m benchmarks.bench_gcode_format [n_lines]
+"""
+import sys
+import time
+import numpy as np
+from gcoordinator.settings            import template_settings
+from gcoordinator.utils.gcode_format  import format_g1_block
+
+
+def legacy_format(feed, axes, extrusion):
+    # the loop the kinematics classes used before format_g1_block
+    txt = ''
+    for i in range(len(extrusion)):
+        txt += f'G1 F{feed} '
+        for word, values in axes:
+            txt += f'{word}{values[i]:.5f} '
+        txt += f'E{extrusion[i]:.5f}\n'
+    return txt
+
+
+def build_axes(kinematics, n_lines):
+    rng  = np.random.default_rng(0)
+    x    = rng.uniform(-100, 100, n_lines) + 100
+    y    = rng.uniform(-100, 100, n_lines) + 100
+    z    = rng.uniform(0, 200, n_lines)
+    rot  = rng.uniform(-np.pi, np.pi, n_lines)
+    tilt = rng.uniform(-np.pi/4, np.pi/4, n_lines)
+    axes = [('X', x), ('Y', y), ('Z', z)]
+    kin_settings = template_settings['Kinematics']
+    if kinematics == 'NozzleTilt' or kinematics == 'BedTiltBC':
+        axes.append((kin_settings[kinematics]['tilt_code'], tilt))
+        axes.append((kin_settings[kinematics]['rot_code'],  rot))
+    elif kinematics == 'BedRotate':
+        axes.append((kin_settings[kinematics]['rot_code'], rot))
+    return axes, rng.uniform(0, 0.1, n_lines)
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(n_lines=200_000):
+    feed = template_settings['Print']['speed']['print_speed']
+    print(f'{"kinematics":<12}{"before [lines/s]":>20}{"after [lines/s]":>20}{"speedup":>10}')
+    for kinematics in ['Cartesian', 'NozzleTilt', 'BedRotate', 'BedTiltBC']:
+        axes, extrusion = build_axes(kinematics, n_lines)
+        before, t_before = measure(legacy_format, feed, axes, extrusion)
+        after,  t_after  = measure(format_g1_block, feed, axes, extrusion)
+        if before != after:
+            raise AssertionError(f'{kinematics}: batched output differs from the legacy output')
+        print(f'{kinematics:<12}{n_lines/t_before:>20,.0f}{n_lines/t_after:>20,.0f}{t_before/t_after:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,54 @@
+"""
+Benchmark of the subdividing kinematics (BedRotate, BedTiltBC).
+
+Times update_attrs, which subdivides every segment in the bed frame and
+computes the normals, and calculate_extrusion for helical paths of 10^5 to
+10^6 input points and prints the throughput in input points per second.
+
+Usage::
+
+    python -m benchmarks.bench_kinematics [n_points ...]
+"""
+import sys
+import time
+import types
+import numpy as np
+from gcoordinator.kinematics.kin_bed_rotate  import BedRotate
+from gcoordinator.kinematics.kin_bed_tilt_bc import BedTiltBC
+
+
+def helix(n_points):
+    # a helix of radius 20 mm with ~0.5 mm between points, the bed turning
+    # and tilting slowly along the path
+    arg = np.arange(n_points) * 0.5 / 20
+    return types.SimpleNamespace(
+        x    = 20 * np.cos(arg),
+        y    = 20 * np.sin(arg),
+        z    = np.linspace(0.2, 100, n_points),
+        rot  = 0.02 * np.sin(arg / 100),
+        tilt = 0.02 * np.cos(arg / 100),
+        segment_extrusion_multiplier = None,
+        extrusion_multiplier = 1.0,
+        nozzle_diameter      = 0.4,
+        layer_height         = 0.2,
+        filament_diameter    = 1.75,
+    )
+
+
+def main(sizes=(100_000, 1_000_000)):
+    print(f'{"kinematics":<12}{"points":>10}{"sub-points":>12}{"update_attrs [pts/s]":>24}{"extrusion [pts/s]":>20}')
+    for kinematics in [BedRotate, BedTiltBC]:
+        for n_points in sizes:
+            path = helix(n_points)
+            start = time.perf_counter()
+            kinematics.update_attrs(path)
+            t_attrs = time.perf_counter() - start
+            start = time.perf_counter()
+            kinematics.calculate_extrusion(path)
+            t_extrusion = time.perf_counter() - start
+            print(f'{kinematics.__name__:<12}{n_points:>10,}{len(path.coords):>12,}'
+                  f'{n_points/t_attrs:>24,.0f}{n_points/t_extrusion:>20,.0f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or (100_000, 1_000_000))
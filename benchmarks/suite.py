@@ -0,0 +1,169 @@
+"""
+Benchmark suite covering Path construction, infill, sorting, G-code output and
+preview payload encoding for every kinematics.
+
+Each stage of each workload is timed (best of --repeat runs) and reported in
+seconds. The 'infill' stage runs with the infill geometry cache disabled, so
+that it measures the clipping and mask code; 'infill_cached' runs with the cache
+enabled and cleared before every run, i.e. one cold build of all layers. The results can be saved as a JSON baseline and compared against a
+previous baseline; the run fails with exit code 1 if any stage got slower than
+the baseline by more than --threshold (and --min-delta seconds).
+
+Usage::
+
+    python -m benchmarks.suite --size small --save baseline.json
+    python -m benchmarks.suite --size small --compare baseline.json --threshold 0.25
+    python -m benchmarks.suite --workload gyroid_infill --kinematics Cartesian BedRotate
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import gcoordinator as gc
+from gcoordinator.settings import template_settings
+from gcoordinator.preview  import build_preview_payload
+from benchmarks.workloads  import SIZES, WORKLOADS
+
+
+KINEMATICS = ['Cartesian', 'NozzleTilt', 'BedRotate', 'BedTiltBC']
+
+
+def write_settings(directory, kinematics):
+    settings = json.loads(json.dumps(template_settings))
+    settings['Hardware']['kinematics'] = kinematics
+    settings_path = os.path.join(directory, f'settings_{kinematics}.json')
+    with open(settings_path, 'w') as f:
+        json.dump(settings, f)
+    return settings_path
+
+
+def timed(func, repeat, setup=None):
+    # setup runs before every run and is not timed
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_workload(workload, settings_path, repeat):
+    """
+    Times every stage of a workload. Returns {stage: seconds}.
+    """
+    def save_gcode():
+        gcode = gc.GCode(workload.full_object)
+        gcode.start_gcode('start_gcode.txt')
+        gcode.end_gcode('end_gcode.txt')
+        gcode.save('benchmark.gcode')
+        # GCode.save removes the temporary config, restore it for the next stage
+        gc.load_settings(settings_path)
+
+    results = {}
+    results['path'] = timed(workload.build_walls, repeat)
+    if workload.infill is not None:
+        enabled = gc.infill_cache_info()['enabled']
+        gc.configure_infill_cache(enabled=False)
+        try:
+            results['infill'] = timed(workload.build_infill, repeat)
+        finally:
+            gc.configure_infill_cache(enabled=enabled)
+        results['infill_cached'] = timed(workload.build_infill, repeat, setup=gc.clear_infill_cache)
+        results['sort_paths']    = timed(workload.sort_paths, repeat)
+    else:
+        workload.build_infill()
+    results['gcode_save'] = timed(save_gcode, repeat)
+    results['preview_payload'] = timed(lambda: build_preview_payload(workload.full_object), repeat)
+    return results
+
+
+def run(size, workloads, kinematics_list, repeat):
+    """
+    Runs the selected workloads for each kinematics in a temporary directory.
+    Returns {'workload/kinematics/stage': seconds}.
+    """
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for name in ('start_gcode.txt', 'end_gcode.txt'):
+                open(name, 'w').close()
+            for kinematics in kinematics_list:
+                settings_path = write_settings(directory, kinematics)
+                gc.load_settings(settings_path)
+                for name in workloads:
+                    workload = WORKLOADS[name](size, kinematics)
+                    for stage, seconds in run_workload(workload, settings_path, repeat).items():
+                        key = f'{name}/{kinematics}/{stage}'
+                        results[key] = seconds
+                        print(f'{key:<48}{seconds:>10.4f} s', flush=True)
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def compare(results, baseline, threshold, min_delta):
+    """
+    Returns the list of stages that are slower than the baseline by more than threshold
+    (relative) and min_delta (absolute, in seconds), so that timer noise on very short
+    stages is not reported.
+    """
+    regressions = []
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        ratio = seconds / max(baseline[key], 1e-9)
+        if ratio > 1 + threshold and seconds - baseline[key] > min_delta:
+            regressions.append((key, baseline[key], seconds, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', choices=list(SIZES), default='small')
+    parser.add_argument('--workload', nargs='+', choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--kinematics', nargs='+', choices=KINEMATICS, default=KINEMATICS)
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per stage, the best is kept')
+    parser.add_argument('--save', metavar='JSON', help='save the results as a baseline')
+    parser.add_argument('--compare', metavar='JSON', help='compare the results against a baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown against the baseline (0.25 = 25%%)')
+    parser.add_argument('--min-delta', type=float, default=0.005,
+                        help='slowdowns smaller than this many seconds are never reported')
+    args = parser.parse_args(argv)
+
+    results = run(args.size, args.workload, args.kinematics, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'size'    : args.size,
+                'python'  : platform.python_version(),
+                'machine' : platform.machine(),
+                'results' : results,
+            }, f, indent=4)
+        print(f'baseline saved to {args.save}')
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if baseline['size'] != args.size:
+            print(f"baseline was recorded with --size {baseline['size']}")
+            return 2
+        regressions = compare(results, baseline['results'], args.threshold, args.min_delta)
+        for key, before, after, ratio in regressions:
+            print(f'REGRESSION {key}: {before:.4f} s -> {after:.4f} s ({ratio:.2f}x)')
+        if regressions:
+            return 1
+        print(f'no stage regressed by more than {args.threshold:.0%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
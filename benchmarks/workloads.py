@@ -0,0 +1,102 @@
+"""
+Parameterized synthetic workloads for the benchmark suite.
+
+Every workload is a function ``(size, kinematics) -> Workload`` whose stages build
+the walls, the infill and the sorted path lists of a model. Sizes scale the number
+of layers, the points per layer and the infill density.
+"""
+import numpy as np
+import gcoordinator as gc
+
+
+SIZES = {
+    'small' : dict(layers=5,  points=200,  infill_distance=2.0),
+    'medium': dict(layers=20, points=1000, infill_distance=1.0),
+    'large' : dict(layers=60, points=4000, infill_distance=0.5),
+}
+
+
+class Workload:
+    """
+    A synthetic model whose construction is split into timed stages.
+
+    Attributes:
+        name (str): The name of the workload.
+        walls (list): The wall paths, one per layer (set by build_walls).
+        full_object (list): The walls and the infill of every layer (set by build_infill).
+    """
+
+    def __init__(self, name, size, kinematics, infill=None, infill_kwargs=None):
+        self.name       = name
+        self.params     = SIZES[size]
+        self.kinematics = kinematics
+        self.infill     = infill
+        self.infill_kwargs = infill_kwargs or {}
+        self.walls       = []
+        self.full_object = []
+
+    def layer_coords(self, layer):
+        raise NotImplementedError
+
+    def build_walls(self):
+        """Stage 'path': constructs one Path per layer."""
+        self.walls = []
+        for layer in range(self.params['layers']):
+            x, y, z = self.layer_coords(layer)
+            if self.kinematics == 'Cartesian':
+                self.walls.append(gc.Path(x, y, z))
+            else:
+                # sweep the extra axes slowly along the wall
+                rot  = np.linspace(0, np.pi / 6, len(x))
+                tilt = np.linspace(0, np.pi / 12, len(x))
+                self.walls.append(gc.Path(x, y, z, rot=rot, tilt=tilt))
+
+    def build_infill(self):
+        """Stage 'infill': generates the infill of every layer."""
+        self.full_object = []
+        for wall in self.walls:
+            self.full_object.append(wall)
+            if self.infill is not None:
+                infill = getattr(gc.Infill, self.infill)(wall, infill_distance=self.params['infill_distance'],
+                                                         **self.infill_kwargs)
+                self.full_object.append(infill)
+
+    def sort_paths(self):
+        """Stage 'sort_paths': re-sorts the paths of every infill layer."""
+        for item in self.full_object:
+            if isinstance(item, gc.PathList):
+                item.sort_paths()
+            elif isinstance(item, gc.SegmentBundle):
+                item.sort_segments()
+
+
+class Cylinder(Workload):
+    def layer_coords(self, layer):
+        arg = np.linspace(0, 2 * np.pi, self.params['points'])
+        x = 40 * np.cos(arg)
+        y = 40 * np.sin(arg)
+        z = np.full_like(arg, (layer + 1) * 0.2)
+        return x, y, z
+
+
+class Spiral(Workload):
+    def layer_coords(self, layer):
+        # one turn of a continuous vase-mode spiral per layer
+        arg = np.linspace(0, 2 * np.pi, self.params['points'])
+        x = 40 * np.cos(arg)
+        y = 40 * np.sin(arg)
+        z = (layer + arg / (2 * np.pi)) * 0.2 + 0.2
+        return x, y, z
+
+
+WORKLOADS = {
+    'cylinder'        : lambda size, kinematics: Cylinder('cylinder', size, kinematics),
+    'spiral'          : lambda size, kinematics: Spiral('spiral', size, kinematics),
+    'line_infill'     : lambda size, kinematics: Cylinder('line_infill', size, kinematics, infill='line'),
+    'grid_infill'     : lambda size, kinematics: Cylinder('grid_infill', size, kinematics, infill='grid'),
+    'grid_bundle'     : lambda size, kinematics: Cylinder('grid_bundle', size, kinematics, infill='grid',
+                                                          infill_kwargs={'output': 'bundle'}),
+    'grid_zigzag'     : lambda size, kinematics: Cylinder('grid_zigzag', size, kinematics, infill='grid',
+                                                          infill_kwargs={'output': 'zigzag'}),
+    'gyroid_infill'   : lambda size, kinematics: Cylinder('gyroid_infill', size, kinematics, infill='gyroid'),
+}
@@ -1,7 +1,10 @@
-from gcoordinator.path_generator   import Path, PathList
+from gcoordinator.path_generator   import Path, PathList, SegmentBundle
+from gcoordinator.path_store       import PathStore
 from gcoordinator.path_transformer import Transform
 from gcoordinator.infill_generator import Infill, gyroid_infill, line_infill
+from gcoordinator.infill_generator import infill_cache_info, clear_infill_cache, configure_infill_cache
 from gcoordinator.gcode_generator  import GCode
 from gcoordinator.gui_export       import gui_export
-from gcoordinator.settings         import load_settings
-from gcoordinator.preview          import preview
\ No newline at end of file
+from gcoordinator.settings         import load_settings, reload_settings, settings_cache_info
+from gcoordinator.preview          import preview
+from gcoordinator.utils.geometry   import configure_precision
\ No newline at end of file
@@ -0,0 +1,409 @@
+"""
+Binary G-code (.bgcode) container writer and reader.
+
+A .bgcode file is a file header followed by blocks. Every block has a header
+(type, compression, sizes), its parameters (the encoding of the data), the data
+and a CRC32 checksum of all three:
+
+  file header     magic b'GCDE', version (uint32), checksum type (uint16)
+  block header    type (uint16), compression (uint16), uncompressed size (uint32)
+                  and compressed size (uint32, only if the block is compressed)
+  parameters      encoding (uint16)
+  data
+  checksum        CRC32 of header, parameters and data (uint32)
+
+All integers are little endian. The metadata blocks (file, printer, print and
+slicer metadata) hold ``key=value`` lines and are Deflate compressed. They are
+followed by the G-code blocks, each holding about BLOCK_SIZE bytes of G-code
+text. The G-code can be MeatPack encoded, which packs the most common
+characters of G-code (digits, '.', ' ', newline, 'G' and 'X') into 4 bits,
+and then Deflate compressed. Heatshrink compression is not implemented, the
+Deflate codec of the standard library is used instead.
+
+BGCodeWriter encodes the text written to it block by block, so that the
+G-code can be streamed into the file. decode_bgcode and load_bgcode read a
+file back (checking the checksums), e.g. to test a round trip.
+"""
+import time
+import zlib
+import struct
+import numpy as np
+
+
+MAGIC   = b'GCDE'
+VERSION = 1
+BLOCK_SIZE = 1 << 16 # size of the G-code text of one block, in bytes
+
+CHECKSUM_NONE, CHECKSUM_CRC32 = 0, 1
+FILE_METADATA, GCODE, SLICER_METADATA, PRINTER_METADATA, PRINT_METADATA, THUMBNAIL = range(6)
+COMPRESSION = {'none': 0, 'deflate': 1, 'heatshrink_11_4': 2, 'heatshrink_12_4': 3}
+ENCODING    = {'none': 0, 'meatpack': 1, 'meatpack_comments': 2}
+INI_ENCODING = 0
+
+# MeatPack: the 4-bit codes of the packable characters, 0b1111 means that the
+# character follows as a full byte
+_MEATPACK_CHARS = b'0123456789. \nGX'
+_FULL_CHAR      = 0b1111
+_SIGNAL_BYTE    = 0xFF
+_ENABLE_PACKING, _DISABLE_PACKING, _RESET_ALL = 0xFB, 0xFA, 0xF9
+_ENABLE_NO_SPACES, _DISABLE_NO_SPACES = 0xF7, 0xF6
+
+_meatpack_codes = np.full(256, _FULL_CHAR, dtype=np.uint8)
+_meatpack_codes[np.frombuffer(_MEATPACK_CHARS[:15], dtype=np.uint8)] = np.arange(15, dtype=np.uint8)
+
+
+def encode_meatpack(data: bytes) -> bytes:
+    """
+    MeatPack encodes G-code text. The result starts with the 'enable packing' command.
+
+    The characters are packed in pairs, the first one in the low nibble of a byte.
+    A character that has no 4-bit code is written as a full byte after the packed byte.
+    Each line (including its newline) is packed separately; a line of odd length is
+    padded after its newline, which the decoder skips. If the text does not end with a
+    newline and its last line has odd length, the last character is written unpacked
+    after the 'disable packing' command, so that the text decodes unchanged.
+
+    Args:
+        data (bytes): The G-code text, encoded as UTF-8 (or ASCII).
+
+    Returns:
+        bytes: The encoded data.
+    """
+    tail = b''
+    if (len(data) - data.rfind(b'\n') - 1) % 2 == 1:
+        data, tail = data[:-1], bytes([_SIGNAL_BYTE, _SIGNAL_BYTE, _DISABLE_PACKING]) + data[-1:]
+    chars = np.frombuffer(data, dtype=np.uint8)
+    # pad every line of odd length with a space after its newline
+    newlines = np.flatnonzero(chars == ord('\n'))
+    lengths  = np.diff(np.concatenate([[-1], newlines]))
+    chars    = np.insert(chars, newlines[lengths % 2 == 1] + 1, ord(' '))
+
+    codes = _meatpack_codes[chars]
+    first, second = codes[0::2], codes[1::2]
+    first_full  = first  == _FULL_CHAR
+    second_full = second == _FULL_CHAR
+    # output: the packed byte, then the full bytes of the pair, in order
+    size  = 1 + first_full.astype(np.int64) + second_full
+    start = np.cumsum(size) - size
+    out = np.empty(int(size.sum()), dtype=np.uint8)
+    out[start] = first | (second << 4)
+    out[start[first_full] + 1] = chars[0::2][first_full]
+    out[start[second_full] + size[second_full] - 1] = chars[1::2][second_full]
+    return bytes([_SIGNAL_BYTE, _SIGNAL_BYTE, _ENABLE_PACKING]) + out.tobytes() + tail
+
+
+def decode_meatpack(data: bytes) -> bytes:
+    """
+    Decodes MeatPack encoded data, following the reference decoder state machine
+    (including the 'no spaces' mode, in which the code of ' ' stands for 'E').
+
+    Args:
+        data (bytes): The encoded data.
+
+    Returns:
+        bytes: The G-code text.
+    """
+    out = bytearray()
+    active, no_spaces = False, False
+    signal_count, command_next = 0, False
+    full_count, pending = 0, None
+    table = list(_MEATPACK_CHARS)
+    for byte in data:
+        if command_next:
+            command_next = False
+            if byte == _ENABLE_PACKING:
+                active = True
+            elif byte == _DISABLE_PACKING:
+                active = False
+            elif byte == _RESET_ALL:
+                active, no_spaces = False, False
+            elif byte in (_ENABLE_NO_SPACES, _DISABLE_NO_SPACES):
+                no_spaces = byte == _ENABLE_NO_SPACES
+            table[11] = ord('E') if no_spaces else ord(' ')
+            continue
+        if full_count == 0 and byte == _SIGNAL_BYTE:
+            if signal_count:
+                command_next, signal_count = True, 0
+            else:
+                signal_count = 1
+            continue
+        # a single signal byte was a packed byte after all
+        received = [_SIGNAL_BYTE, byte] if signal_count else [byte]
+        signal_count = 0
+        for c in received:
+            if not active:
+                out.append(c)
+            elif full_count:
+                out.append(c)
+                if pending is not None:
+                    out.append(pending)
+                    pending = None
+                full_count -= 1
+            else:
+                low, high = c & 0x0F, c >> 4
+                if low == _FULL_CHAR:
+                    full_count += 1
+                    if high == _FULL_CHAR:
+                        full_count += 1
+                    else:
+                        pending = table[high]
+                else:
+                    out.append(table[low])
+                    # the character after a newline is padding
+                    if table[low] != ord('\n'):
+                        if high == _FULL_CHAR:
+                            full_count += 1
+                        else:
+                            out.append(table[high])
+    return bytes(out)
+
+
+class BGCodeWriter:
+    """
+    Writes a .bgcode file: the metadata blocks when it is created, then the G-code text
+    written to it in blocks of about block_size bytes. The blocks end at line ends.
+
+    Attributes:
+        text_bytes (int): The number of bytes of G-code text written so far.
+        file_bytes (int): The number of bytes written to the file so far.
+        blocks (int): The number of G-code blocks written so far.
+        encode_seconds (float): The time spent encoding and compressing.
+
+    Methods:
+        __init__(self, fileobj, metadata, encoding, compression, level, block_size, checksum): Writes the header and the metadata.
+        write(self, txt): Adds G-code text.
+        close(self): Writes the remaining text. The file object is not closed.
+        info(self): Returns the size reduction and the encode throughput.
+    """
+
+    def __init__(self, fileobj, metadata=None, encoding='meatpack', compression='deflate',
+                 level=6, block_size=BLOCK_SIZE, checksum=True):
+        """
+        Args:
+            fileobj: A binary file object opened for writing.
+            metadata (dict): {'file': dict, 'printer': dict, 'print': dict, 'slicer': dict},
+                the key-value pairs of each metadata block. Missing blocks are written empty,
+                except the file metadata block, which is optional.
+            encoding (str): The encoding of the G-code blocks, 'meatpack' or 'none'.
+            compression (str): The compression of the G-code blocks, 'deflate' or 'none'.
+            level (int): The Deflate compression level, 0-9.
+            block_size (int): The number of bytes of G-code text per block. A block ends at the
+                last line end within block_size bytes (or after a longer line).
+            checksum (bool): Whether every block carries a CRC32 checksum.
+        """
+        if encoding not in ('meatpack', 'none'):
+            raise ValueError("encoding must be 'meatpack' or 'none'")
+        if compression not in ('deflate', 'none'):
+            raise ValueError("compression must be 'deflate' or 'none'")
+        self.fileobj     = fileobj
+        self.encoding    = encoding
+        self.compression = compression
+        self.level       = level
+        self.block_size  = block_size
+        self.checksum    = checksum
+        self.text_bytes  = 0
+        self.file_bytes  = 0
+        self.blocks      = 0
+        self.encode_seconds = 0.0
+        self._parts = []
+        self._size  = 0
+
+        start = time.perf_counter()
+        metadata = metadata or {}
+        header = MAGIC + struct.pack('<IH', VERSION, CHECKSUM_CRC32 if checksum else CHECKSUM_NONE)
+        blocks = [header]
+        if metadata.get('file'):
+            blocks.append(self._metadata_block(FILE_METADATA, metadata['file']))
+        for block_type, key in ((PRINTER_METADATA, 'printer'), (PRINT_METADATA, 'print'),
+                                (SLICER_METADATA, 'slicer')):
+            blocks.append(self._metadata_block(block_type, metadata.get(key, {})))
+        self.encode_seconds += time.perf_counter() - start
+        self._emit(b''.join(blocks))
+
+    def write(self, txt: str) -> None:
+        data = txt.encode('utf-8')
+        self._parts.append(data)
+        self._size      += len(data)
+        self.text_bytes += len(data)
+        if self._size > self.block_size:
+            self._flush(final=False)
+
+    def close(self) -> None:
+        self._flush(final=True)
+
+    def info(self) -> dict:
+        """
+        Returns:
+            dict: {'format', 'text_bytes', 'file_bytes', 'ratio' (file / text size), 'blocks',
+                   'encode_seconds', 'throughput' (text bytes encoded per second)}
+        """
+        return {
+            'format'        : 'bgcode',
+            'text_bytes'    : self.text_bytes,
+            'file_bytes'    : self.file_bytes,
+            'ratio'         : self.file_bytes / max(self.text_bytes, 1),
+            'blocks'        : self.blocks,
+            'encode_seconds': self.encode_seconds,
+            'throughput'    : self.text_bytes / max(self.encode_seconds, 1e-9),
+        }
+
+    def _flush(self, final: bool) -> None:
+        data = b''.join(self._parts)
+        start = time.perf_counter()
+        blocks = []
+        while data:
+            if len(data) <= self.block_size:
+                if not final:
+                    break
+                cut = len(data)
+            else:
+                # the last line end within the block size, or the first one after it for a longer line
+                cut = data.rfind(b'\n', 0, self.block_size) + 1 or data.find(b'\n', self.block_size) + 1
+                if cut == 0:
+                    if not final:
+                        break
+                    cut = len(data)
+            blocks.append(self._gcode_block(data[:cut]))
+            data = data[cut:]
+        self.encode_seconds += time.perf_counter() - start
+        self._emit(b''.join(blocks))
+        self._parts = [data] if data else []
+        self._size  = len(data)
+
+    def _emit(self, data: bytes) -> None:
+        self.fileobj.write(data)
+        self.file_bytes += len(data)
+
+    def _gcode_block(self, text: bytes) -> bytes:
+        self.blocks += 1
+        data = encode_meatpack(text) if self.encoding == 'meatpack' else text
+        return self._block(GCODE, ENCODING[self.encoding], data, self.compression)
+
+    def _metadata_block(self, block_type: int, values: dict) -> bytes:
+        ini = ''.join(f'{key}={value}\n' for key, value in values.items()).encode('utf-8')
+        return self._block(block_type, INI_ENCODING, ini, 'deflate')
+
+    def _block(self, block_type: int, encoding: int, data: bytes, compression: str) -> bytes:
+        if compression == 'deflate':
+            compressed = zlib.compress(data, self.level)
+            header = struct.pack('<HHII', block_type, COMPRESSION['deflate'], len(data), len(compressed))
+        else:
+            compressed = data
+            header = struct.pack('<HHI', block_type, COMPRESSION['none'], len(data))
+        block = header + struct.pack('<H', encoding) + compressed
+        if self.checksum:
+            block += struct.pack('<I', zlib.crc32(block))
+        return block
+
+
+def decode_bgcode(data: bytes) -> dict:
+    """
+    Decodes a .bgcode file.
+
+    Args:
+        data (bytes): The content of the file.
+
+    Returns:
+        dict: {'file', 'printer', 'print', 'slicer'}: the metadata blocks as dicts of str
+        (missing blocks are empty), and 'gcode': the G-code text.
+
+    Raises:
+        ValueError: If the data is not a .bgcode file, a checksum does not match or a block
+            uses an unsupported compression or encoding.
+    """
+    if data[:4] != MAGIC:
+        raise ValueError('not a binary G-code file')
+    version, checksum_type = struct.unpack_from('<IH', data, 4)
+    if version != VERSION:
+        raise ValueError(f'unsupported binary G-code version {version}')
+    names = {FILE_METADATA: 'file', PRINTER_METADATA: 'printer', PRINT_METADATA: 'print',
+             SLICER_METADATA: 'slicer'}
+    result = {name: {} for name in names.values()}
+    gcode = []
+    pos = 10
+    while pos < len(data):
+        start = pos
+        block_type, compression, size = struct.unpack_from('<HHI', data, pos)
+        pos += 8
+        compressed_size = size
+        if compression != COMPRESSION['none']:
+            compressed_size, = struct.unpack_from('<I', data, pos)
+            pos += 4
+        if block_type == THUMBNAIL:
+            encoding = None
+            pos += 6 # format, width, height
+        else:
+            encoding, = struct.unpack_from('<H', data, pos)
+            pos += 2
+        payload = data[pos:pos + compressed_size]
+        pos += compressed_size
+        if checksum_type == CHECKSUM_CRC32:
+            checksum, = struct.unpack_from('<I', data, pos)
+            if checksum != zlib.crc32(data[start:pos]):
+                raise ValueError(f'checksum mismatch in the block at byte {start}')
+            pos += 4
+
+        if compression == COMPRESSION['deflate']:
+            payload = zlib.decompress(payload)
+        elif compression != COMPRESSION['none']:
+            raise ValueError(f'unsupported compression {compression} in the block at byte {start}')
+        if block_type == GCODE:
+            if encoding in (ENCODING['meatpack'], ENCODING['meatpack_comments']):
+                payload = decode_meatpack(payload)
+            elif encoding != ENCODING['none']:
+                raise ValueError(f'unsupported encoding {encoding} in the block at byte {start}')
+            gcode.append(payload)
+        elif block_type in names:
+            for line in payload.decode('utf-8').splitlines():
+                key, _, value = line.partition('=')
+                result[names[block_type]][key] = value
+    result['gcode'] = b''.join(gcode).decode('utf-8')
+    return result
+
+
+def load_bgcode(file_path: str) -> dict:
+    """
+    Reads and decodes a .bgcode file, see decode_bgcode.
+    """
+    with open(file_path, 'rb') as f:
+        return decode_bgcode(f.read())
+
+
+def settings_metadata(settings: dict) -> dict:
+    """
+    Returns the metadata blocks of a .bgcode file for the given settings:
+    the printer, the print and the slicer metadata (all settings, flattened).
+
+    Args:
+        settings (dict): The settings, as loaded by gcoordinator.settings.get_settings.
+
+    Returns:
+        dict: {'file', 'printer', 'print', 'slicer'}, see BGCodeWriter.
+    """
+    def flatten(values, prefix=''):
+        for key, value in values.items():
+            if isinstance(value, dict):
+                yield from flatten(value, f'{prefix}{key}.')
+            else:
+                yield f'{prefix}{key}', value
+
+    hardware = settings['Hardware']
+    printer = {
+        'kinematics'        : hardware['kinematics'],
+        'nozzle_diameter'   : settings['Print']['nozzle']['nozzle_diameter'],
+        'filament_diameter' : settings['Print']['nozzle']['filament_diameter'],
+        'nozzle_temperature': settings['Print']['temperature']['nozzle_temperature'],
+        'bed_temperature'   : settings['Print']['temperature']['bed_temperature'],
+    }
+    printer.update(hardware.get('bed_size', {}))
+    print_settings = {
+        'layer_height' : settings['Print']['layer']['layer_height'],
+        'print_speed'  : settings['Print']['speed']['print_speed'],
+        'travel_speed' : settings['Print']['speed']['travel_speed'],
+    }
+    return {
+        'file'   : {'Producer': 'gcoordinator'},
+        'printer': printer,
+        'print'  : print_settings,
+        'slicer' : dict(flatten(settings)),
+    }
@@ -1,16 +1,131 @@
+import io
 import os
+import bz2
+import gzip
 import json
+import lzma
+import time
 import numpy as np
+from collections                             import deque
+from concurrent.futures                      import ProcessPoolExecutor, ThreadPoolExecutor
 from gcoordinator.settings                   import get_default_settings, load_settings
-from gcoordinator.path_generator             import Path
+from gcoordinator.settings                   import TEMP_CONFIG_PATH, get_settings
+from gcoordinator.path_generator             import Path, SegmentBundle
 from gcoordinator.path_generator             import flatten_path_list
-from gcoordinator.utils.coords               import get_distances_between_coords
+from gcoordinator.bgcode                     import BGCodeWriter, settings_metadata
+from gcoordinator.gcode_minimizer            import GCodeMinimizer
+from gcoordinator.path_transformer           import simplify_paths, ANGLE_TOLERANCE
+from gcoordinator.utils.simplify             import merge_chord_error_stats
+from gcoordinator.utils.geometry             import segment_lengths, point_distances, rectangular_bead_extrusion
+from gcoordinator.utils.gcode_format         import g1_line_template, escape_template, format_lines
 from gcoordinator.kinematics.kin_bed_rotate  import BedRotate
 from gcoordinator.kinematics.kin_cartesian   import Cartesian
 from gcoordinator.kinematics.kin_bed_tilt_bc import BedTiltBC
 from gcoordinator.kinematics.kin_nozzle_tilt import NozzleTilt
 from gcoordinator.settings                   import template_settings
 
+
+class _ChunkBuffer:
+    """
+    A file-like sink that collects the text written by `GCode` and hands it
+    out again in chunks of a fixed size.
+    """
+
+    def __init__(self, chunk_size: int) -> None:
+        self.chunk_size = chunk_size
+        self._parts = []
+        self._size  = 0
+
+    def write(self, txt: str) -> None:
+        self._parts.append(txt)
+        self._size += len(txt)
+
+    def drain(self, final: bool = False):
+        """
+        Yields every complete chunk collected so far. The remainder is kept for
+        the next call, unless `final` is True in which case it is yielded too.
+        """
+        if self._size < self.chunk_size and not final:
+            return
+        data = ''.join(self._parts)
+        n_full = len(data) - len(data) % self.chunk_size
+        for start in range(0, n_full, self.chunk_size):
+            yield data[start:start + self.chunk_size]
+        rest = data[n_full:]
+        if final and rest:
+            yield rest
+            rest = ''
+        self._parts = [rest] if rest else []
+        self._size  = len(rest)
+
+
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.xz': 'xz', '.bz2': 'bz2'}
+
+
+class _CompressedTextWriter:
+    """
+    Writes text to a gzip, xz or bz2 compressed file through the streaming compressor of the
+    standard library, and measures the size reduction and the compression throughput.
+    """
+
+    CODECS = {
+        'gzip': (gzip.open, 'compresslevel'),
+        'xz'  : (lzma.open, 'preset'),
+        'bz2' : (bz2.open,  'compresslevel'),
+    }
+
+    def __init__(self, file_path: str, compression: str, level: int = None) -> None:
+        if compression not in self.CODECS:
+            raise ValueError("compression must be 'gzip', 'xz', 'bz2' or None")
+        open_function, level_keyword = self.CODECS[compression]
+        kwargs = {} if level is None else {level_keyword: level}
+        self.file_path   = file_path
+        self.compression = compression
+        self.text_bytes  = 0
+        self.encode_seconds = 0.0
+        start = time.perf_counter()
+        self.fileobj = open_function(file_path, 'wb', **kwargs)
+        self.encode_seconds += time.perf_counter() - start
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        start = time.perf_counter()
+        self.fileobj.close()
+        self.encode_seconds += time.perf_counter() - start
+
+    def write(self, txt: str) -> None:
+        data = txt.encode('utf-8')
+        start = time.perf_counter()
+        self.fileobj.write(data)
+        self.encode_seconds += time.perf_counter() - start
+        self.text_bytes += len(data)
+
+    def info(self) -> dict:
+        """
+        Returns:
+            dict: {'format', 'text_bytes', 'file_bytes', 'ratio' (file / text size),
+                   'encode_seconds', 'throughput' (text bytes compressed per second)}
+        """
+        file_bytes = os.path.getsize(self.file_path)
+        return {
+            'format'        : self.compression,
+            'text_bytes'    : self.text_bytes,
+            'file_bytes'    : file_bytes,
+            'ratio'         : file_bytes / max(self.text_bytes, 1),
+            'encode_seconds': self.encode_seconds,
+            'throughput'    : self.text_bytes / max(self.encode_seconds, 1e-9),
+        }
+
+
+def _render_path_blocks(paths) -> list:
+    """
+    Renders the print moves of a batch of paths. Runs in the worker pool of a parallel `GCode.save`.
+    """
+    return [GCode.render_path(path) for path in paths]
+
+
 class GCode:
     """
     Represents a G-code generator for 3D printing.
@@ -24,13 +139,23 @@ class GCode:
         start_gcode_txt (str): The text of the start G-code.
         end_gcode_path (str): The path to the file containing the end G-code.
         end_gcode_txt (str): The text of the end G-code.
+        save_info (dict): Output statistics of the last `save` with compression, minimization, arc fitting or in a binary format, otherwise None.
+        simplify_info (dict): The chord error statistics of `simplify`, None if the paths were not simplified.
+        arc_fitting_info (dict): The number of paths printed with arc fitting (see Path.arc_tolerance), of G2/G3 arcs
+            and of the G1 lines they replaced in the last generated G-code.
 
     Methods:
         __init__(self, full_object:list) -> None: Initializes a new `GCode` object with the given `full_object`.
-        save(self, file_path:str) -> None: Saves the generated G-code to a file at the specified file path.
+        save(self, file_path:str, workers:int, executor:str, format:str, compression:str, compression_level:int, minimize:bool, precision:dict) -> None: Saves the generated G-code to a file at the specified file path.
+        simplify(self, tolerance:float, angle_tolerance:float) -> dict: Removes the points of the paths within tolerance of their chords.
+        iter_chunks(self, chunk_size:int, workers:int, executor:str) -> Iterator[str]: Yields the generated G-code in fixed-size text chunks.
+        stream_to(self, fileobj, chunk_size:int, workers:int, executor:str) -> None: Writes the generated G-code chunk by chunk to a file object.
         generate_gcode(self) -> None: Generates G-code instructions for the full object.
         print_path(self, path:Path) -> None: Generates G-code instructions for printing a given path.
+        render_path(path:Path) -> str: Returns the G-code instructions for printing a given path.
+        render_segment_bundle(bundle:SegmentBundle) -> str: Returns the G-code instructions for printing a segment bundle.
         travel_from_path_to_path(self, curr_path:Path, next_path:Path) -> None: Generates G-code instructions for traveling from the end of `curr_path` to the start of `next_path`.
+        render_travel(curr_path:Path, next_path:Path) -> str: Returns the G-code instructions of the travel from `curr_path` to `next_path`.
         travel_to_first_point(self, first_path:Path) -> None: Generates G-code instructions for traveling to the first point of the first path in the full object.
         set_initial_settings(self) -> str: Generates G-code commands to set the initial printer settings.
         apply_path_settings(self, path) -> None: Generate G-code commands to apply the settings of the given `path` object.
@@ -39,65 +164,210 @@ class GCode:
         apply_defaults_to_instances(self, full_object, default_settings) -> None: Applies the default settings to the given `full_object`.
     """
 
-    def __init__(self, full_object: list) -> None:
+    CHUNK_SIZE = 1 << 16 # default size of the text chunks yielded by iter_chunks
+    COMPRESSED_CHUNK_SIZE = 1 << 20 # size of the text chunks passed to the compressor by save
+    BATCH_POINTS = 50000 # number of path points sent to a worker at once when rendering in parallel
+
+    def __init__(self, full_object) -> None:
         """
         Initializes a new `GCode` object with the given `full_object`.
 
         Args:
-            full_object (list): A list of `Path` objects representing the paths to be printed.
+            full_object (list or iterable): A list of `Path` and `PathList` objects representing the paths to be printed.
+                Any other iterable (e.g. a generator) is consumed lazily while the G-code is generated,
+                so that paths can be produced on the fly without holding the whole object in memory.
 
         Returns:
             None
         """
-        self.full_object = flatten_path_list(full_object) # list of Path objects
+        if isinstance(full_object, (list, tuple)):
+            self.full_object = flatten_path_list(full_object) # list of Path objects
+        else:
+            self.full_object = full_object # flattened lazily by _iter_paths
         
-        try:
-            self.settings_path = '.temp_config.json'
-            with open(self.settings_path, 'r') as f:
-                self.settings = json.load(f)
-            
-        except:
-            self.settings = template_settings # gcoordinator/settings.py
+        self.settings_path = TEMP_CONFIG_PATH
+        self.settings = get_settings() # cached, see gcoordinator/settings.py
 
         self.default_settings = get_default_settings(self.settings)
-        self.apply_defaults_to_instances(self.full_object, self.default_settings)
+        if isinstance(self.full_object, list):
+            self.apply_defaults_to_instances(self.full_object, self.default_settings)
 
         self.gcode            = None              # gcode file object
         self.start_gcode_path = 'start_gcode.txt'
         self.start_gcode_txt  = ''
         self.end_gcode_path   = 'end_gcode.txt'
         self.end_gcode_txt    = ''
+        self.save_info        = None              # output statistics of the last save, see save
+        self.arc_fitting_info = {'paths': 0, 'arcs': 0, 'lines_removed': 0} # of the last generation
+        self.simplify_info    = None              # chord error statistics of simplify
 
-    def save(self, file_path:str) -> None:
+    def save(self, file_path:str, workers:int = None, executor:str = 'process', format:str = 'gcode',
+             compression:str = 'auto', compression_level:int = None, minimize:bool = False,
+             precision:dict = None) -> None:
         """
         Saves the generated G-code to a file at the specified file path.
 
         Args:
             file_path (str): The path to the file where the G-code will be saved.
+            workers (int): If greater than 1, the print moves of the paths are rendered by a pool
+                of this many workers. The output is identical to the serial one.
+            executor (str): 'process' or 'thread', the kind of worker pool. With 'process' on
+                platforms that spawn new interpreters (Windows, macOS), the calling script must
+                be guarded by `if __name__ == '__main__':`.
+            format (str): 'gcode' for plain text, or 'bgcode' for the binary G-code container
+                (MeatPack encoded and Deflate compressed blocks, see gcoordinator/bgcode.py).
+            compression (str): The compression of a 'gcode' file: 'gzip', 'xz', 'bz2' or None.
+                With 'auto', it is chosen from the file extension (.gz, .xz, .bz2), e.g.
+                'part.gcode.gz' is written gzip compressed. The text is compressed while it is
+                generated, no uncompressed file is written.
+            compression_level (int): The compression level (gzip and bz2: 1-9, xz: 0-9,
+                bgcode: the Deflate level 0-9). Defaults to the default level of the codec.
+            minimize (bool): Whether to remove the redundant words of the G-code before it is
+                written: unchanged feed rates and axis positions, zero moves and trailing zeros
+                (see gcoordinator/gcode_minimizer.py).
+            precision (dict): With minimize, the number of decimals of the words, e.g.
+                {'X': 3, 'Y': 3, 'Z': 3, 'E': 5}. See gcode_minimizer.PRECISION for the defaults.
 
         Returns:
             None.
+
+        With compression or format='bgcode', the size reduction and the encode throughput
+        are stored in `save_info` (see _CompressedTextWriter.info and BGCodeWriter.info).
+        With minimize, `save_info['minimizer']` holds the byte reduction (see GCodeMinimizer.info).
+        If paths were printed with arc fitting, `save_info['arc_fitting']` holds the number of arcs and
+        of removed lines (see `arc_fitting_info`).
         """
-        self.gcode = open(file_path, 'w', encoding='utf-8')
-        
-        with open(self.start_gcode_path, 'r') as f:
-            self.start_gcode_txt = f.read()
-        self.gcode.write(self.start_gcode_txt)
-        
-        self.set_initial_settings()
-        self.generate_gcode()
-        
-        with open(self.end_gcode_path, 'r') as f:
-            self.end_gcode_txt = f.read()   
-        self.gcode.write(self.end_gcode_txt)
-        
-        self.gcode.close()
-        if os.path.exists(".temp_config.json"):
+        self.save_info = None
+        minimizer = GCodeMinimizer(precision) if minimize else None
+
+        def chunks(chunk_size):
+            chunks = self.iter_chunks(chunk_size, workers, executor)
+            return minimizer.filter(chunks) if minimizer is not None else chunks
+
+        if format == 'gcode':
+            if compression == 'auto':
+                compression = COMPRESSION_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+            if compression is None:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    for chunk in chunks(self.CHUNK_SIZE):
+                        f.write(chunk)
+            else:
+                with _CompressedTextWriter(file_path, compression, compression_level) as writer:
+                    # large chunks, so that the compressor works on long runs of text
+                    for chunk in chunks(self.COMPRESSED_CHUNK_SIZE):
+                        writer.write(chunk)
+                self.save_info = writer.info()
+        elif format == 'bgcode':
+            level = 6 if compression_level is None else compression_level
+            with open(file_path, 'wb') as f:
+                writer = BGCodeWriter(f, settings_metadata(self.settings), level=level)
+                for chunk in chunks(self.CHUNK_SIZE):
+                    writer.write(chunk)
+                writer.close()
+            self.save_info = writer.info()
+        else:
+            raise ValueError("format must be 'gcode' or 'bgcode'")
+
+        if minimizer is not None:
+            self.save_info = dict(self.save_info or {'format': 'gcode'}, minimizer=minimizer.info())
+        if self.arc_fitting_info['paths']:
+            self.save_info = dict(self.save_info or {'format': 'gcode'}, arc_fitting=dict(self.arc_fitting_info))
+
+        if os.path.exists(TEMP_CONFIG_PATH):
             # remove the temporary config file
-            os.remove(".temp_config.json")
+            os.remove(TEMP_CONFIG_PATH)
         else:
             print(".temp_config.json does not exist")
 
+    def simplify(self, tolerance:float, angle_tolerance:float = ANGLE_TOLERANCE) -> dict:
+        """
+        Simplifies all paths of the full object before the G-code is generated: the points that
+        lie within tolerance of the chord between their kept neighbours are removed (see
+        Transform.simplify, which does the same for a single Path or PathList).
+
+        If the full object was given as a lazy iterable, its paths are simplified while they are
+        consumed, and `simplify_info` is complete once the G-code has been generated.
+
+        Args:
+            tolerance (float): The largest distance of a removed point from the new path, in millimeters.
+            angle_tolerance (float): The largest deviation of the rot and tilt of a removed point from
+                their interpolation, in radians.
+
+        Returns:
+            dict: The chord error statistics, {'points', 'kept', 'removed', 'max_error',
+            'mean_error', 'rms_error'}, also stored in `simplify_info`.
+        """
+        if isinstance(self.full_object, list):
+            self.full_object, self.simplify_info = simplify_paths(self.full_object, tolerance, angle_tolerance)
+        else:
+            self.simplify_info = simplify_paths([], tolerance, angle_tolerance)[1]
+            self.full_object = self._iter_simplified(self.full_object, tolerance, angle_tolerance)
+        return self.simplify_info
+
+    def _iter_simplified(self, items, tolerance, angle_tolerance):
+        for item in items:
+            paths, stats = simplify_paths(flatten_path_list([item]), tolerance, angle_tolerance)
+            self.simplify_info = merge_chord_error_stats(self.simplify_info, stats)
+            yield from paths
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE, workers: int = None, executor: str = 'process'):
+        """
+        Generates the G-code and yields it as text chunks of `chunk_size` characters
+        (the last chunk may be shorter), in the order start G-code, initial settings,
+        the blocks and travels of each path, end G-code.
+
+        At most one path block and one chunk are held in memory at a time, so the
+        output can be sent to a socket, a pipe or a compressor regardless of the size
+        of the part.
+
+        Args:
+            chunk_size (int): The number of characters per chunk.
+            workers (int): The number of workers rendering the paths in parallel, see `save`.
+            executor (str): 'process' or 'thread', see `save`.
+
+        Yields:
+            str: The next chunk of G-code text.
+        """
+        buffer = _ChunkBuffer(chunk_size)
+        self.gcode = buffer
+        try:
+            with open(self.start_gcode_path, 'r') as f:
+                self.start_gcode_txt = f.read()
+            self.gcode.write(self.start_gcode_txt)
+            self.set_initial_settings()
+            yield from buffer.drain()
+
+            for _ in self.iter_generate_gcode(workers, executor):
+                yield from buffer.drain()
+
+            with open(self.end_gcode_path, 'r') as f:
+                self.end_gcode_txt = f.read()
+            self.gcode.write(self.end_gcode_txt)
+            yield from buffer.drain(final=True)
+        finally:
+            self.gcode = None
+
+    def stream_to(self, fileobj, chunk_size: int = CHUNK_SIZE, workers: int = None, executor: str = 'process') -> None:
+        """
+        Writes the generated G-code to an open file object chunk by chunk.
+
+        Text streams (e.g. `open(path, 'w')`, `sys.stdout`) receive str chunks, any other
+        writable object (e.g. `gzip.open(path, 'wb')`, `socket.makefile('wb')`, a pipe)
+        receives the chunks encoded as UTF-8.
+
+        Args:
+            fileobj: A writable file-like object. It is not closed by this method.
+            chunk_size (int): The number of characters per chunk.
+            workers (int): The number of workers rendering the paths in parallel, see `save`.
+            executor (str): 'process' or 'thread', see `save`.
+
+        Returns:
+            None
+        """
+        binary = not isinstance(fileobj, io.TextIOBase)
+        for chunk in self.iter_chunks(chunk_size, workers, executor):
+            fileobj.write(chunk.encode('utf-8') if binary else chunk)
+
     def generate_gcode(self) -> None:
         """
         Generates G-code instructions for the full object by iterating over its paths and calling
@@ -106,16 +376,99 @@ class GCode:
         Returns:
             None
         """
-        self.travel_to_first_point(self.full_object[0])
-        for i in range(len(self.full_object)):
-            curr_path = self.full_object[i]
+        for _ in self.iter_generate_gcode():
+            pass
+
+    def iter_generate_gcode(self, workers: int = None, executor: str = 'process'):
+        """
+        Generator version of `generate_gcode`. The G-code of one path (settings, print moves
+        and the travel to the next path) is written to `self.gcode` per iteration.
+
+        Args:
+            workers (int): The number of workers rendering the paths in parallel, see `save`.
+            executor (str): 'process' or 'thread', see `save`.
+
+        Yields:
+            Path: The path whose G-code has just been written.
+        """
+        if workers is not None and workers > 1:
+            blocks = self._iter_parallel_path_blocks(workers, executor)
+        else:
+            blocks = ((path, None) for path in self._iter_paths())
+        self.arc_fitting_info = {'paths': 0, 'arcs': 0, 'lines_removed': 0}
+        curr = next(blocks, None)
+        if curr is None:
+            return
+        self.travel_to_first_point(curr[0])
+        while curr is not None:
+            next_ = next(blocks, None)
+            curr_path, block = curr
             self.apply_path_settings(curr_path)
-            self.print_path(curr_path)
-            if i < len(self.full_object)-1:
-                next_path = self.full_object[i+1]
-                self.travel_from_path_to_path(curr_path, next_path)
-            else:
-                pass
+            if block is None:
+                block = self.render_path(curr_path)
+            self.gcode.write(block)
+            if curr_path.arc_tolerance and curr_path.kinematics == 'Cartesian' \
+                    and not isinstance(curr_path, SegmentBundle):
+                self._count_arcs(curr_path, block)
+            if next_ is not None:
+                self.travel_from_path_to_path(curr_path, next_[0])
+            yield curr_path
+            curr = next_
+
+    def _count_arcs(self, path:Path, block:str) -> None:
+        # one line per segment without arc fitting
+        info = self.arc_fitting_info
+        info['paths'] += 1
+        info['arcs']  += block.count('G2 ') + block.count('G3 ')
+        info['lines_removed'] += len(path.x) - 1 - block.count('\n')
+
+    def _iter_parallel_path_blocks(self, workers: int, executor: str):
+        """
+        Renders the print moves of the paths in a pool of workers and yields (path, block) pairs
+        in the original order. The paths are sent in batches of about BATCH_POINTS points, and at
+        most two batches per worker are in flight, so memory stays bounded for lazy inputs too.
+        """
+        if executor == 'process':
+            pool = ProcessPoolExecutor(max_workers=workers)
+        elif executor == 'thread':
+            pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError("executor must be 'process' or 'thread'")
+
+        with pool:
+            pending = deque()
+            for batch in self._iter_path_batches():
+                pending.append((batch, pool.submit(_render_path_blocks, batch)))
+                if len(pending) >= 2 * workers:
+                    batch, future = pending.popleft()
+                    yield from zip(batch, future.result())
+            while pending:
+                batch, future = pending.popleft()
+                yield from zip(batch, future.result())
+
+    def _iter_path_batches(self):
+        batch, n_points = [], 0
+        for path in self._iter_paths():
+            batch.append(path)
+            n_points += len(path.x)
+            if n_points >= self.BATCH_POINTS:
+                yield batch
+                batch, n_points = [], 0
+        if batch:
+            yield batch
+
+    def _iter_paths(self):
+        """
+        Yields the paths of the full object with the default settings applied.
+        If the full object was given as a lazy iterable, it is flattened on the fly.
+        """
+        if isinstance(self.full_object, list):
+            yield from self.full_object
+            return
+        for item in self.full_object:
+            for path in flatten_path_list([item]):
+                self.apply_defaults_to_instances([path], self.default_settings)
+                yield path
 
     def print_path(self, path:Path) -> None:
         """
@@ -130,8 +483,23 @@ class GCode:
         Raises:
             None
         """
-        
-        if path.kinematics == 'Cartesian':
+        self.gcode.write(self.render_path(path))
+
+    @staticmethod
+    def render_path(path:Path) -> str:
+        """
+        Returns the G-code instructions for printing a given path, according to its kinematics.
+
+        Args:
+            path (Path): The path to print.
+
+        Returns:
+            str: The G-code of the print moves of the path.
+        """
+        if isinstance(path, SegmentBundle):
+            txt = GCode.render_segment_bundle(path)
+
+        elif path.kinematics == 'Cartesian':
             txt = Cartesian.generate_gcode_of_path(path)
 
         elif path.kinematics == 'NozzleTilt':
@@ -145,9 +513,46 @@ class GCode:
         elif path.kinematics == 'BedRotate':
             BedRotate.load_settings()
             txt = BedRotate.generate_gcode_of_path(path)
-            
 
-        self.gcode.write(txt)
+        return txt
+
+    @staticmethod
+    def render_segment_bundle(bundle:SegmentBundle) -> str:
+        """
+        Returns the G-code instructions for printing a segment bundle (Cartesian kinematics):
+        the print move of every segment and the travel to the next segment.
+
+        The output is the same as for one 2-point Path per segment, but all lines are
+        formatted in one batched operation.
+
+        Args:
+            bundle (SegmentBundle): The segments to print.
+
+        Returns:
+            str: The G-code of the print moves and the travels between them.
+        """
+        segments = bundle.segments
+        starts, ends = segments[:, 0], segments[:, 1]
+        distances = point_distances(starts, ends)
+        if bundle.segment_extrusion_multiplier is not None:
+            multipliers = np.asarray(bundle.segment_extrusion_multiplier, dtype=float)[:len(segments)]
+        else:
+            multipliers = np.full(len(segments), bundle.extrusion_multiplier, dtype=float)
+        # the same formula as Kinematics.calculate_extrusion
+        extrusion = rectangular_bead_extrusion(distances, bundle.nozzle_diameter, bundle.layer_height,
+                                               bundle.filament_diameter, multipliers)
+
+        print_columns = [ends[:, 0] + bundle.x_origin, ends[:, 1] + bundle.y_origin, ends[:, 2], extrusion]
+        print_line    = g1_line_template(bundle.print_speed, ['X', 'Y', 'Z'])
+
+        # every segment but the last is followed by a direct travel to the next segment
+        prefix, suffix = GCode._travel_wrap(bundle)
+        travel = (escape_template(prefix + f'G0 F{bundle.travel_speed} ')
+                  + 'X%.5f Y%.5f Z%.5f\n' + escape_template(suffix))
+        travel_columns = list((starts[1:] - ends[:-1]).T)
+        txt  = format_lines(print_line + travel, [column[:-1] for column in print_columns] + travel_columns)
+        txt += format_lines(print_line, [column[-1:] for column in print_columns])
+        return txt
 
     def travel_from_path_to_path(self, curr_path:Path, next_path:Path) -> None:
         """
@@ -163,14 +568,51 @@ class GCode:
         Raises:
             None
         """
-        txt = ''
-        txt += f'G91\n'
+        self.gcode.write(self.render_travel(curr_path, next_path))
+
+    @staticmethod
+    def _travel_wrap(curr_path:Path):
+        """
+        Returns the G-code written before and after the travel moves that leave `curr_path`:
+        relative mode, retraction and z hop, and their reversal.
+        """
+        prefix = ''
+        prefix += f'G91\n'
 
         if curr_path.retraction:
-            txt += f'G1 E{-curr_path.retraction_distance}\n'
+            prefix += f'G1 E{-curr_path.retraction_distance}\n'
         
         if curr_path.z_hop:
-            txt += f'G0 Z{curr_path.z_hop_distance}\n'
+            prefix += f'G0 Z{curr_path.z_hop_distance}\n'
+
+        suffix = ''
+        if curr_path.z_hop:
+            suffix += f'G0 Z{-curr_path.z_hop_distance}\n'
+        
+        if curr_path.retraction:
+            suffix += f'G1 E{curr_path.unretraction_distance}\n'
+        
+        # In some 3D printers, such as Bambulab, when absolute coordinates are specified with the G90 command, 
+        # the E value is also specified as an absolute amount at the same time, 
+        # so the M83 command is used to specify the extrusion amount as relative. 
+        # Will be rewritten to program using M82 absolute extrusion.
+        suffix += f'G90 \nM83 \n'
+        return prefix, suffix
+
+    @staticmethod
+    def render_travel(curr_path:Path, next_path:Path) -> str:
+        """
+        Returns the G-code instructions for traveling from the end of `curr_path` to the start of `next_path`.
+
+        Args:
+            curr_path (Path): The path to travel from.
+            next_path (Path): The path to travel to.
+
+        Returns:
+            str: The G-code of the travel.
+        """
+        prefix, suffix = GCode._travel_wrap(curr_path)
+        txt = prefix
         
         # travel to the start of the next path
         if curr_path.travel_path is not None:
@@ -196,18 +638,7 @@ class GCode:
             txt += f'Y{travel_y:.5f} '
             txt += f'Z{travel_z:.5f}\n'
 
-        if curr_path.z_hop:
-            txt += f'G0 Z{-curr_path.z_hop_distance}\n'
-        
-        if curr_path.retraction:
-            txt += f'G1 E{curr_path.unretraction_distance}\n'
-        
-        # In some 3D printers, such as Bambulab, when absolute coordinates are specified with the G90 command, 
-        # the E value is also specified as an absolute amount at the same time, 
-        # so the M83 command is used to specify the extrusion amount as relative. 
-        # Will be rewritten to program using M82 absolute extrusion.
-        txt += f'G90 \nM83 \n'
-        self.gcode.write(txt)
+        return txt + suffix
 
     def travel_to_first_point(self, first_path:Path) -> None:
         """
@@ -222,11 +653,10 @@ class GCode:
         Raises:
             None
         """
-        txt = ''
-        txt += f'G1 F{first_path.travel_speed} '
-        txt += f'X{first_path.x[0]+first_path.x_origin} '
-        txt += f'Y{first_path.y[0]+first_path.y_origin} '
-        txt += f'Z{first_path.z[0]}\n'
+        line = escape_template(f'G1 F{first_path.travel_speed} ') + 'X%.5f Y%.5f Z%.5f\n'
+        txt  = format_lines(line, [[first_path.x[0] + first_path.x_origin],
+                                   [first_path.y[0] + first_path.y_origin],
+                                   [first_path.z[0]]])
         self.gcode.write(txt)
 
     def set_initial_settings(self) -> str:
@@ -304,18 +734,9 @@ class GCode:
         Raises:
             None.
         """
-        coords = path.coords
-        distances = get_distances_between_coords(coords)
-        extrusion = np.zeros(len(distances))
-        for i, distance in enumerate(distances):
-            # Calculate the extrusion for each distance
-            # for more details, see formula 3 in the following paper:
-            # https://www.ncbi.nlm.nih.gov/pmc/articles/PMC7600913/
-            numerator    = 4 * path.nozzle_diameter * path.layer_height * distance
-            denominator  = np.pi * path.filament_diameter**2
-            extrusion[i] = numerator / denominator * path.extrusion_multiplier
-        
-        return extrusion
+        distances = segment_lengths(path.coords)
+        return rectangular_bead_extrusion(distances, path.nozzle_diameter, path.layer_height,
+                                          path.filament_diameter, path.extrusion_multiplier)
     
     
     def apply_defaults_to_instances(self, full_object, default_settings):
@@ -0,0 +1,296 @@
+"""
+Modal-state G-code minimizer.
+
+The feed rate and the axis positions are modal: a G0/G1 word that repeats the
+current value has no effect. GCodeMinimizer rewrites G-code text line by line
+and keeps only the words that change the machine state:
+
+  - F is written only when the feed rate changes (G0 and G1 share it, as in
+    Marlin and Klipper),
+  - in absolute mode (G90) X, Y, Z, A, B and C are written only when the rounded
+    value differs from the current position,
+  - in relative mode (G91) axis words with a rounded value of 0 are dropped,
+  - with relative extrusion (M83 or G91) E words of a rounded value of 0 are dropped,
+  - every number is rounded to the precision of its word (PRECISION) and written
+    without trailing zeros ('X1.50000' -> 'X1.5', 'E2.00000' -> 'E2').
+
+A G0/G1 line without any remaining word is removed. G2/G3 arcs keep all their
+words, because a missing end point changes the meaning of the arc. After G92 the
+positions it names are unknown, after G28, any other G command and a tool change
+the whole state is unknown, so the next moves write them again. Comments and the other commands are
+copied unchanged (without trailing whitespace).
+
+Rounding X, Y and Z to 3 decimals (1 micrometer) is below the resolution of the
+printers, and with relative extrusion the rounding error of E does not accumulate
+in the positions of the other axes.
+"""
+import time
+
+
+PRECISION = {'X': 3, 'Y': 3, 'Z': 3, 'A': 3, 'B': 3, 'C': 3, 'E': 5, 'F': 1, 'I': 3, 'J': 3, 'K': 3, 'R': 3}
+AXES = 'XYZABC'
+WORD_CACHE_SIZE = 1 << 16 # number of distinct words whose rounded text is cached
+
+_MOVES = {'G0': 'G0', 'G00': 'G0', 'G1': 'G1', 'G01': 'G1'}
+_ARCS  = {'G2': 'G2', 'G02': 'G2', 'G3': 'G3', 'G03': 'G3'}
+_STATELESS = {'G4', 'G04', 'G20', 'G21', 'G90', 'G91'} # G commands that neither move nor set positions
+
+
+def format_number(value: float, decimals: int) -> str:
+    """
+    Formats value with the given number of decimals, without trailing zeros
+    and without the sign of a negative zero.
+
+    Args:
+        value (float): The value to format.
+        decimals (int): The number of decimals to round to.
+
+    Returns:
+        str: e.g. format_number(1.5, 5) -> '1.5', format_number(-0.00001, 3) -> '0'.
+    """
+    txt = '%.*f' % (decimals, value)
+    if '.' in txt:
+        txt = txt.rstrip('0').rstrip('.')
+    if txt == '-0':
+        return '0'
+    return txt
+
+
+class GCodeMinimizer:
+    """
+    Minimizes G-code text written to it chunk by chunk (see the module docstring).
+    The chunks may end in the middle of a line.
+
+    Attributes:
+        precision (dict): The number of decimals of every word letter.
+        input_bytes (int): The number of bytes of G-code text read so far.
+        output_bytes (int): The number of bytes of minimized text returned so far.
+        input_lines (int): The number of lines read so far.
+        output_lines (int): The number of lines returned so far.
+        seconds (float): The time spent minimizing.
+
+    Methods:
+        __init__(self, precision): Sets up the initial (unknown) machine state.
+        feed(self, txt): Returns the minimized text of the complete lines read so far.
+        flush(self): Returns the minimized text of the remaining incomplete line.
+        filter(self, chunks): Minimizes an iterable of text chunks.
+        info(self): Returns the byte and line reduction.
+    """
+
+    def __init__(self, precision: dict = None) -> None:
+        """
+        Args:
+            precision (dict): Overrides of the number of decimals of word letters,
+                e.g. {'X': 2, 'Y': 2, 'E': 4}. See PRECISION for the defaults.
+        """
+        self.precision = dict(PRECISION)
+        if precision:
+            self.precision.update({letter.upper(): decimals for letter, decimals in precision.items()})
+        self.input_bytes  = 0
+        self.output_bytes = 0
+        self.input_lines  = 0
+        self.output_lines = 0
+        self.seconds      = 0.0
+        self._pending  = ''
+        self._relative = False   # G91
+        self._relative_e = False # M83
+        self._position = {}      # letter -> the rounded word of the current absolute position
+        self._feed     = None    # the rounded F word of the current feed rate
+        self._words    = {}      # cache of _parse_word
+
+    def feed(self, txt: str) -> str:
+        """
+        Reads G-code text and returns the minimized text of the lines completed by it.
+
+        Args:
+            txt (str): The next chunk of G-code text.
+
+        Returns:
+            str: The minimized lines, each ending with a newline.
+        """
+        start = time.perf_counter()
+        self.input_bytes += len(txt.encode('utf-8'))
+        lines = (self._pending + txt).split('\n')
+        self._pending = lines.pop()
+        out = self._minimize_lines(lines)
+        self.seconds += time.perf_counter() - start
+        return out
+
+    def flush(self) -> str:
+        """
+        Returns the minimized text of the last line if the text did not end with a newline.
+        """
+        start = time.perf_counter()
+        out = ''
+        if self._pending:
+            out = self._minimize_lines([self._pending])[:-1]
+            self._pending = ''
+            if out:
+                self.output_bytes -= 1 # the newline added by _minimize_lines
+        self.seconds += time.perf_counter() - start
+        return out
+
+    def filter(self, chunks):
+        """
+        Minimizes an iterable of G-code text chunks.
+
+        Args:
+            chunks (iterable): The G-code text, e.g. GCode.iter_chunks().
+
+        Yields:
+            str: The minimized text of every non-empty result.
+        """
+        for chunk in chunks:
+            out = self.feed(chunk)
+            if out:
+                yield out
+        out = self.flush()
+        if out:
+            yield out
+
+    def info(self) -> dict:
+        """
+        Returns:
+            dict: {'input_bytes', 'output_bytes', 'reduction' (1 - output / input size),
+                   'input_lines', 'output_lines', 'seconds'}
+        """
+        return {
+            'input_bytes' : self.input_bytes,
+            'output_bytes': self.output_bytes,
+            'reduction'   : 1 - self.output_bytes / max(self.input_bytes, 1),
+            'input_lines' : self.input_lines,
+            'output_lines': self.output_lines,
+            'seconds'     : self.seconds,
+        }
+
+    def _minimize_lines(self, lines) -> str:
+        out = []
+        for line in lines:
+            code, sep, comment = line.partition(';')
+            words = code.split()
+            command = words[0].upper() if words else ''
+            if command in _MOVES or command in _ARCS:
+                minimized = self._minimize_move(command, words[1:])
+                if minimized is None:
+                    # not a plain sequence of words: keep it as is and forget the state it may change
+                    out.append(line.rstrip())
+                    self._position.clear()
+                    self._feed = None
+                    continue
+                if sep:
+                    minimized = (minimized + ' ' + sep + comment).lstrip()
+                if minimized:
+                    out.append(minimized)
+                continue
+            out.append(line.rstrip())
+            if command:
+                self._update_state(command, words[1:])
+        self.input_lines += len(lines)
+        self.output_lines += len(out)
+        if not out:
+            return ''
+        txt = '\n'.join(out) + '\n'
+        self.output_bytes += len(txt.encode('utf-8'))
+        return txt
+
+    def _minimize_move(self, command: str, words):
+        is_arc   = command in _ARCS
+        relative = self._relative
+        relative_e = relative or self._relative_e
+        position = self._position
+        out = []
+        for word in words:
+            parsed = self._words.get(word)
+            if parsed is None:
+                parsed = self._parse_word(word)
+                if parsed is None:
+                    return None
+            letter, txt = parsed
+            if letter == 'F':
+                if txt != self._feed:
+                    self._feed = txt
+                    out.append(txt)
+            elif letter in AXES:
+                if relative:
+                    if txt[1:] != '0' or is_arc:
+                        position.pop(letter, None)
+                        out.append(txt)
+                elif is_arc or position.get(letter) != txt:
+                    position[letter] = txt
+                    out.append(txt)
+            elif letter == 'E' and relative_e:
+                if txt != 'E0' or is_arc:
+                    out.append(txt)
+            else:
+                out.append(txt)
+        if not out and not is_arc:
+            return ''
+        return ' '.join([_MOVES.get(command) or _ARCS[command]] + out)
+
+    def _parse_word(self, word: str):
+        # returns (letter, the rounded word), e.g. 'x1.50000' -> ('X', 'X1.5'), cached
+        # because the Z, F and many E words repeat
+        letter = word[0].upper()
+        try:
+            value = float(word[1:])
+        except ValueError:
+            return None
+        if len(self._words) >= WORD_CACHE_SIZE:
+            self._words.clear()
+        parsed = (letter, letter + format_number(value, self.precision.get(letter, 5)))
+        self._words[word] = parsed
+        return parsed
+
+    def _update_state(self, command: str, words) -> None:
+        if command == 'G90':
+            self._relative = False
+        elif command == 'G91':
+            self._relative = True
+        elif command == 'M82':
+            self._relative_e = False
+        elif command == 'M83':
+            self._relative_e = True
+        elif command == 'G92':
+            named = [word[0].upper() for word in words if word[0].upper() in AXES]
+            if not named:
+                self._position.clear()
+            for letter in named:
+                self._position.pop(letter, None)
+        elif command[0] == 'G' and command not in _STATELESS:
+            # e.g. G28 homing or G29 probing: the positions and the feed rate are unknown afterwards
+            self._position.clear()
+            self._feed = None
+        elif command[0] == 'T':
+            # a tool change may move the head
+            self._position.clear()
+
+
+def minimize_gcode_file(input_path: str, output_path: str, precision: dict = None,
+                        chunk_size: int = 1 << 20) -> dict:
+    """
+    Minimizes a G-code file (see GCodeMinimizer) and reports the byte reduction.
+
+    Args:
+        input_path (str): The G-code file to read.
+        output_path (str): The minimized G-code file to write. Must not be input_path.
+        precision (dict): Overrides of the number of decimals of word letters, see GCodeMinimizer.
+        chunk_size (int): The number of characters read at once.
+
+    Returns:
+        dict: GCodeMinimizer.info() of the file.
+    """
+    minimizer = GCodeMinimizer(precision)
+    with open(input_path, 'r', encoding='utf-8') as src, open(output_path, 'w', encoding='utf-8') as dst:
+        chunks = iter(lambda: src.read(chunk_size), '')
+        for out in minimizer.filter(chunks):
+            dst.write(out)
+    return minimizer.info()
+
+
+if __name__ == '__main__':
+    minimizer = GCodeMinimizer()
+    print(minimizer.feed('G1 F1200 X1.00000 Y2.50000 Z0.20000 E0.05000\n'
+                         'G1 F1200 X2.00000 Y2.50000 Z0.20000 E0.05000\n'), end='')
+    # Expected output:
+    # G1 F1200 X1 Y2.5 Z0.2 E0.05
+    # G1 X2 E0.05
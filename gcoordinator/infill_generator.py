@@ -14,36 +14,239 @@ Infill patterns fall into two categories with different generation strategies:
     Defined as families of parallel straight lines. Each line is clipped against
     the boundary polygon using a scanline algorithm, guaranteeing that every
     returned Path is a true straight segment.
+
+Every pattern also has a multi-layer variant (Infill.gyroid_layers, ...) that
+takes one boundary per layer. Layers whose XY boundary is identical share the
+z-independent work: the grid and mask of the implicit surfaces, and the clipped
+segments of the line patterns.
+
+The masks and clipped segments are also kept in a bounded LRU cache keyed by the
+boundary geometry, so that repeated calls with the same boundary (parameter
+sweeps, re-running a script) skip that work. See infill_cache_info(),
+clear_infill_cache() and configure_infill_cache().
 """
 
+import hashlib
+from collections import OrderedDict
 import numpy as np
 from contourpy import contour_generator
-from gcoordinator.path_generator import Path, PathList
+from gcoordinator.path_generator import Path, PathList, SegmentBundle
+from gcoordinator.utils.coords   import get_subdivision_indices
+from gcoordinator.utils.contours import cell_contours
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Shared helper
+# Shared helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _points_in_polygon(polygon_xy: np.ndarray, points: np.ndarray) -> np.ndarray:
-    """Vectorized even-odd ray-casting point-in-polygon test."""
-    px, py = points[:, 0], points[:, 1]
-    vx, vy = polygon_xy[:, 0], polygon_xy[:, 1]
-    vx_next = np.roll(vx, -1)
-    vy_next = np.roll(vy, -1)
+def _boundary_key(path_list: PathList) -> bytes:
+    """
+    Hash of the XY geometry of the boundary paths. Boundaries that differ only in z
+    (e.g. the same wall on every layer) have the same key.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for p in path_list.paths:
+        x = np.ascontiguousarray(p.x, dtype=float)
+        y = np.ascontiguousarray(p.y, dtype=float)
+        digest.update(len(x).to_bytes(8, 'little'))
+        digest.update(x.tobytes())
+        digest.update(y.tobytes())
+    return digest.digest()
 
-    py_col      = py[:, np.newaxis]
-    px_col      = px[:, np.newaxis]
-    vy_row      = vy[np.newaxis, :]
-    vy_next_row = vy_next[np.newaxis, :]
-    vx_row      = vx[np.newaxis, :]
-    vx_next_row = vx_next[np.newaxis, :]
 
-    cond = (vy_row > py_col) != (vy_next_row > py_col)
-    with np.errstate(divide='ignore', invalid='ignore'):
-        x_intersect = vx_row + (py_col - vy_row) * (vx_next_row - vx_row) / (vy_next_row - vy_row)
-    crosses = cond & (px_col < x_intersect)
-    return np.count_nonzero(crosses, axis=1) % 2 == 1
+class _GeometryCache:
+    """
+    Bounded LRU cache of boundary-dependent infill geometry (masks and clipped
+    segments). Values are numpy arrays or tuples of them; they are stored read-only
+    and returned as is, so callers must not modify them.
+
+    The cache is bounded both by the number of entries and by the total size of
+    the stored arrays; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=256 * 2**20):
+        self.enabled     = True
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.entries     = OrderedDict()
+        self.nbytes      = 0
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+
+    def get(self, key, compute):
+        """Returns the cached value of key, computing and storing it on a miss."""
+        if not self.enabled:
+            return compute()
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+        self.misses += 1
+        value = compute()
+        arrays = value if isinstance(value, tuple) else (value,)
+        nbytes = sum(array.nbytes for array in arrays)
+        if nbytes <= self.max_bytes and self.max_entries > 0:
+            for array in arrays:
+                array.flags.writeable = False
+            self.entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            self.evict()
+        return value
+
+    def evict(self):
+        while self.entries and (len(self.entries) > self.max_entries or self.nbytes > self.max_bytes):
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.nbytes -= nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+
+_geometry_cache = _GeometryCache()
+
+
+def infill_cache_info():
+    """
+    Returns statistics of the infill geometry cache.
+
+    Returns:
+        dict: {'enabled', 'entries', 'nbytes', 'max_entries', 'max_bytes',
+               'hits', 'misses', 'evictions'}
+    """
+    cache = _geometry_cache
+    return {
+        'enabled'    : cache.enabled,
+        'entries'    : len(cache.entries),
+        'nbytes'     : cache.nbytes,
+        'max_entries': cache.max_entries,
+        'max_bytes'  : cache.max_bytes,
+        'hits'       : cache.hits,
+        'misses'     : cache.misses,
+        'evictions'  : cache.evictions,
+    }
+
+
+def clear_infill_cache():
+    """
+    Removes all entries from the infill geometry cache and resets its statistics.
+
+    Returns:
+        None
+    """
+    _geometry_cache.clear()
+    _geometry_cache.hits      = 0
+    _geometry_cache.misses    = 0
+    _geometry_cache.evictions = 0
+
+
+def configure_infill_cache(enabled=None, max_entries=None, max_bytes=None):
+    """
+    Configures the infill geometry cache. Arguments left as None are unchanged.
+
+    Args:
+        enabled (bool): Whether masks and clipped segments are cached. Disabling
+            the cache also empties it.
+        max_entries (int): Maximum number of cached masks / segment families.
+        max_bytes (int): Maximum total size of the cached arrays in bytes.
+
+    Returns:
+        None
+    """
+    cache = _geometry_cache
+    if enabled is not None:
+        cache.enabled = bool(enabled)
+        if not cache.enabled:
+            cache.clear()
+    if max_entries is not None:
+        cache.max_entries = int(max_entries)
+    if max_bytes is not None:
+        cache.max_bytes = int(max_bytes)
+    cache.evict()
+
+
+def _row_crossings(polygons: list, x: np.ndarray, y: np.ndarray) -> tuple:
+    """
+    Returns the crossings of the edges of all polygons with the rows of the grid of
+    points (x[i], y[j]), as (row, col): the row index and the first column with
+    x >= the x of the crossing. The crossings of each edge with the rows it spans
+    are computed at once. `x` and `y` must be ascending.
+    """
+    vx      = np.concatenate([poly[:, 0] for poly in polygons])
+    vy      = np.concatenate([poly[:, 1] for poly in polygons])
+    vx_next = np.concatenate([np.roll(poly[:, 0], -1) for poly in polygons])
+    vy_next = np.concatenate([np.roll(poly[:, 1], -1) for poly in polygons])
+
+    # an edge crosses the row y[j] iff min(vy, vy_next) <= y[j] < max(vy, vy_next)
+    row_begin = np.searchsorted(y, np.minimum(vy, vy_next), side='left')
+    row_end   = np.searchsorted(y, np.maximum(vy, vy_next), side='left')
+    edge, step = get_subdivision_indices(row_end - row_begin)
+    row = row_begin[edge] + step - 1
+    py  = y[row]
+    x_intersect = vx[edge] + (py - vy[edge]) * (vx_next[edge] - vx[edge]) / (vy_next[edge] - vy[edge])
+    return row, np.searchsorted(x, x_intersect, side='left')
+
+
+def _even_odd_grid_mask(polygons: list, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Scanline even-odd rasterizer over the grid of points (x[i], y[j]).
+
+    Returns a boolean array of shape (len(y), len(x)) that is True where a rightward
+    ray from the grid point crosses the edges of all polygons an odd number of times.
+    Instead of testing every grid point against every edge, the crossings of each
+    edge with the grid rows it spans are computed once (see _row_crossings), and the
+    spans between them are filled row by row with a cumulative parity, so memory is
+    O(grid + crossings). `x` and `y` must be ascending.
+    """
+    n_rows, n_cols = len(y), len(x)
+    row, col = _row_crossings(polygons, x, y)
+
+    # parity of the number of crossings at or left of each grid point: a crossing
+    # flips the parity from the first column with x >= x_intersect onwards
+    flips = np.bincount(row * (n_cols + 1) + col, minlength=n_rows * (n_cols + 1))
+    flips = (flips & 1).astype(np.uint8).reshape(n_rows, n_cols + 1)
+    left_parity  = np.bitwise_xor.accumulate(flips, axis=1)[:, :n_cols]
+    total_parity = np.bincount(row, minlength=n_rows) & 1
+    # the crossings right of a point (px < x_intersect) are the total minus those left of it
+    return (total_parity[:, np.newaxis] ^ left_parity).astype(bool)
+
+
+def _crossings_right_of(crossing_keys: np.ndarray, row_ends: np.ndarray, n_cols: int,
+                        rows, cols) -> np.ndarray:
+    """
+    Returns the number of row crossings right of the grid points (rows, cols), i.e. with
+    a column > cols. crossing_keys are the sorted keys row * (n_cols + 1) + col of the
+    crossings of _row_crossings, row_ends[row] is the number of keys of the rows up to
+    and including row. A point is inside the polygons (even-odd rule, as in
+    _even_odd_grid_mask) iff the number is odd.
+    """
+    return row_ends[rows] - np.searchsorted(crossing_keys, rows * (n_cols + 1) + cols, side='right')
+
+
+def _in_intervals(line: np.ndarray, x: np.ndarray, interval_line: np.ndarray,
+                  interval_x0: np.ndarray, interval_x1: np.ndarray) -> np.ndarray:
+    """
+    Tells for every query (line[i], x[i]) whether x[i] lies in one of the intervals
+    [interval_x0, interval_x1] of the same line. The intervals must be sorted by
+    (line, x0) and must not overlap within a line.
+    """
+    n_intervals = len(interval_line)
+    # merge intervals and queries in (line, x) order; an interval starting at x sorts before the query
+    keys_line = np.concatenate([interval_line, line])
+    keys_x    = np.concatenate([interval_x0, x])
+    is_query  = np.concatenate([np.zeros(n_intervals, dtype=bool), np.ones(len(line), dtype=bool)])
+    order = np.lexsort((is_query, keys_x, keys_line))
+    # the last interval at or before every position of the merged order
+    position = np.where(~is_query[order], order, -1)
+    last = np.maximum.accumulate(position) if len(position) else position
+    query_last = np.empty(len(line), dtype=np.int64)
+    query_last[order[is_query[order]] - n_intervals] = last[is_query[order]]
+    found = query_last >= 0
+    candidate = np.where(found, query_last, 0)
+    return (found & (interval_line[candidate] == line) & (x <= interval_x1[candidate])
+            if n_intervals else np.zeros(len(line), dtype=bool))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -54,6 +257,10 @@ class _InfillGenerator:
     def __call__(self, path) -> PathList:
         raise NotImplementedError
 
+    def generate_layers(self, paths) -> list:
+        """Generates the infill of every boundary in paths. Returns one PathList per boundary."""
+        return [self(path) for path in paths]
+
     @staticmethod
     def _to_path_list(path) -> PathList:
         if isinstance(path, Path):
@@ -75,53 +282,237 @@ class _ImplicitSurfaceInfillGenerator(_InfillGenerator):
     Appropriate for TPMS-like equations whose zero-contour on the print plane
     forms closed or open curves without self-intersections at grid crossings.
 
-    Subclasses must implement _equation().
+    Subclasses must implement _equation(). Subclasses whose equation has terms that
+    do not depend on z can also override _equation_terms() and _equation_from_terms(),
+    so that generate_layers() evaluates those terms once per boundary.
+
+    With adaptive_levels > 0 the field is sampled adaptively (see _adaptive_contours):
+    the equation is only evaluated in the cells near the zero level set, so the cost
+    grows with the length of the contours instead of the area of the part. The
+    equation must then work element-wise on 1-D arrays of points.
     """
 
+    adaptive_levels = 0    # number of quadtree refinement levels, 0 samples the full grid
+    ADAPTIVE_SAFETY = 2.0  # safety factor on the slope estimated from the coarse samples
+
     def __call__(self, path) -> PathList:
         path_list = self._to_path_list(path)
+        if self.adaptive_levels > 0:
+            z_height = self._z_height(path_list)
+            return self._lines_to_paths(self._adaptive_contours(path_list, z_height), z_height)
         x, y, X, Y, z_height = self._build_grid(path_list)
-        equation = self._equation(X, Y, z_height)
         mask = self._build_mask(path_list, X, Y)
+        return self._layer_paths(x, y, self._equation_terms(X, Y), mask, z_height)
+
+    def generate_layers(self, paths) -> list:
+        """
+        Generates the infill of every boundary in paths. The grid, the mask and the
+        z-independent equation terms are computed once per distinct XY boundary;
+        only the z-dependent part of the equation is evaluated per layer.
+        In adaptive mode the sampled cells depend on z, so every layer is generated on its own.
+        """
+        if self.adaptive_levels > 0:
+            return [self(path) for path in paths]
+        shared = {}
+        layers = []
+        for path in paths:
+            path_list = self._to_path_list(path)
+            key = _boundary_key(path_list)
+            if key not in shared:
+                x, y, X, Y = self._build_xy_grid(path_list)
+                shared[key] = (x, y, self._equation_terms(X, Y), self._build_mask(path_list, X, Y))
+            layers.append(self._layer_paths(*shared[key], self._z_height(path_list)))
+        return layers
+
+    def _layer_paths(self, x, y, terms, mask, z_height) -> PathList:
+        equation = self._equation_from_terms(terms, z_height)
         return self._contour_to_paths(x, y, equation * mask, z_height)
 
     def _equation(self, X: np.ndarray, Y: np.ndarray, z_height: float) -> np.ndarray:
         raise NotImplementedError
 
+    def _equation_terms(self, X: np.ndarray, Y: np.ndarray):
+        """The z-independent terms of the equation. Default: the grid itself."""
+        return X, Y
+
+    def _equation_from_terms(self, terms, z_height: float) -> np.ndarray:
+        """Evaluates the equation on a layer from the terms of _equation_terms()."""
+        X, Y = terms
+        return self._equation(X, Y, z_height)
+
     def _resolution(self, min_x: float, max_x: float, min_y: float, max_y: float):
         """Grid resolution: default adaptive 0.4 mm step."""
         return int((max_x - min_x) / 0.4), int((max_y - min_y) / 0.4)
 
     def _build_grid(self, path_list: PathList):
+        x, y, X, Y = self._build_xy_grid(path_list)
+        return x, y, X, Y, self._z_height(path_list)
+
+    def _build_xy_grid(self, path_list: PathList):
         all_x = np.concatenate([p.x for p in path_list.paths if len(p.x) > 0])
         all_y = np.concatenate([p.y for p in path_list.paths if len(p.y) > 0])
         min_x, max_x = all_x.min(), all_x.max()
         min_y, max_y = all_y.min(), all_y.max()
         res_x, res_y = self._resolution(min_x, max_x, min_y, max_y)
-        z_height = path_list.paths[0].center[2]
         x = np.linspace(min_x, max_x, res_x)
         y = np.linspace(min_y, max_y, res_y)
         X, Y = np.meshgrid(x, y)
-        return x, y, X, Y, z_height
+        return x, y, X, Y
+
+    @staticmethod
+    def _z_height(path_list: PathList):
+        return path_list.paths[0].center[2]
+
+    def _finest_step(self) -> float:
+        """Grid step of the finest level of the adaptive mode: default 0.4 mm."""
+        return 0.4
+
+    def _adaptive_contours(self, path_list: PathList, z_height: float) -> list:
+        """
+        Extracts the masked zero contour on a fine grid, evaluating the equation only
+        where the zero level set can be.
+
+        The fine grid has a step of at most _finest_step() and is aligned with a coarse
+        grid 2**adaptive_levels times wider. The equation is evaluated on the coarse
+        nodes first. A cell is then split into four while it may contain a zero:
+        its corner values change sign, or the smallest corner value is within
+        slope * (half the cell diagonal), where the slope is the largest difference
+        quotient of the coarse samples times ADAPTIVE_SAFETY. Cells without any
+        point inside the boundary are dropped.
+
+        Nothing of the size of the fine grid is allocated: every cell carries the values
+        of its corners, the boundary is kept as its sorted row crossings, and the contour
+        is extracted from the refined cells only (see gcoordinator.utils.contours). The
+        lines are those contourpy finds on the fine grid with the field times the mask
+        (-1 inside, NaN outside) and NaN on all nodes that are not evaluated.
+
+        Returns:
+            list: The contour lines, as arrays of shape (n, 2).
+        """
+        all_x = np.concatenate([p.x for p in path_list.paths if len(p.x) > 0])
+        all_y = np.concatenate([p.y for p in path_list.paths if len(p.y) > 0])
+        min_x, max_x = all_x.min(), all_x.max()
+        min_y, max_y = all_y.min(), all_y.max()
+        coarse = 2 ** self.adaptive_levels
+        coarse_step = self._finest_step() * coarse
+        n_x = max(1, int(np.ceil((max_x - min_x) / coarse_step))) * coarse + 1
+        n_y = max(1, int(np.ceil((max_y - min_y) / coarse_step))) * coarse + 1
+        x = np.linspace(min_x, max_x, n_x)
+        y = np.linspace(min_y, max_y, n_y)
+
+        polygons = [np.column_stack([p.x, p.y]) for p in path_list.paths]
+        row, col = _row_crossings(polygons, x, y)
+        crossing_keys = np.sort(row * (n_x + 1) + col)
+        row_ends = np.searchsorted(crossing_keys, (np.arange(n_y) + 1) * (n_x + 1), side='left')
+
+        def crossings_right_of(rows, cols):
+            return _crossings_right_of(crossing_keys, row_ends, n_x, rows, cols)
+
+        def split_values(i, j, size):
+            # the values at the midpoints of the edges and at the centers of the cells; a
+            # midpoint can be shared with the neighbouring cell, it is evaluated once
+            half = size // 2
+            centers = (i + half) * n_x + j + half
+            horizontal, h_inverse = np.unique(np.concatenate([i * n_x, (i + size) * n_x]) + np.tile(j + half, 2),
+                                              return_inverse=True)
+            vertical, v_inverse = np.unique(np.tile((i + half) * n_x, 2) + np.concatenate([j, j + size]),
+                                            return_inverse=True)
+            nodes = np.concatenate([centers, horizontal, vertical])
+            node_rows, node_cols = np.divmod(nodes, n_x)
+            node_values = self._equation(x[node_cols], y[node_rows], z_height)
+            m = len(i)
+            bottom, top = np.split(node_values[m + h_inverse], 2)
+            left, right = np.split(node_values[m + len(horizontal) + v_inverse], 2)
+            return bottom, right, top, left, node_values[:m]
+
+        rows, cols = np.meshgrid(np.arange(0, n_y, coarse), np.arange(0, n_x, coarse), indexing='ij')
+        coarse_values = self._equation(x[cols.ravel()], y[rows.ravel()], z_height).reshape(rows.shape)
+        step_x, step_y = x[1] - x[0], y[1] - y[0]
+        slope = self.ADAPTIVE_SAFETY * max(
+            np.nanmax(np.abs(np.diff(coarse_values, axis=1)), initial=0) / (step_x * coarse),
+            np.nanmax(np.abs(np.diff(coarse_values, axis=0)), initial=0) / (step_y * coarse))
+
+        # the cells of the current level, given by their lowest node, with the values of
+        # their corners (counterclockwise from the lowest node) and whether all their
+        # nodes are known to be inside the boundary
+        i, j = rows[:-1, :-1].ravel(), cols[:-1, :-1].ravel()
+        corners = np.stack([coarse_values[:-1, :-1].ravel(), coarse_values[:-1, 1:].ravel(),
+                            coarse_values[1:, 1:].ravel(), coarse_values[1:, :-1].ravel()])
+        interior = np.zeros(len(i), dtype=bool)
+        size = coarse
+        while True:
+            crossing = (corners.min(axis=0) <= 0) & (corners.max(axis=0) >= 0)
+            near     = np.abs(corners).min(axis=0) <= slope * 0.5 * size * np.hypot(step_x, step_y)
+            # a cell of the fine grid is only needed if the contour passes through it
+            keep = crossing | near if size > 1 else crossing
+            i, j, corners, interior = i[keep], j[keep], corners[:, keep], interior[keep]
+
+            # on every row of a cell: is the node of its first column inside, and does a
+            # crossing lie within its columns? A cell without either on all rows has no
+            # inside node, a cell with the first and without the second on all rows has
+            # only inside nodes, and so have its sub-cells. (The test may keep a few cells
+            # without inside nodes, they are masked below.)
+            test = np.flatnonzero(~interior)
+            cell_rows = i[test, np.newaxis] + np.arange(size + 1)
+            right_first = crossings_right_of(cell_rows, j[test, np.newaxis])
+            right_last  = crossings_right_of(cell_rows, j[test, np.newaxis] + size)
+            first_inside = (right_first & 1).astype(bool)
+            crossed = right_first != right_last
+            interior[test] = np.all(first_inside & ~crossed, axis=1)
+            outside = test[~np.any(first_inside | crossed, axis=1)]
+            inside = np.ones(len(i), dtype=bool)
+            inside[outside] = False
+            i, j, corners, interior = i[inside], j[inside], corners[:, inside], interior[inside]
+            if size == 1:
+                break
+
+            # split every cell into four: evaluate the midpoints of its edges and its center
+            half = size // 2
+            bottom, right, top, left, center = split_values(i, j, size)
+            c0, c1, c2, c3 = corners
+            corners = np.concatenate([np.stack([c0, bottom, center, left]),
+                                      np.stack([bottom, c1, right, center]),
+                                      np.stack([center, right, c2, top]),
+                                      np.stack([left, center, top, c3])], axis=1)
+            i = np.concatenate([i, i, i + half, i + half])
+            j = np.concatenate([j, j + half, j + half, j])
+            interior = np.tile(interior, 4)
+            size = half
+
+        valid = np.ones(corners.shape, dtype=bool)
+        boundary = ~interior
+        corner_rows = np.stack([i, i, i + 1, i + 1])[:, boundary]
+        corner_cols = np.stack([j, j + 1, j + 1, j])[:, boundary]
+        valid[:, boundary] = (crossings_right_of(corner_rows, corner_cols) & 1).astype(bool)
+        # the field is negated inside the boundary, like the mask of the full-grid mode does
+        return cell_contours(x, y, i, j, -corners, valid)
 
     @staticmethod
     def _build_mask(path_list: PathList, X: np.ndarray, Y: np.ndarray) -> np.ndarray:
-        points = np.column_stack((X.ravel(), Y.ravel()))
-        result = None
-        for p in path_list.paths:
-            polygon = np.column_stack([p.x, p.y])
-            inside = _points_in_polygon(polygon, points).reshape(X.shape).astype(float)
-            inside[inside == 1] = -1  # inside  → -1
-            inside[inside == 0] =  1  # outside →  1
-            result = inside if result is None else result * inside
-        result[result == 1] = np.nan
-        return result
+        """
+        Returns -1 on the grid points inside the boundary (even-odd rule over all
+        boundary paths) and NaN outside. The result is cached per boundary and grid.
+        """
+        x, y = X[0, :], Y[:, 0]
+        key = ('mask', _boundary_key(path_list), X.shape,
+               float(x[0]), float(x[-1]), float(y[0]), float(y[-1])) if X.size else None
+
+        def build():
+            polygons = [np.column_stack([p.x, p.y]) for p in path_list.paths]
+            inside = _even_odd_grid_mask(polygons, x, y)
+            return np.where(inside, -1.0, np.nan)
+
+        return build() if key is None else _geometry_cache.get(key, build)
 
     @staticmethod
     def _contour_to_paths(x, y, z, z_height: float) -> PathList:
         gen = contour_generator(x=x, y=y, z=z)
+        return _ImplicitSurfaceInfillGenerator._lines_to_paths(gen.lines(0.0), z_height)
+
+    @staticmethod
+    def _lines_to_paths(lines, z_height: float) -> PathList:
         paths = []
-        for vertices in gen.lines(0.0):
+        for vertices in lines:
             x_c = vertices[:, 0]
             y_c = vertices[:, 1]
             z_c = np.full_like(x_c, z_height)
@@ -144,80 +535,254 @@ class _LinePatternInfillGenerator(_InfillGenerator):
       3. Clip each scanline against the rotated polygon (even-odd rule).
       4. Rotate the segment endpoints back by +θ  →  original frame.
 
-    Every returned Path is guaranteed to be a straight 2-point segment.
+    The output depends on self.output:
+      'paths'  : a PathList with one straight 2-point Path per segment (default).
+      'bundle' : a single SegmentBundle holding all segments as an (n, 2, 3) array.
+      'zigzag' : a PathList of polylines. The segments of neighbouring scanlines are
+                 joined end to end (boustrophedon) where the connecting move is short
+                 (at most ZIGZAG_MAX_LINK spacings across) and its midpoint lies inside
+                 the boundary.
 
-    Subclasses must implement _line_families().
+    Subclasses must implement _line_families() and set self.output.
     """
 
+    OUTPUTS = ('paths', 'bundle', 'zigzag')
+    ZIGZAG_MAX_LINK = 2.0 # maximum length of a zigzag connection along the lines, in spacings
+    output = 'paths'
+
     def _line_families(self) -> list[tuple[float, float]]:
         """Return [(angle_rad, spacing), ...] for each family of parallel lines."""
         raise NotImplementedError
 
-    def __call__(self, path) -> PathList:
+    def __call__(self, path):
         path_list = self._to_path_list(path)
-        polygons = [np.column_stack([p.x, p.y]) for p in path_list.paths
-                    if len(p.x) > 0]
         z_height = float(path_list.paths[0].center[2])
+        return self._build_output(path_list, self._clip_families(path_list), z_height)
+
+    def generate_layers(self, paths) -> list:
+        """
+        Generates the infill of every boundary in paths. The segments are clipped
+        once per distinct XY boundary and only placed at the height of each layer.
+        """
+        shared = {}
+        layers = []
+        for path in paths:
+            path_list = self._to_path_list(path)
+            key = _boundary_key(path_list)
+            if key not in shared:
+                shared[key] = self._clip_families(path_list)
+            z_height = float(path_list.paths[0].center[2])
+            layers.append(self._build_output(path_list, shared[key], z_height))
+        return layers
+
+    def _build_output(self, path_list: PathList, segments: list, z_height: float):
+        if self.output == 'paths':
+            return self._segments_to_paths(segments, z_height)
+        if self.output == 'bundle':
+            return self._segments_to_bundle(segments, z_height)
+        if self.output == 'zigzag':
+            return self._segments_to_zigzags(path_list, segments, z_height)
+        raise ValueError(f"output must be one of {', '.join(self.OUTPUTS)}")
 
+    @staticmethod
+    def _segments_to_paths(segments, z_height: float) -> PathList:
         infill_paths = []
-        for angle, spacing in self._line_families():
-            cos_a, sin_a = np.cos(angle), np.sin(angle)
-
-            # Rotate each boundary polygon by -angle
-            rot_polygons = []
-            for poly in polygons:
-                rx =  poly[:, 0] * cos_a + poly[:, 1] * sin_a
-                ry = -poly[:, 0] * sin_a + poly[:, 1] * cos_a
-                rot_polygons.append(np.column_stack([rx, ry]))
-
-            all_ry = np.concatenate([p[:, 1] for p in rot_polygons])
-            all_rx = np.concatenate([p[:, 0] for p in rot_polygons])
-            min_ry, max_ry = float(all_ry.min()), float(all_ry.max())
-            min_rx, max_rx = float(all_rx.min()), float(all_rx.max())
-
-            k0 = int(np.ceil(min_ry / spacing))
-            k1 = int(np.floor(max_ry / spacing))
-            for k in range(k0, k1 + 1):
-                ry_val = k * spacing
-                for rx0, rx1 in self._clip_scanline(ry_val, rot_polygons, min_rx, max_rx):
-                    # Rotate endpoints back by +angle
-                    x0 = rx0 * cos_a - ry_val * sin_a
-                    y0 = rx0 * sin_a + ry_val * cos_a
-                    x1 = rx1 * cos_a - ry_val * sin_a
-                    y1 = rx1 * sin_a + ry_val * cos_a
-                    infill_paths.append(Path(
-                        np.array([x0, x1]),
-                        np.array([y0, y1]),
-                        np.array([z_height, z_height]),
-                    ))
+        for x0, y0, x1, y1, _ in segments:
+            for seg_x0, seg_y0, seg_x1, seg_y1 in zip(x0, y0, x1, y1):
+                infill_paths.append(Path(
+                    np.array([seg_x0, seg_x1]),
+                    np.array([seg_y0, seg_y1]),
+                    np.array([z_height, z_height]),
+                ))
+        return PathList(infill_paths)
 
+    @staticmethod
+    def _segments_to_bundle(segments, z_height: float) -> SegmentBundle:
+        x0 = np.concatenate([family[0] for family in segments])
+        y0 = np.concatenate([family[1] for family in segments])
+        x1 = np.concatenate([family[2] for family in segments])
+        y1 = np.concatenate([family[3] for family in segments])
+        z  = np.full_like(x0, z_height)
+        starts = np.column_stack([x0, y0, z])
+        ends   = np.column_stack([x1, y1, z])
+        return SegmentBundle(np.stack([starts, ends], axis=1))
+
+    def _segments_to_zigzags(self, path_list: PathList, segments, z_height: float) -> PathList:
+        polygons = [np.column_stack([p.x, p.y]) for p in path_list.paths
+                    if len(p.x) > 0]
+        boundary = _boundary_key(path_list)
+        infill_paths = []
+        for (angle, spacing), family in zip(self._line_families(), segments):
+            links = _geometry_cache.get(('zigzag', boundary, float(angle), float(spacing), self.ZIGZAG_MAX_LINK),
+                                        lambda: self._zigzag_links(polygons, angle, spacing, family))
+            for xs, ys in self._zigzag_chains(family, *links):
+                infill_paths.append(Path(xs, ys, np.full_like(xs, z_height)))
         return PathList(infill_paths)
 
     @staticmethod
-    def _clip_scanline(y_val: float, polygons: list, lo_x: float, hi_x: float):
+    def _zigzag_chains(family, next_segment, link_high, link_low):
+        """
+        Walks the segments of a family in scanline order and joins each one to the
+        segment next_segment[i] on the following scanline, alternating between the
+        high-x (x1) and the low-x (x0) ends. Returns the (x, y) arrays of every chain.
+        """
+        x0, y0, x1, y1, _ = family
+        used   = np.zeros(len(x0), dtype=bool)
+        chains = []
+        for i in range(len(x0)):
+            if used[i]:
+                continue
+            used[i] = True
+            xs, ys = [x0[i], x1[i]], [y0[i], y1[i]]
+            forward, current = True, i
+            while True:
+                j = next_segment[current]
+                if j < 0 or used[j] or not (link_high[current] if forward else link_low[current]):
+                    break
+                if forward:
+                    xs += [x1[j], x0[j]]
+                    ys += [y1[j], y0[j]]
+                else:
+                    xs += [x0[j], x1[j]]
+                    ys += [y0[j], y1[j]]
+                used[j] = True
+                forward, current = not forward, j
+            chains.append((np.array(xs), np.array(ys)))
+        return chains
+
+    def _zigzag_links(self, polygons: list, angle: float, spacing: float, family: tuple) -> tuple:
+        """
+        Finds which segments of a family may be joined to the segment of the same rank on
+        the next scanline, when both scanlines have the same number of segments.
+
+        A connection between two ends is allowed if it spans at most ZIGZAG_MAX_LINK
+        spacings along the lines and its midpoint, which lies on the half-way line
+        between the two scanlines, is inside the boundary.
+
+        Returns:
+            tuple: (next_segment, link_high, link_low) arrays. next_segment[i] is the
+            index of the candidate segment or -1, link_high / link_low tell whether the
+            x1 / x0 ends of segment i and its candidate may be connected.
         """
-        Find (x0, x1) segment pairs where the horizontal line y = y_val is inside
-        the boundary (even-odd rule across all polygon edges).
+        x0, y0, x1, y1, line = family
+        n = len(line)
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+        # the ends in the rotated frame, where the lines are horizontal
+        rx0 = x0 * cos_a + y0 * sin_a
+        rx1 = x1 * cos_a + y1 * sin_a
+
+        n_lines = int(line.max()) + 2 if n else 1
+        counts = np.bincount(line, minlength=n_lines)
+        first  = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        rank   = np.arange(n) - first[line]
+        has_next = (line + 1 < n_lines) & (counts[np.minimum(line + 1, n_lines - 1)] == counts[line])
+        next_segment = np.where(has_next, first[np.minimum(line + 1, n_lines - 1)] + rank, -1)
+        candidate = np.flatnonzero(next_segment >= 0)
+        nxt = next_segment[candidate]
+
+        rot_polygons = [np.column_stack([ poly[:, 0] * cos_a + poly[:, 1] * sin_a,
+                                         -poly[:, 0] * sin_a + poly[:, 1] * cos_a]) for poly in polygons]
+        all_ry = np.concatenate([p[:, 1] for p in rot_polygons])
+        k0 = int(np.ceil(all_ry.min() / spacing))
+        # the half-way line between the scanlines k0 + line and k0 + line + 1
+        half_y = (np.arange(n_lines) + k0 + 0.5) * spacing
+        half_line, half_x0, half_x1 = self._clip_scanlines(half_y, rot_polygons, -np.inf, np.inf)
+
+        links = []
+        for ends in (rx1, rx0):
+            a, b = ends[candidate], ends[nxt]
+            mid  = (a + b) / 2
+            ok   = np.abs(a - b) <= self.ZIGZAG_MAX_LINK * spacing
+            ok  &= _in_intervals(line[candidate], mid, half_line, half_x0, half_x1)
+            link = np.zeros(n, dtype=bool)
+            link[candidate] = ok
+            links.append(link)
+        return next_segment, links[0], links[1]
+
+    def _clip_families(self, path_list: PathList) -> list:
         """
-        crossings = []
+        Clips every line family against the boundary. Returns one (x0, y0, x1, y1, line)
+        tuple of arrays per family: the segment endpoints and the index of the scanline
+        of each segment, ordered by scanline and then along the line.
+        """
+        polygons = [np.column_stack([p.x, p.y]) for p in path_list.paths
+                    if len(p.x) > 0]
+        boundary = _boundary_key(path_list)
+        return [_geometry_cache.get(('segments', boundary, float(angle), float(spacing)),
+                                    lambda: self._clip_family(polygons, angle, spacing))
+                for angle, spacing in self._line_families()]
+
+    def _clip_family(self, polygons: list, angle: float, spacing: float) -> tuple:
+        """
+        Clips the lines at the given angle and spacing against the boundary polygons.
+        Returns the (x0, y0, x1, y1, line) arrays, see _clip_families.
+        """
+        cos_a, sin_a = np.cos(angle), np.sin(angle)
+
+        # Rotate each boundary polygon by -angle
+        rot_polygons = []
         for poly in polygons:
-            vy     = poly[:, 1]
-            vx     = poly[:, 0]
-            vy_next = np.roll(vy, -1)
-            vx_next = np.roll(vx, -1)
-            mask = (vy > y_val) != (vy_next > y_val)
-            if mask.any():
-                t  = (y_val - vy[mask]) / (vy_next[mask] - vy[mask])
-                xi = vx[mask] + t * (vx_next[mask] - vx[mask])
-                crossings.extend(xi.tolist())
-        crossings.sort()
-        segments = []
-        for i in range(0, len(crossings) - 1, 2):
-            x0 = max(crossings[i],     lo_x)
-            x1 = min(crossings[i + 1], hi_x)
-            if x0 < x1:
-                segments.append((x0, x1))
-        return segments
+            rx =  poly[:, 0] * cos_a + poly[:, 1] * sin_a
+            ry = -poly[:, 0] * sin_a + poly[:, 1] * cos_a
+            rot_polygons.append(np.column_stack([rx, ry]))
+
+        all_ry = np.concatenate([p[:, 1] for p in rot_polygons])
+        all_rx = np.concatenate([p[:, 0] for p in rot_polygons])
+        min_ry, max_ry = float(all_ry.min()), float(all_ry.max())
+        min_rx, max_rx = float(all_rx.min()), float(all_rx.max())
+
+        k0 = int(np.ceil(min_ry / spacing))
+        k1 = int(np.floor(max_ry / spacing))
+        scan_y = np.arange(k0, k1 + 1) * spacing
+        line, rx0, rx1 = self._clip_scanlines(scan_y, rot_polygons, min_rx, max_rx)
+        ry = scan_y[line]
+
+        # Rotate endpoints back by +angle
+        x0 = rx0 * cos_a - ry * sin_a
+        y0 = rx0 * sin_a + ry * cos_a
+        x1 = rx1 * cos_a - ry * sin_a
+        y1 = rx1 * sin_a + ry * cos_a
+        return x0, y0, x1, y1, line
+
+    @staticmethod
+    def _clip_scanlines(scan_y: np.ndarray, polygons: list, lo_x: float, hi_x: float):
+        """
+        Clips all the horizontal lines y = scan_y[k] against the boundary at once
+        (even-odd rule across all polygon edges).
+
+        The edges are bucketed by their y-range: an edge crosses the scanlines with
+        min(vy, vy_next) <= y < max(vy, vy_next), which is a contiguous run of the
+        ascending scan_y. All crossings are computed in one pass, sorted by
+        (scanline, x) and paired up.
+
+        Returns:
+            tuple: (line, x0, x1) arrays, one element per inside segment: the index
+            of its scanline in scan_y and its ends, ordered by scanline and then by x.
+        """
+        vx      = np.concatenate([poly[:, 0] for poly in polygons])
+        vy      = np.concatenate([poly[:, 1] for poly in polygons])
+        vx_next = np.concatenate([np.roll(poly[:, 0], -1) for poly in polygons])
+        vy_next = np.concatenate([np.roll(poly[:, 1], -1) for poly in polygons])
+
+        line_begin = np.searchsorted(scan_y, np.minimum(vy, vy_next), side='left')
+        line_end   = np.searchsorted(scan_y, np.maximum(vy, vy_next), side='left')
+        edge, step = get_subdivision_indices(line_end - line_begin)
+        line  = line_begin[edge] + step - 1
+        y_val = scan_y[line]
+        t  = (y_val - vy[edge]) / (vy_next[edge] - vy[edge])
+        xi = vx[edge] + t * (vx_next[edge] - vx[edge])
+
+        order = np.lexsort((xi, line))
+        line, xi = line[order], xi[order]
+        # pair the crossings (0, 1), (2, 3), ... of every scanline; an odd last one is dropped
+        counts = np.bincount(line, minlength=len(scan_y))
+        first  = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        rank   = np.arange(len(line)) - first[line]
+        start  = np.flatnonzero((rank % 2 == 0) & (rank + 1 < counts[line]))
+        x0 = np.maximum(xi[start],     lo_x)
+        x1 = np.minimum(xi[start + 1], hi_x)
+        keep = x0 < x1
+        return line[start][keep], x0[keep], x1[keep]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -233,15 +798,27 @@ class _GyroidInfillGenerator(_ImplicitSurfaceInfillGenerator):
         self.infill_distance = infill_distance
         self.value = value
 
+    def _period(self):
+        theta = np.pi / 4
+        return np.pi * np.cos(theta) * np.sqrt(2) / self.infill_distance
+
     def _equation(self, X, Y, z_height):
+        return self._equation_from_terms(self._equation_terms(X, Y), z_height)
+
+    def _equation_terms(self, X, Y):
         theta = np.pi / 4
-        p     = np.pi * np.cos(theta) * np.sqrt(2) / self.infill_distance
+        p     = self._period()
         rot_x =  X * np.cos(theta) + Y * np.sin(theta)
         rot_y = -X * np.sin(theta) + Y * np.cos(theta)
+        return np.sin(rot_x * p) * np.cos(rot_y * p), np.sin(rot_y * p), np.cos(rot_x * p)
+
+    def _equation_from_terms(self, terms, z_height):
+        xy_term, sin_rot_y, cos_rot_x = terms
+        p = self._period()
         return (
-            np.sin(rot_x * p) * np.cos(rot_y * p)
-            + np.sin(rot_y * p) * np.cos(z_height * p)
-            + np.sin(z_height * p) * np.cos(rot_x * p)
+            xy_term
+            + sin_rot_y * np.cos(z_height * p)
+            + np.sin(z_height * p) * cos_rot_x
             - self.value
         )
 
@@ -255,8 +832,15 @@ class _SchwartzPInfillGenerator(_ImplicitSurfaceInfillGenerator):
         self.value = value
 
     def _equation(self, X, Y, z_height):
+        return self._equation_from_terms(self._equation_terms(X, Y), z_height)
+
+    def _equation_terms(self, X, Y):
         p = 2 * np.pi / self.infill_distance
-        return np.cos(X * p) + np.cos(Y * p) + np.cos(z_height * p) - self.value
+        return np.cos(X * p) + np.cos(Y * p)
+
+    def _equation_from_terms(self, terms, z_height):
+        p = 2 * np.pi / self.infill_distance
+        return terms + np.cos(z_height * p) - self.value
 
 
 class _CustomImplicitInfillGenerator(_ImplicitSurfaceInfillGenerator):
@@ -266,11 +850,15 @@ class _CustomImplicitInfillGenerator(_ImplicitSurfaceInfillGenerator):
     The scalar field is provided as a callable ``equation_fn(X, Y, z_height)``
     that receives the meshgrid arrays and the layer height, and returns a
     2-D ndarray of the same shape.  The iso-contour at level 0 becomes the
-    infill pattern.
+    infill pattern.  In adaptive mode it receives 1-D arrays of points instead.
     """
-    def __init__(self, equation_fn, resolution: float):
+    def __init__(self, equation_fn, resolution: float, adaptive_levels: int = 0):
         self._equation_fn = equation_fn
         self._res_step    = resolution   # grid step in mm
+        self.adaptive_levels = adaptive_levels
+
+    def _finest_step(self):
+        return self._res_step
 
     def _resolution(self, min_x, max_x, min_y, max_y):
         return (
@@ -288,9 +876,10 @@ class _CustomImplicitInfillGenerator(_ImplicitSurfaceInfillGenerator):
 
 class _LineInfillGenerator(_LinePatternInfillGenerator):
     """Single family of parallel lines at a given angle."""
-    def __init__(self, infill_distance: float, angle: float):
+    def __init__(self, infill_distance: float, angle: float, output: str = 'paths'):
         self.infill_distance = infill_distance
         self.angle = angle
+        self.output = output
 
     def _line_families(self):
         return [(self.angle, self.infill_distance)]
@@ -298,8 +887,9 @@ class _LineInfillGenerator(_LinePatternInfillGenerator):
 
 class _GridInfillGenerator(_LinePatternInfillGenerator):
     """Two families of axis-aligned lines (0° and 90°)."""
-    def __init__(self, infill_distance: float):
+    def __init__(self, infill_distance: float, output: str = 'paths'):
         self.infill_distance = infill_distance
+        self.output = output
 
     def _line_families(self):
         d = self.infill_distance
@@ -308,8 +898,9 @@ class _GridInfillGenerator(_LinePatternInfillGenerator):
 
 class _TriangleInfillGenerator(_LinePatternInfillGenerator):
     """Three families of lines at 0°, 60°, 120° forming an equilateral triangular grid."""
-    def __init__(self, infill_distance: float):
+    def __init__(self, infill_distance: float, output: str = 'paths'):
         self.infill_distance = infill_distance
+        self.output = output
 
     def _line_families(self):
         d = self.infill_distance
@@ -335,12 +926,19 @@ class Infill:
         infill = gc.Infill.grid(wall, infill_distance=2)
         infill = gc.Infill.triangle(wall, infill_distance=2)
 
+        # Line patterns as one compact SegmentBundle, or as joined zigzag polylines:
+        infill = gc.Infill.grid(wall, infill_distance=2, output='bundle')
+        infill = gc.Infill.line(wall, infill_distance=2, output='zigzag')
+
         # Custom implicit surface:
         def my_equation(X, Y, z_height):
             p = 2 * np.pi / 3.0
             return np.sin(X * p) + np.cos(Y * p) * np.sin(z_height * p)
 
         infill = gc.Infill.custom_implicit(wall, my_equation)
+
+        # One boundary per layer; identical XY boundaries share the grid and mask:
+        infills = gc.Infill.gyroid_layers(walls, infill_distance=2)
     """
 
     @staticmethod
@@ -374,7 +972,7 @@ class Infill:
         return _SchwartzPInfillGenerator(infill_distance, value)(path)
 
     @staticmethod
-    def line(path, infill_distance=1, angle=np.pi/4) -> PathList:
+    def line(path, infill_distance=1, angle=np.pi/4, output='paths'):
         """
         Parallel-line infill at a given angle.
 
@@ -382,42 +980,51 @@ class Infill:
             path (Path or PathList): Boundary of the infill region.
             infill_distance (float): Perpendicular spacing between lines.
             angle (float): Angle of the lines from the X-axis in radians.
+            output (str): 'paths' (default) for one Path per segment, 'bundle' for a
+                single SegmentBundle, or 'zigzag' to join neighbouring lines into polylines.
 
         Returns:
-            PathList: Generated infill paths (each Path is a straight segment).
+            PathList or SegmentBundle: Generated infill paths (with output='paths' each Path
+                is a straight segment).
         """
-        return _LineInfillGenerator(infill_distance, angle)(path)
+        return _LineInfillGenerator(infill_distance, angle, output)(path)
 
     @staticmethod
-    def grid(path, infill_distance=1) -> PathList:
+    def grid(path, infill_distance=1, output='paths'):
         """
         Rectilinear grid infill (lines in X and Y).
 
         Args:
             path (Path or PathList): Boundary of the infill region.
             infill_distance (float): Spacing between grid lines.
+            output (str): 'paths' (default) for one Path per segment, 'bundle' for a
+                single SegmentBundle, or 'zigzag' to join neighbouring lines into polylines.
 
         Returns:
-            PathList: Generated infill paths (each Path is a straight segment).
+            PathList or SegmentBundle: Generated infill paths (with output='paths' each Path
+                is a straight segment).
         """
-        return _GridInfillGenerator(infill_distance)(path)
+        return _GridInfillGenerator(infill_distance, output)(path)
 
     @staticmethod
-    def triangle(path, infill_distance=1) -> PathList:
+    def triangle(path, infill_distance=1, output='paths'):
         """
         Triangular grid infill (lines at 0°, 60°, 120°).
 
         Args:
             path (Path or PathList): Boundary of the infill region.
             infill_distance (float): Perpendicular spacing within each line family.
+            output (str): 'paths' (default) for one Path per segment, 'bundle' for a
+                single SegmentBundle, or 'zigzag' to join neighbouring lines into polylines.
 
         Returns:
-            PathList: Generated infill paths (each Path is a straight segment).
+            PathList or SegmentBundle: Generated infill paths (with output='paths' each Path
+                is a straight segment).
         """
-        return _TriangleInfillGenerator(infill_distance)(path)
+        return _TriangleInfillGenerator(infill_distance, output)(path)
 
     @staticmethod
-    def custom_implicit(path, equation_fn, resolution=0.4) -> PathList:
+    def custom_implicit(path, equation_fn, resolution=0.4, adaptive_levels=0) -> PathList:
         """
         Infill defined by a user-supplied implicit surface equation.
 
@@ -432,6 +1039,11 @@ class Infill:
                 The iso-contour at level 0 is used as the infill.
             resolution (float): Grid sampling step in mm. Smaller values give
                 finer contours but take longer. Default: 0.4.
+            adaptive_levels (int): If greater than 0, the field is first sampled on a
+                grid 2**adaptive_levels times coarser than resolution, and only the
+                cells near the contours are refined down to resolution. This makes
+                fine resolutions (< 0.1 mm) affordable, but equation_fn must then be
+                element-wise, as it receives 1-D arrays of points. Default: 0.
 
         Returns:
             PathList: Generated infill paths.
@@ -451,8 +1063,115 @@ class Infill:
                 )
 
             infill = gc.Infill.custom_implicit(wall, lidinoid, resolution=0.3)
+
+            # 0.05 mm contours, sampled adaptively from a 0.8 mm grid:
+            infill = gc.Infill.custom_implicit(wall, lidinoid, resolution=0.05, adaptive_levels=4)
+        """
+        return _CustomImplicitInfillGenerator(equation_fn, resolution, adaptive_levels)(path)
+
+    # ── Multi-layer variants ────────────────────────────────────────────────
+    #
+    # Each takes an iterable of boundaries (one Path or PathList per layer) and
+    # returns a list with one PathList per boundary, identical to calling the
+    # single-layer method on every boundary. Boundaries with the same XY geometry
+    # are detected by hash, and the z-independent work is done once for them.
+
+    @staticmethod
+    def gyroid_layers(paths, infill_distance=1, value=0) -> list:
+        """
+        Gyroid infill of many layers. See Infill.gyroid().
+
+        Args:
+            paths (iterable): Boundaries of the infill regions, one Path or PathList per layer.
+            infill_distance (float): Spacing between gyroid surfaces.
+            value (float): Iso-level offset; 0 gives the mid-surface.
+
+        Returns:
+            list: One PathList per boundary.
+        """
+        return _GyroidInfillGenerator(infill_distance, value).generate_layers(paths)
+
+    @staticmethod
+    def schwartz_p_layers(paths, infill_distance=1, value=0) -> list:
+        """
+        Schwartz P infill of many layers. See Infill.schwartz_p().
+
+        Args:
+            paths (iterable): Boundaries of the infill regions, one Path or PathList per layer.
+            infill_distance (float): Spacing between surfaces.
+            value (float): Iso-level offset; 0 gives the mid-surface.
+
+        Returns:
+            list: One PathList per boundary.
+        """
+        return _SchwartzPInfillGenerator(infill_distance, value).generate_layers(paths)
+
+    @staticmethod
+    def line_layers(paths, infill_distance=1, angle=np.pi/4, output='paths') -> list:
+        """
+        Parallel-line infill of many layers. See Infill.line().
+
+        Args:
+            paths (iterable): Boundaries of the infill regions, one Path or PathList per layer.
+            infill_distance (float): Perpendicular spacing between lines.
+            angle (float): Angle of the lines from the X-axis in radians.
+            output (str): 'paths' (default) for one Path per segment, 'bundle' for a
+                single SegmentBundle, or 'zigzag' to join neighbouring lines into polylines.
+
+        Returns:
+            list: One PathList (or SegmentBundle) per boundary.
+        """
+        return _LineInfillGenerator(infill_distance, angle, output).generate_layers(paths)
+
+    @staticmethod
+    def grid_layers(paths, infill_distance=1, output='paths') -> list:
+        """
+        Rectilinear grid infill of many layers. See Infill.grid().
+
+        Args:
+            paths (iterable): Boundaries of the infill regions, one Path or PathList per layer.
+            infill_distance (float): Spacing between grid lines.
+            output (str): 'paths' (default) for one Path per segment, 'bundle' for a
+                single SegmentBundle, or 'zigzag' to join neighbouring lines into polylines.
+
+        Returns:
+            list: One PathList (or SegmentBundle) per boundary.
+        """
+        return _GridInfillGenerator(infill_distance, output).generate_layers(paths)
+
+    @staticmethod
+    def triangle_layers(paths, infill_distance=1, output='paths') -> list:
+        """
+        Triangular grid infill of many layers. See Infill.triangle().
+
+        Args:
+            paths (iterable): Boundaries of the infill regions, one Path or PathList per layer.
+            infill_distance (float): Perpendicular spacing within each line family.
+            output (str): 'paths' (default) for one Path per segment, 'bundle' for a
+                single SegmentBundle, or 'zigzag' to join neighbouring lines into polylines.
+
+        Returns:
+            list: One PathList (or SegmentBundle) per boundary.
+        """
+        return _TriangleInfillGenerator(infill_distance, output).generate_layers(paths)
+
+    @staticmethod
+    def custom_implicit_layers(paths, equation_fn, resolution=0.4, adaptive_levels=0) -> list:
+        """
+        Infill of many layers defined by a user-supplied implicit surface equation.
+        See Infill.custom_implicit(). The grid and mask are shared between layers with
+        the same boundary, but equation_fn is evaluated on the full grid per layer.
+
+        Args:
+            paths (iterable): Boundaries of the infill regions, one Path or PathList per layer.
+            equation_fn (callable): ``(X, Y, z_height) -> np.ndarray``.
+            resolution (float): Grid sampling step in mm. Default: 0.4.
+            adaptive_levels (int): Adaptive sampling, see Infill.custom_implicit(). Default: 0.
+
+        Returns:
+            list: One PathList per boundary.
         """
-        return _CustomImplicitInfillGenerator(equation_fn, resolution)(path)
+        return _CustomImplicitInfillGenerator(equation_fn, resolution, adaptive_levels).generate_layers(paths)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1,5 +1,5 @@
 import numpy as np
-from gcoordinator.utils.coords import get_distances_between_coords
+from gcoordinator.utils.geometry import segment_lengths, rectangular_bead_extrusion
 
 
 class Kinematics:
@@ -25,10 +25,7 @@ class Kinematics:
         path.center = np.array([np.mean(path.x), np.mean(path.y), np.mean(path.z)])
         path.start_coord = path.coords[0]
         path.end_coord = path.coords[-1]
-        norms = []
-        for i in range(len(path.coords)):
-            norms.append((0, 0, 1))
-        path.norms = norms
+        path.norms = np.tile(np.array([0, 0, 1]), (len(path.coords), 1))
     
     @staticmethod
     def calculate_extrusion(path) -> np.ndarray:
@@ -44,21 +41,24 @@ class Kinematics:
         Raises:
             None.
         """
-        coords = path.coords
-        distances = get_distances_between_coords(coords)
+        distances = segment_lengths(path.coords)
+        multipliers = Kinematics.get_extrusion_multipliers(path, len(distances))
+        return rectangular_bead_extrusion(distances, path.nozzle_diameter, path.layer_height,
+                                          path.filament_diameter, multipliers)
 
-        if path.segment_extrusion_multiplier is not None:
-            multipliers = np.asarray(path.segment_extrusion_multiplier)
-        else:
-            multipliers = np.full(len(distances), path.extrusion_multiplier)
+    @staticmethod
+    def get_extrusion_multipliers(path, n_segments) -> np.ndarray:
+        """
+        Returns the extrusion multiplier of each segment of a given path.
+        segment_extrusion_multiplier takes precedence over extrusion_multiplier.
 
-        extrusion = np.zeros(len(distances))
-        for i, distance in enumerate(distances):
-            # Calculate the extrusion for each distance
-            # for more details, see formula 3 in the following paper:
-            # https://www.ncbi.nlm.nih.gov/pmc/articles/PMC7600913/
-            numerator    = 4 * path.nozzle_diameter * path.layer_height * distance
-            denominator  = np.pi * path.filament_diameter**2
-            extrusion[i] = numerator / denominator * multipliers[i]
+        Args:
+            path (Path): The path for which to get the multipliers.
+            n_segments (int): The number of segments of the path.
 
-        return extrusion
\ No newline at end of file
+        Returns:
+            numpy.ndarray: An array of multipliers, one for each segment of the path.
+        """
+        if path.segment_extrusion_multiplier is not None:
+            return np.asarray(path.segment_extrusion_multiplier, dtype=float)[:n_segments]
+        return np.full(n_segments, path.extrusion_multiplier, dtype=float)
\ No newline at end of file
@@ -4,7 +4,10 @@ import math
 import pickle
 import numpy as np
 from gcoordinator.kinematics.kin_base import Kinematics
-from gcoordinator.settings            import template_settings
+from gcoordinator.settings            import get_settings
+from gcoordinator.utils.gcode_format  import format_g1_block
+from gcoordinator.utils.coords        import get_subdivision_indices
+from gcoordinator.utils.geometry      import segment_lengths, sum_by_segment, rounded_bead_extrusion
 
 class BedRotate(Kinematics):
     """
@@ -26,17 +29,12 @@ class BedRotate(Kinematics):
     @classmethod
     def load_settings(cls):
         """
-        Loads the nozzle tilt and rotation settings from a pickle file and sets them as class attributes.
+        Loads the nozzle tilt and rotation settings from the settings cache and sets them as class attributes.
 
         Returns:
             None
         """
-        try:
-            settings_path = '.temp_config.json'
-            with open(settings_path, 'r') as f:
-                settings = json.load(f)
-        except:
-            settings = template_settings # gcoordinator/settings.py
+        settings = get_settings() # cached, see gcoordinator/settings.py
         
         cls.rot_code     = settings['Kinematics']['BedRotate']['rot_code']
         cls.rot_offset   = settings['Kinematics']['BedRotate']['rot_offset']
@@ -57,73 +55,58 @@ class BedRotate(Kinematics):
             None
         """
         BedRotate.load_settings()
-        coords = []
-        norms = []
-        path.sub_segment_cnt = []
-        ppx = px = path.x[0]
-        ppy = py = path.y[0]
-        ppz = pz = path.z[0]
-        pprot = prot = path.rot[0]
-        # start pos
-        bx2 = px * math.cos(-prot) - py * math.sin(-prot)
-        by2 = px * math.sin(-prot) + py * math.cos(-prot)
-        bz2 = pz
-        pos = (bx2, by2, bz2)
-        coords.append(pos)
-        for (nx,ny,nz,nrot) in zip(path.x[1:],path.y[1:],path.z[1:],path.rot[1:]):
-            # pre calc
-            Dis = 0.0
-            for i in range(BedRotate.PRE_MOVE_DIV):
-                bx1 = (nx - px) * (i+1) / BedRotate.PRE_MOVE_DIV + px
-                by1 = (ny - py) * (i+1) / BedRotate.PRE_MOVE_DIV + py
-                bz1 = (nz - pz) * (i+1) / BedRotate.PRE_MOVE_DIV + pz
-                brot = (nrot - prot) * (i+1) / BedRotate.PRE_MOVE_DIV + prot
-                # calc pos
-                bx2 = bx1 * math.cos(-brot) - by1 * math.sin(-brot)
-                by2 = bx1 * math.sin(-brot) + by1 * math.cos(-brot)
-                bz2 = bz1
-                # distance
-                Dis += math.sqrt((bx2-ppx)**2 + (by2-ppy)**2 + (bz2-ppz)**2)
-                # sub prev
-                ppx = bx2
-                ppy = by2
-                ppz = bz2
-                pprot = brot
-            # calc coords
-            div = (int)(np.ceil(Dis / BedRotate.div_distance))
-            path.sub_segment_cnt.append(div)
-            for i in range(div):
-                bx1 = (nx - px) * (i+1) / div + px
-                by1 = (ny - py) * (i+1) / div + py
-                bz1 = (nz - pz) * (i+1) / div + pz
-                brot = (nrot - prot) * (i+1) / div + prot
-                # calc pos
-                bx2 = bx1 * math.cos(-brot) - by1 * math.sin(-brot)
-                by2 = bx1 * math.sin(-brot) + by1 * math.cos(-brot)
-                bz2 = bz1
-                pos = (bx2, by2, bz2)
-                coords.append(pos)
-            # prev
-            px = bx2
-            py = by2
-            pz = bz2
-            prot = brot
-        for i in range(len(coords)):
-            norms.append((0, 0, 1))
-            
-        center_x = center_y = center_z = 0.0
-        for coord in coords:
-            center_x += coord[0]
-            center_y += coord[1]
-            center_z += coord[2]
-        center_x /= len(coords)
-        center_y /= len(coords)
-        center_z /= len(coords)
-        path.coords = coords
-        path.norms = norms
-        path.center = (center_x, center_y, center_z)
+        x   = np.asarray(path.x,   dtype=float)
+        y   = np.asarray(path.y,   dtype=float)
+        z   = np.asarray(path.z,   dtype=float)
+        rot = np.asarray(path.rot, dtype=float)
+        # every point of the path in the bed frame
+        bed_x = x * np.cos(-rot) - y * np.sin(-rot)
+        bed_y = x * np.sin(-rot) + y * np.cos(-rot)
+
+        # start of each segment: the first segment starts from the raw first point,
+        # the following ones from the bed-frame end point of the previous segment
+        px   = np.concatenate([x[:1], bed_x[1:]])[:-1]
+        py   = np.concatenate([y[:1], bed_y[1:]])[:-1]
+        pz   = z[:-1]
+        prot = rot[:-1]
+        dx   = x[1:]   - px
+        dy   = y[1:]   - py
+        dz   = z[1:]   - pz
+        drot = rot[1:] - prot
+
+        # pre calc: length of each segment in the bed frame, sampled at PRE_MOVE_DIV points.
+        # all segments are processed at once, one sample step at a time
+        dis = np.zeros(len(dx))
+        ppx, ppy, ppz = px, py, pz
+        for i in range(BedRotate.PRE_MOVE_DIV):
+            bx1  = dx   * (i+1) / BedRotate.PRE_MOVE_DIV + px
+            by1  = dy   * (i+1) / BedRotate.PRE_MOVE_DIV + py
+            bz1  = dz   * (i+1) / BedRotate.PRE_MOVE_DIV + pz
+            brot = drot * (i+1) / BedRotate.PRE_MOVE_DIV + prot
+            bx2 = bx1 * np.cos(-brot) - by1 * np.sin(-brot)
+            by2 = bx1 * np.sin(-brot) + by1 * np.cos(-brot)
+            dis += np.sqrt((bx2-ppx)**2 + (by2-ppy)**2 + (bz1-ppz)**2)
+            ppx, ppy, ppz = bx2, by2, bz1
+
+        # calc coords: divide each segment into sub_segment_cnt points
+        div = np.ceil(dis / BedRotate.div_distance).astype(np.int64)
+        path.sub_segment_cnt = div
+        seg, step = get_subdivision_indices(div)
+        bx1  = dx[seg]   * step / div[seg] + px[seg]
+        by1  = dy[seg]   * step / div[seg] + py[seg]
+        bz1  = dz[seg]   * step / div[seg] + pz[seg]
+        brot = drot[seg] * step / div[seg] + prot[seg]
+
+        coords = np.empty((len(seg) + 1, 3))
+        coords[0]      = (bed_x[0], bed_y[0], z[0]) # start pos
+        coords[1:, 0]  = bx1 * np.cos(-brot) - by1 * np.sin(-brot)
+        coords[1:, 1]  = bx1 * np.sin(-brot) + by1 * np.cos(-brot)
+        coords[1:, 2]  = bz1
+        path.coords      = coords
+        path.norms       = np.tile(np.array([0.0, 0.0, 1.0]), (len(coords), 1))
+        path.center      = coords.mean(axis=0)
         path.start_coord = path.coords[0]
-        path.end_coord = path.coords[-1]
+        path.end_coord   = path.coords[-1]
     
     @staticmethod
     def calculate_extrusion(path) -> np.ndarray:
@@ -139,30 +122,11 @@ class BedRotate(Kinematics):
         Raises:
             None.
         """
-        if path.segment_extrusion_multiplier is not None:
-            multipliers = np.asarray(path.segment_extrusion_multiplier)
-        else:
-            multipliers = np.full(len(path.x) - 1, path.extrusion_multiplier)
-
-        extrusion = np.array([])
-        px = path.coords[0][0]
-        py = path.coords[0][1]
-        pz = path.coords[0][2]
-        idx = 0
-        for i in range(len(path.x[1:])):
-            Dis = 0.0
-            for j in range(path.sub_segment_cnt[i]):
-                idx += 1
-                nx = path.coords[idx][0]
-                ny = path.coords[idx][1]
-                nz = path.coords[idx][2]
-                Dis += math.sqrt((nx-px)**2 + (ny-py)**2 + (nz-pz)**2)
-                px = nx
-                py = ny
-                pz = nz
-            AREA=(path.nozzle_diameter-path.layer_height)*(path.layer_height)+(path.layer_height/2)**2*np.pi
-            extrusion = np.append(extrusion, 4*AREA*Dis/(np.pi*path.filament_diameter**2) * multipliers[i])
-        return extrusion
+        multipliers = BedRotate.get_extrusion_multipliers(path, len(path.x) - 1)
+        # length of each segment in the bed frame: sum of the distances between its sub-points
+        dis = sum_by_segment(segment_lengths(path.coords), path.sub_segment_cnt)
+        return rounded_bead_extrusion(dis, path.nozzle_diameter, path.layer_height,
+                                      path.filament_diameter, multipliers)
     
 
     @staticmethod
@@ -177,14 +141,10 @@ class BedRotate(Kinematics):
             A string containing the G-code for the given path.
         """
         extrusion = BedRotate.calculate_extrusion(path)
-        txt = ''
-        for i in range(len(path.x)-1):
-            # print the path. move to the next point with extrusion
-            txt += f'G1 F{path.print_speed} '
-            txt += f'X{path.x[i+1]+path.x_origin:.5f} '
-            txt += f'Y{path.y[i+1]+path.y_origin:.5f} '
-            txt += f'Z{path.z[i+1]:.5f} '
-            txt += f'{BedRotate.rot_code}{path.tilt[i+1]+BedRotate.rot_offset:.5f} '
-            txt += f'E{extrusion[i]:.5f}\n'
-        return txt
+        # print the path. move to the next point with extrusion
+        axes = [('X', path.x[1:] + path.x_origin),
+                ('Y', path.y[1:] + path.y_origin),
+                ('Z', path.z[1:]),
+                (BedRotate.rot_code, path.tilt[1:] + BedRotate.rot_offset)]
+        return format_g1_block(path.print_speed, axes, extrusion)
     
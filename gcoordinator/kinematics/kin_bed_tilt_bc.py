@@ -4,7 +4,10 @@ import math
 import pickle
 import numpy as np
 from gcoordinator.kinematics.kin_base import Kinematics
-from gcoordinator.settings            import template_settings
+from gcoordinator.settings            import get_settings
+from gcoordinator.utils.gcode_format  import format_g1_block
+from gcoordinator.utils.coords        import get_subdivision_indices
+from gcoordinator.utils.geometry      import segment_lengths, sum_by_segment, rounded_bead_extrusion
 
 
 
@@ -19,6 +22,7 @@ class BedTiltBC(Kinematics):
         load_settings(): Loads the nozzle tilt and rotation settings from a pickle file and sets them as class attributes.
         generate_gcode_of_path(path): Generates G-code for a given path.
         update_attrs(path): Rearranges the coordinates of a given path and calculates the corresponding normals.
+        to_bed_frame(x, y, z, rot, tilt): Transforms points into the bed frame.
         calculate_extrusion(path): Calculates the extrusion required for a given path.
         
     """
@@ -27,18 +31,12 @@ class BedTiltBC(Kinematics):
     @classmethod
     def load_settings(cls):
         """
-        Loads the nozzle tilt and rotation settings from a pickle file and sets them as class attributes.
+        Loads the nozzle tilt and rotation settings from the settings cache and sets them as class attributes.
 
         Returns:
             None
         """
-        try:
-            settings_path = '.temp_config.json'
-            with open(settings_path, 'r') as f:
-                settings = json.load(f)
-            
-        except:
-            settings = template_settings # gcoordinator/settings.py
+        settings = get_settings() # cached, see gcoordinator/settings.py
         
         cls.tilt_code   = settings['Kinematics']['BedTiltBC']['tilt_code']
         cls.rot_code    = settings['Kinematics']['BedTiltBC']['rot_code']
@@ -61,96 +59,90 @@ class BedTiltBC(Kinematics):
             None
         """
         BedTiltBC.load_settings()
-        coords = []
-        norms = []
-        path.sub_segment_cnt = []
-        ppx = px = path.x[0]
-        ppy = py = path.y[0]
-        ppz = pz = path.z[0]
-        pprot = prot = path.rot[0]
-        pptilt = ptilt = path.tilt[0]
-        # start pos
-        bx2 = px * math.cos(ptilt) - pz * math.sin(ptilt)
-        by2 = py
-        bz2 = px * math.sin(ptilt) + pz * math.cos(ptilt)
-        bx3 = bx2 * math.cos(-prot) - by2 * math.sin(-prot)
-        by3 = bx2 * math.sin(-prot) + by2 * math.cos(-prot)
-        bz3 = bz2
-        pos = (bx3, by3, bz3)
-        coords.append(pos)
-        # start norm
-        mat = ( (math.cos(prot) * math.cos(-ptilt), math.sin(prot), math.cos(prot) * math.sin(-ptilt)),
-                (-math.sin(prot) * math.cos(-ptilt), math.cos(prot), -math.sin(prot) * math.sin(-ptilt)),
-                (-math.sin(-ptilt), 0, math.cos(-ptilt)) )
-        norm = (mat[0][2], mat[1][2], mat[2][2])
-        norms.append(norm)
-        for (nx,ny,nz,nrot,ntilt) in zip(path.x[1:],path.y[1:],path.z[1:],path.rot[1:],path.tilt[1:]):
-            # pre calc
-            Dis = 0.0
-            for i in range(BedTiltBC.PRE_MOVE_DIV):
-                bx1 = (nx - px) * (i+1) / BedTiltBC.PRE_MOVE_DIV + px
-                by1 = (ny - py) * (i+1) / BedTiltBC.PRE_MOVE_DIV + py
-                bz1 = (nz - pz) * (i+1) / BedTiltBC.PRE_MOVE_DIV + pz
-                brot = (nrot - prot) * (i+1) / BedTiltBC.PRE_MOVE_DIV + prot
-                btilt = (ntilt - ptilt) * (i+1) / BedTiltBC.PRE_MOVE_DIV + ptilt
-                # calc pos
-                bx2 = bx1 * math.cos(btilt) - bz1 * math.sin(btilt)
-                by2 = by1
-                bz2 = bx1 * math.sin(btilt) + bz1 * math.cos(btilt)
-                bx3 = bx2 * math.cos(-brot) - by2 * math.sin(-brot)
-                by3 = bx2 * math.sin(-brot) + by2 * math.cos(-brot)
-                bz3 = bz2
-                # distance
-                Dis += math.sqrt((bx3-ppx)**2 + (by3-ppy)**2 + (bz3-ppz)**2)
-                # sub prev
-                ppx = bx3
-                ppy = by3
-                ppz = bz3
-                pprot = brot
-                pptilt = btilt
-            # calc coords
-            div = (int)(np.ceil(Dis / BedTiltBC.div_distance))
-            path.sub_segment_cnt.append(div)
-            for i in range(div):
-                bx1 = (nx - px) * (i+1) / div + px
-                by1 = (ny - py) * (i+1) / div + py
-                bz1 = (nz - pz) * (i+1) / div + pz
-                brot = (nrot - prot) * (i+1) / div + prot
-                btilt = (ntilt - ptilt) * (i+1) / div + ptilt
-                # calc pos
-                bx2 = bx1 * math.cos(btilt) - bz1 * math.sin(btilt)
-                by2 = by1
-                bz2 = bx1 * math.sin(btilt) + bz1 * math.cos(btilt)
-                bx3 = bx2 * math.cos(-brot) - by2 * math.sin(-brot)
-                by3 = bx2 * math.sin(-brot) + by2 * math.cos(-brot)
-                bz3 = bz2
-                pos = (bx3, by3, bz3)
-                coords.append(pos)
-                # calc norm
-                mat = ( (math.cos(brot) * math.cos(-btilt), math.sin(brot), math.cos(brot) * math.sin(-btilt)),
-                        (-math.sin(brot) * math.cos(-btilt), math.cos(brot), -math.sin(brot) * math.sin(-btilt)),
-                        (-math.sin(-btilt), 0, math.cos(-btilt)) )
-                norm = (mat[0][2], mat[1][2], mat[2][2])
-                norms.append(norm)
-            # prev
-            px = bx3
-            py = by3
-            pz = bz3
-            prot = brot
-            ptilt = btilt
-        center_x = center_y = center_z = 0.0
-        for coord in coords:
-            center_x += coord[0]
-            center_y += coord[1]
-            center_z += coord[2]
-        center_x /= len(coords)
-        center_y /= len(coords)
-        center_z /= len(coords)
-        path.coords = coords
-        path.norms = norms
-        path.center = (center_x, center_y, center_z)
+        x    = np.asarray(path.x,    dtype=float)
+        y    = np.asarray(path.y,    dtype=float)
+        z    = np.asarray(path.z,    dtype=float)
+        rot  = np.asarray(path.rot,  dtype=float)
+        tilt = np.asarray(path.tilt, dtype=float)
+        # every point of the path in the bed frame
+        bed_x, bed_y, bed_z = BedTiltBC.to_bed_frame(x, y, z, rot, tilt)
+
+        # start of each segment: the first segment starts from the raw first point,
+        # the following ones from the bed-frame end point of the previous segment
+        px    = np.concatenate([x[:1], bed_x[1:]])[:-1]
+        py    = np.concatenate([y[:1], bed_y[1:]])[:-1]
+        pz    = np.concatenate([z[:1], bed_z[1:]])[:-1]
+        prot  = rot[:-1]
+        ptilt = tilt[:-1]
+        dx    = x[1:]    - px
+        dy    = y[1:]    - py
+        dz    = z[1:]    - pz
+        drot  = rot[1:]  - prot
+        dtilt = tilt[1:] - ptilt
+
+        # pre calc: length of each segment in the bed frame, sampled at PRE_MOVE_DIV points.
+        # all segments are processed at once, one sample step at a time
+        dis = np.zeros(len(dx))
+        ppx, ppy, ppz = px, py, pz
+        for i in range(BedTiltBC.PRE_MOVE_DIV):
+            bx3, by3, bz3 = BedTiltBC.to_bed_frame(
+                dx    * (i+1) / BedTiltBC.PRE_MOVE_DIV + px,
+                dy    * (i+1) / BedTiltBC.PRE_MOVE_DIV + py,
+                dz    * (i+1) / BedTiltBC.PRE_MOVE_DIV + pz,
+                drot  * (i+1) / BedTiltBC.PRE_MOVE_DIV + prot,
+                dtilt * (i+1) / BedTiltBC.PRE_MOVE_DIV + ptilt,
+            )
+            dis += np.sqrt((bx3-ppx)**2 + (by3-ppy)**2 + (bz3-ppz)**2)
+            ppx, ppy, ppz = bx3, by3, bz3
+
+        # calc coords and norms: divide each segment into sub_segment_cnt points
+        div = np.ceil(dis / BedTiltBC.div_distance).astype(np.int64)
+        path.sub_segment_cnt = div
+        seg, step = get_subdivision_indices(div)
+        brot  = drot[seg]  * step / div[seg] + prot[seg]
+        btilt = dtilt[seg] * step / div[seg] + ptilt[seg]
+        brot  = np.concatenate([rot[:1],  brot])
+        btilt = np.concatenate([tilt[:1], btilt])
+
+        coords = np.empty((len(seg) + 1, 3))
+        coords[0] = (bed_x[0], bed_y[0], bed_z[0]) # start pos
+        coords[1:, 0], coords[1:, 1], coords[1:, 2] = BedTiltBC.to_bed_frame(
+            dx[seg] * step / div[seg] + px[seg],
+            dy[seg] * step / div[seg] + py[seg],
+            dz[seg] * step / div[seg] + pz[seg],
+            brot[1:],
+            btilt[1:],
+        )
+        # the normal is the z column of the rotation matrix of the bed
+        norms = np.empty_like(coords)
+        norms[:, 0] =  np.cos(brot) * np.sin(-btilt)
+        norms[:, 1] = -np.sin(brot) * np.sin(-btilt)
+        norms[:, 2] =  np.cos(-btilt)
+
+        path.coords      = coords
+        path.norms       = norms
+        path.center      = coords.mean(axis=0)
         path.start_coord = path.coords[0]
-        path.end_coord = path.coords[-1]
+        path.end_coord   = path.coords[-1]
+
+    @staticmethod
+    def to_bed_frame(x, y, z, rot, tilt) -> tuple:
+        """
+        Transforms points into the bed frame: tilt around the y-axis, then rotation around the z-axis.
+
+        Args:
+            x, y, z (numpy.ndarray): The coordinates of the points.
+            rot (numpy.ndarray): The rotation (C) of each point, in radians.
+            tilt (numpy.ndarray): The tilt (B) of each point, in radians.
+
+        Returns:
+            tuple: The (x, y, z) arrays of the points in the bed frame.
+        """
+        x2 = x * np.cos(tilt) - z * np.sin(tilt)
+        z2 = x * np.sin(tilt) + z * np.cos(tilt)
+        x3 = x2 * np.cos(-rot) - y * np.sin(-rot)
+        y3 = x2 * np.sin(-rot) + y * np.cos(-rot)
+        return x3, y3, z2
     
     @staticmethod
     def calculate_extrusion(path) -> np.ndarray:
@@ -166,31 +158,11 @@ class BedTiltBC(Kinematics):
         Raises:
             None.
         """
-        if path.segment_extrusion_multiplier is not None:
-            multipliers = np.asarray(path.segment_extrusion_multiplier)
-        else:
-            multipliers = np.full(len(path.x) - 1, path.extrusion_multiplier)
-
-        extrusion = np.array([])
-        px = path.coords[0][0]
-        py = path.coords[0][1]
-        pz = path.coords[0][2]
-        idx = 0
-        for i in range(len(path.x[1:])):
-            Dis = 0.0
-            for j in range(path.sub_segment_cnt[i]):
-                idx += 1
-                nx = path.coords[idx][0]
-                ny = path.coords[idx][1]
-                nz = path.coords[idx][2]
-                Dis += math.sqrt((nx-px)**2 + (ny-py)**2 + (nz-pz)**2)
-                px = nx
-                py = ny
-                pz = nz
-            AREA=(path.nozzle_diameter-path.layer_height)*(path.layer_height)+(path.layer_height/2)**2*np.pi
-            extrusion = np.append(extrusion, 4*AREA*Dis/(np.pi*path.filament_diameter**2) * multipliers[i])
-
-        return extrusion
+        multipliers = BedTiltBC.get_extrusion_multipliers(path, len(path.x) - 1)
+        # length of each segment in the bed frame: sum of the distances between its sub-points
+        dis = sum_by_segment(segment_lengths(path.coords), path.sub_segment_cnt)
+        return rounded_bead_extrusion(dis, path.nozzle_diameter, path.layer_height,
+                                      path.filament_diameter, multipliers)
     
     @staticmethod
     def generate_gcode_of_path(path) -> str:
@@ -204,15 +176,11 @@ class BedTiltBC(Kinematics):
             A string containing the G-code for the given path.
         """
         extrusion = BedTiltBC.calculate_extrusion(path)
-        txt = ''
-        for i in range(len(path.x)-1):
-            # print the path. move to the next point with extrusion
-            txt += f'G1 F{path.print_speed} '
-            txt += f'X{path.x[i+1]+path.x_origin:.5f} '
-            txt += f'Y{path.y[i+1]+path.y_origin:.5f} '
-            txt += f'Z{path.z[i+1]:.5f} '
-            txt += f'{BedTiltBC.tilt_code}{path.tilt[i+1]+BedTiltBC.tilt_offset:.5f} '
-            txt += f'{BedTiltBC.rot_code}{path.rot[i+1]+BedTiltBC.rot_offset:.5f} '
-            txt += f'E{extrusion[i]:.5f}\n'
-        return txt
+        # print the path. move to the next point with extrusion
+        axes = [('X', path.x[1:] + path.x_origin),
+                ('Y', path.y[1:] + path.y_origin),
+                ('Z', path.z[1:]),
+                (BedTiltBC.tilt_code, path.tilt[1:] + BedTiltBC.tilt_offset),
+                (BedTiltBC.rot_code,  path.rot[1:]  + BedTiltBC.rot_offset)]
+        return format_g1_block(path.print_speed, axes, extrusion)
     
\ No newline at end of file
@@ -1,6 +1,8 @@
 import numpy as np
 import math
 from gcoordinator.kinematics.kin_base import Kinematics
+from gcoordinator.utils.gcode_format  import format_g1_block, g1_line_template, arc_line_template, format_lines
+from gcoordinator.utils.arc_fitting   import fit_arcs
 
 class Cartesian(Kinematics):
     """
@@ -11,6 +13,7 @@ class Cartesian(Kinematics):
 
     Methods:
         generate_gcode_of_path(path): Generates G-code for a given path.
+        generate_arc_gcode_of_path(path, extrusion): Generates G-code with G2/G3 arcs for a given path.
 
         -- inherited from Kinematics: 
         calculate_extrusion(path): Calculates the extrusion required for a given path.
@@ -29,12 +32,60 @@ class Cartesian(Kinematics):
             str: A string containing the G-code for the given path.
         """
         extrusion = Cartesian.calculate_extrusion(path)
-        txt = ''
-        for i in range(len(path.x)-1):
-            # print the path. move to the next point with extrusion
-            txt += f'G1 F{path.print_speed} '
-            txt += f'X{path.x[i+1]+path.x_origin:.5f} '
-            txt += f'Y{path.y[i+1]+path.y_origin:.5f} '
-            txt += f'Z{path.z[i+1]:.5f} '
-            txt += f'E{extrusion[i]:.5f}\n'
-        return txt
\ No newline at end of file
+        if path.arc_tolerance:
+            return Cartesian.generate_arc_gcode_of_path(path, extrusion)
+        # print the path. move to the next point with extrusion
+        axes = [('X', path.x[1:] + path.x_origin),
+                ('Y', path.y[1:] + path.y_origin),
+                ('Z', path.z[1:])]
+        return format_g1_block(path.print_speed, axes, extrusion)
+
+    @staticmethod
+    def generate_arc_gcode_of_path(path, extrusion) -> str:
+        """
+        Generates G-code for a given path, where the runs of points that lie on a circular
+        arc within path.arc_tolerance are printed with one G2/G3 move (see utils/arc_fitting.py).
+        An arc extrudes the sum of the extrusion of the segments it replaces, and only spans
+        segments with the same extrusion multiplier. The other segments are printed with G1.
+
+        Args:
+            path (Path): A Path object representing the path to generate G-code for.
+            extrusion (numpy.ndarray): The extrusion of every segment, see calculate_extrusion.
+
+        Returns:
+            str: A string containing the G-code for the given path.
+        """
+        multipliers = Cartesian.get_extrusion_multipliers(path, len(extrusion))
+        points = np.column_stack([path.x, path.y, path.z])
+        starts, ends, centers, clockwise = fit_arcs(points, path.arc_tolerance, segment_keys=multipliers)
+        x = path.x + path.x_origin
+        y = path.y + path.y_origin
+        if len(starts) == 0:
+            return format_g1_block(path.print_speed, [('X', x[1:]), ('Y', y[1:]), ('Z', path.z[1:])], extrusion)
+
+        # one line per move, stored at the index of the last segment of the move
+        n_segments = len(extrusion)
+        coverage = np.zeros(n_segments + 1, dtype=np.int64)
+        np.add.at(coverage, starts, 1)
+        np.add.at(coverage, ends, -1)
+        in_arc = np.cumsum(coverage[:-1]) > 0
+        lines = np.empty(n_segments, dtype=object)
+
+        segments = np.flatnonzero(~in_arc)
+        lines[segments] = format_lines(
+            g1_line_template(path.print_speed, ['X', 'Y', 'Z']),
+            [x[segments + 1], y[segments + 1], path.z[segments + 1], extrusion[segments]]).splitlines(keepends=True)
+
+        arc_extrusion = np.concatenate([[0.0], np.cumsum(extrusion)])
+        arc_extrusion = arc_extrusion[ends] - arc_extrusion[starts]
+        offsets = centers - points[starts, :2]
+        for command, arcs in (('G2', clockwise), ('G3', ~clockwise)):
+            end = ends[arcs]
+            lines[end - 1] = format_lines(
+                arc_line_template(command, path.print_speed),
+                [x[end], y[end], path.z[end], offsets[arcs, 0], offsets[arcs, 1], arc_extrusion[arcs]]).splitlines(keepends=True)
+
+        moves = ~in_arc
+        moves[ends - 1] = True
+        return ''.join(lines[moves])
+
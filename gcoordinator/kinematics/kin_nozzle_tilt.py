@@ -4,7 +4,8 @@ import math
 import pickle
 import numpy as np
 from gcoordinator.kinematics.kin_base import Kinematics
-from gcoordinator.settings            import template_settings
+from gcoordinator.settings            import get_settings
+from gcoordinator.utils.gcode_format  import format_g1_block
 
 class NozzleTilt(Kinematics):
     """
@@ -26,17 +27,12 @@ class NozzleTilt(Kinematics):
     @classmethod
     def load_settings(cls):
         """
-        Loads the nozzle tilt and rotation settings from a pickle file and sets them as class attributes.
+        Loads the nozzle tilt and rotation settings from the settings cache and sets them as class attributes.
 
         Returns:
             None
         """
-        try:
-            settings_path = '.temp_config.json'
-            with open(settings_path, 'r') as f:
-                settings = json.load(f)
-        except:
-            settings = template_settings # gcoordinator/settings.py
+        settings = get_settings() # cached, see gcoordinator/settings.py
             
         cls.tilt_code   = settings['Kinematics']['NozzleTilt']['tilt_code']
         cls.rot_code    = settings['Kinematics']['NozzleTilt']['rot_code']
@@ -83,14 +79,10 @@ class NozzleTilt(Kinematics):
             A string containing the G-code for the given path.
         """
         extrusion = NozzleTilt.calculate_extrusion(path)
-        txt = ''
-        for i in range(len(path.x)-1):
-            # print the path. move to the next point with extrusion
-            txt += f'G1 F{path.print_speed} '
-            txt += f'X{path.x[i+1]+path.x_origin:.5f} '
-            txt += f'Y{path.y[i+1]+path.y_origin:.5f} '
-            txt += f'Z{path.z[i+1]:.5f} '
-            txt += f'{NozzleTilt.tilt_code}{path.tilt[i+1]+NozzleTilt.tilt_offset:.5f} '
-            txt += f'{NozzleTilt.rot_code}{path.rot[i+1]+NozzleTilt.rot_offset:.5f} '
-            txt += f'E{extrusion[i]:.5f}\n'
-        return txt
\ No newline at end of file
+        # print the path. move to the next point with extrusion
+        axes = [('X', path.x[1:] + path.x_origin),
+                ('Y', path.y[1:] + path.y_origin),
+                ('Z', path.z[1:]),
+                (NozzleTilt.tilt_code, path.tilt[1:] + NozzleTilt.tilt_offset),
+                (NozzleTilt.rot_code,  path.rot[1:]  + NozzleTilt.rot_offset)]
+        return format_g1_block(path.print_speed, axes, extrusion)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import copy
 import pickle
 import json
 from typing import Any
@@ -7,7 +8,9 @@ from gcoordinator.kinematics.kin_bed_rotate  import BedRotate
 from gcoordinator.kinematics.kin_cartesian   import Cartesian
 from gcoordinator.kinematics.kin_bed_tilt_bc import BedTiltBC
 from gcoordinator.kinematics.kin_nozzle_tilt import NozzleTilt
-from gcoordinator.settings                   import template_settings
+from gcoordinator.settings                   import TEMP_CONFIG_PATH, get_settings
+from gcoordinator.utils.coords               import get_subdivision_indices
+from gcoordinator.utils.geometry             import as_points, point_array
 
 
 class Path:
@@ -39,6 +42,12 @@ class Path:
         The coordinates of the first point in the path.
     end_coord : numpy.ndarray
         The coordinates of the last point in the path.
+
+    coords, norms, center, start_coord, end_coord (and sub_segment_cnt with the subdividing
+    kinematics) are derived from x, y, z, rot and tilt by the kinematics. They are computed
+    on first access and cached until x, y, z, rot or tilt is assigned again. Modifying one of
+    these arrays in place (e.g. path.x[0] = 1.0) does not invalidate the cache, call
+    update_kinematic_attrs() afterwards.
     
     nozzle_diameter : float
         The diameter of the printer nozzle, in millimeters.
@@ -77,6 +86,10 @@ class Path:
         For segment i (from point i to i+1), the value at index i is used.
         When both extrusion_multiplier and segment_extrusion_multiplier are specified,
         segment_extrusion_multiplier takes precedence.
+    arc_tolerance : float or None
+        With the Cartesian kinematics, the runs of points that lie on a circular arc within this
+        distance (in millimeters) are printed with one G2/G3 move instead of one G1 move per
+        segment. None (the default) prints every segment with G1.
 
     Methods:
     --------
@@ -87,36 +100,46 @@ class Path:
     
     """
     def __init__(self, x, y, z, rot=None, tilt=None, **kwargs):
-        try:
-            self.settings_path = '.temp_config.json'
-            with open(self.settings_path, 'r') as f:
-                self.settings = json.load(f)
-        except:
-            self.settings = template_settings # gcoordinator/settings.py
-        
+        self.settings_path = TEMP_CONFIG_PATH
+        self.settings = get_settings() # cached, see gcoordinator/settings.py
+
         self.kinematics = self.settings['Hardware']['kinematics']
-        self.x = np.array(x)
-        self.y = np.array(y)
-        self.z = np.array(z)
+        # float64 (or the input dtype) by default, float32 in float32 mode, see utils/geometry.py
+        self.x = point_array(x)
+        self.y = point_array(y)
+        self.z = point_array(z)
 
         if tilt is None:
-            self.tilt = np.full_like(x, 0)
+            self.tilt = np.full_like(self.x, 0)
         else:
-            self.tilt = np.array(tilt)
+            self.tilt = point_array(tilt)
         if rot is None:
-            self.rot  = np.full_like(x, 0)
+            self.rot  = np.full_like(self.x, 0)
         else:
-            self.rot  = np.array(rot)
+            self.rot  = point_array(rot)
             
-        self.coords = np.column_stack([self.x, self.y, self.z])
-        self.norms = np.array([(0, 0, 1) for _ in range(len(self.coords))])
-        self.center = np.array([np.mean(self.x), np.mean(self.y), np.mean(self.z)])
-        self.start_coord = self.coords[0]
-        self.end_coord = self.coords[-1]
         self.before_gcode = None
         self.after_gcode = None
 
-        # recalculate the coordinates and the norms according to the kinematics
+        # coords, norms, ... are computed by the kinematics on first access, see _derived_attr
+        # apply default settings to the object
+        self.apply_default_settings()
+        # apply optional settings to the object
+        self.optional_settings = kwargs
+        self.apply_optional_settings()
+
+    def update_kinematic_attrs(self):
+        """
+        Recalculates coords, norms, center, start_coord and end_coord from x, y, z, rot and tilt
+        according to the kinematics of the printer.
+
+        This is done automatically on the first access of one of these attributes, call it
+        explicitly only after modifying x, y, z, rot or tilt in place.
+
+        Returns:
+            None
+        """
+        self._derived = {}
         if self.kinematics == 'Cartesian':
             Cartesian.update_attrs(self)
         elif self.kinematics == 'BedRotate':
@@ -125,11 +148,76 @@ class Path:
             BedTiltBC.update_attrs(self)
         elif self.kinematics == 'NozzleTilt':
             NozzleTilt.update_attrs(self)
-        # apply default settings to the object
-        self.apply_default_settings()
-        # apply optional settings to the object
-        self.optional_settings = kwargs
-        self.apply_optional_settings()
+
+    def reversed(self):
+        """
+        Returns a copy of the path that is traversed in the opposite direction.
+        All settings of the path are kept; segment_extrusion_multiplier is reordered
+        so that every segment keeps its multiplier.
+
+        Returns:
+            Path: The reversed path.
+        """
+        path = copy.copy(self)
+        path.x    = self.x[::-1].copy()
+        path.y    = self.y[::-1].copy()
+        path.z    = self.z[::-1].copy()
+        path.rot  = self.rot[::-1].copy()
+        path.tilt = self.tilt[::-1].copy()
+        if self.segment_extrusion_multiplier is not None:
+            multipliers = np.asarray(self.segment_extrusion_multiplier)
+            n_segments  = len(self.x) - 1
+            path.segment_extrusion_multiplier = np.concatenate(
+                [multipliers[:n_segments][::-1], multipliers[n_segments:]])
+        return path
+
+    def _bind_points(self, x, y, z, rot, tilt):
+        """
+        Replaces the point arrays by arrays with the same values (e.g. views into a PathStore)
+        without invalidating the cached kinematic attributes.
+        """
+        self._x, self._y, self._z, self._rot, self._tilt = x, y, z, rot, tilt
+
+    def _point_attr(name):
+        # assigning a point array discards the attributes derived from it.  The cache is
+        # rebound rather than cleared, so that a copy.copy() of the path keeps its own cache.
+        private = '_' + name
+        def getter(self):
+            return self.__dict__[private]
+        def setter(self, value):
+            self.__dict__[private] = value
+            self._derived = {}
+        return property(getter, setter)
+
+    def _derived_attr(name):
+        # computed by the kinematics on first access, assigned by Kinematics.update_attrs
+        def getter(self):
+            derived = self.__dict__.get('_derived')
+            if not derived or 'coords' not in derived:
+                self.update_kinematic_attrs()
+                derived = self._derived
+            if name not in derived:
+                # e.g. sub_segment_cnt, which only the subdividing kinematics set
+                raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+            return derived[name]
+        def setter(self, value):
+            self.__dict__.setdefault('_derived', {})[name] = value
+        return property(getter, setter)
+
+    x    = _point_attr('x')
+    y    = _point_attr('y')
+    z    = _point_attr('z')
+    rot  = _point_attr('rot')
+    tilt = _point_attr('tilt')
+
+    coords          = _derived_attr('coords')
+    norms           = _derived_attr('norms')
+    center          = _derived_attr('center')
+    start_coord     = _derived_attr('start_coord')
+    end_coord       = _derived_attr('end_coord')
+    sub_segment_cnt = _derived_attr('sub_segment_cnt')
+
+    del _point_attr, _derived_attr
 
     def apply_default_settings(self):
         # When generating G-code, if the attribute of Path is None, 
@@ -154,6 +242,7 @@ class Path:
         self.extrusion_multiplier          = None
         self.segment_extrusion_multiplier  = None
         self.travel_path                   = None
+        self.arc_tolerance                 = None
 
     def apply_optional_settings(self):
         """
@@ -182,15 +271,24 @@ class PathList:
         all attributes of Path class
 
     Methods:
-        __init__(self, paths): Initializes a PathList object with a list of Path objects.
+        __init__(self, paths, sort, reverse_paths): Initializes a PathList object with a list of Path objects.
         __setattr__(self, name, value): Sets an attribute to all paths in the PathList.
-        sort_paths(self): Sorts the paths in the PathList object in order of proximity to the previous path's end point.
+        sort_paths(self, reverse_paths): Sorts the paths in the PathList object in order of proximity to the previous path's end point.
     """
-    def __init__(self, paths):
+    def __init__(self, paths, sort=True, reverse_paths=False):
+        """
+        Initializes a PathList object with a list of Path objects.
+
+        Args:
+            paths (list): A list of Path objects.
+            sort (bool): Whether to sort the paths by proximity. Pass False to keep the given order,
+                e.g. when the paths are already ordered. sort_paths() can still be called later.
+            reverse_paths (bool): Whether open paths may be reversed while sorting, see sort_paths().
+        """
         self.paths = paths
         self.index = 0 # index for __next__
-        if len(paths) != 0:
-            self.sort_paths()
+        if sort and len(paths) != 0:
+            self.sort_paths(reverse_paths)
 
     def __setattr__(self, name, value):
         """
@@ -224,49 +322,344 @@ class PathList:
         else:
             raise StopIteration()
 
-    def sort_paths(self):
+    def sort_paths(self, reverse_paths=False):
         """
         Sorts the paths in the PathList object in order of proximity to the previous path's end point.
 
+        Starting from the first path, the path whose entry point is nearest to the end point of the
+        current path is appended next (ties go to the earlier path). The entry points are kept in a
+        grid hash, so each step only looks at the neighbouring cells instead of all remaining paths.
+
         Args:
+            reverse_paths (bool): If True, an open path may also be entered from its end point,
+                in which case it is replaced by its reversed copy (see Path.reversed).
+
+        Returns:
             None
+        """
+        if len(self.paths) < 2:
+            return
+        starts = np.array([np.asarray(path.start_coord, dtype=float) for path in self.paths])
+        ends   = np.array([np.asarray(path.end_coord,   dtype=float) for path in self.paths])
+        order  = _nearest_neighbour_order(starts, ends, reverse_paths)
+        self.paths = [self.paths[i].reversed() if reverse else self.paths[i] for i, reverse in order]
+
+
+class SegmentBundle:
+    """
+    A compact set of straight 2-point print moves that share the same settings,
+    e.g. the segments of a line-pattern infill layer.
+
+    Instead of one Path object per segment, the segments are held in a single
+    (n, 2, 3) array, where segments[i, 0] is the start point and segments[i, 1] is
+    the end point of the i-th segment. The segments are printed in order, with a
+    travel move between consecutive segments.
+
+    A SegmentBundle can be used wherever a Path can: in full_object, in a PathList,
+    with GCode and with preview(). It has the same settings attributes as Path and
+    they apply to all of its segments; segment_extrusion_multiplier, if given, has
+    one value per segment. travel_path applies to the travel after the last segment.
+    With kinematics other than Cartesian the segments are expanded into Path objects
+    (see to_paths, which caches them) when the full_object is flattened.
+
+    Attributes:
+        segments (numpy.ndarray): Shape (n, 2, 3). The start and end point of every segment.
+        x, y, z (numpy.ndarray): The coordinates of the points of all segments in print order,
+            i.e. start and end point of the first segment, then of the second segment, ...
+        coords (numpy.ndarray): Shape (2n, 3). A view of segments as a list of points.
+        start_coord, end_coord (numpy.ndarray): The first and the last point.
+        all settings attributes of Path
+
+    Methods:
+        __init__(self, segments, sort, reverse_segments, **kwargs): Initializes the bundle.
+        __len__(self): Returns the number of segments.
+        sort_segments(self, reverse_segments): Orders the segments by proximity.
+        reversed(self): Returns a copy that is traversed in the opposite direction.
+        to_paths(self): Returns one Path per segment.
+    """
+    def __init__(self, segments, sort=True, reverse_segments=False, **kwargs):
+        """
+        Initializes a SegmentBundle.
+
+        Args:
+            segments (array_like): Shape (n, 2, 3). The start and end point of every segment.
+            sort (bool): Whether to order the segments by proximity, like PathList does.
+            reverse_segments (bool): Whether segments may be flipped while sorting.
+            **kwargs: Optional settings, as for Path.
+        """
+        self.settings_path = TEMP_CONFIG_PATH
+        self.settings = get_settings() # cached, see gcoordinator/settings.py
+
+        self.kinematics = self.settings['Hardware']['kinematics']
+        self.segments = as_points(segments).reshape(-1, 2, 3)
+        self.before_gcode = None
+        self.after_gcode = None
+
+        Path.apply_default_settings(self)
+        self.optional_settings = kwargs
+        Path.apply_optional_settings(self)
+
+        if sort:
+            self.sort_segments(reverse_segments)
+
+    def __len__(self):
+        return len(self.segments)
+
+    @property
+    def x(self):
+        return self.segments[:, :, 0].ravel()
+
+    @property
+    def y(self):
+        return self.segments[:, :, 1].ravel()
+
+    @property
+    def z(self):
+        return self.segments[:, :, 2].ravel()
+
+    @property
+    def rot(self):
+        return np.zeros(2 * len(self.segments), dtype=self.segments.dtype)
+
+    @property
+    def tilt(self):
+        return np.zeros(2 * len(self.segments), dtype=self.segments.dtype)
+
+    @property
+    def coords(self):
+        return self.segments.reshape(-1, 3)
+
+    @property
+    def norms(self):
+        return np.broadcast_to(np.array([0.0, 0.0, 1.0]), (2 * len(self.segments), 3))
+
+    @property
+    def center(self):
+        return self.coords.mean(axis=0)
+
+    @property
+    def start_coord(self):
+        return self.segments[0, 0]
+
+    @property
+    def end_coord(self):
+        return self.segments[-1, 1]
+
+    def sort_segments(self, reverse_segments=False):
+        """
+        Orders the segments in order of proximity to the previous segment's end point,
+        with the same rule as PathList.sort_paths.
+
+        Args:
+            reverse_segments (bool): If True, a segment may also be entered from its end point,
+                in which case it is flipped.
 
         Returns:
             None
         """
-        sorted_paths = []
-        remaining_paths = self.paths.copy()
+        if len(self.segments) < 2:
+            return
+        order = _nearest_neighbour_order(self.segments[:, 0], self.segments[:, 1], reverse_segments)
+        index   = np.array([i for i, _ in order])
+        reverse = np.array([r for _, r in order], dtype=bool)
+        segments = self.segments[index]
+        segments[reverse] = segments[reverse, ::-1]
+        self.segments = segments
+        if self.segment_extrusion_multiplier is not None:
+            self.segment_extrusion_multiplier = np.asarray(self.segment_extrusion_multiplier)[index]
 
-        # Extract first path and add to sorted list
-        current_path = remaining_paths.pop(0)
-        sorted_paths.append(current_path)
+    def reversed(self):
+        """
+        Returns a copy of the bundle that is traversed in the opposite direction:
+        the segments are printed in reverse order and each of them is flipped.
 
-        while remaining_paths:
-            nearest_index = None
-            min_distance = float('inf')
+        Returns:
+            SegmentBundle: The reversed bundle.
+        """
+        bundle = copy.copy(self)
+        bundle.segments = self.segments[::-1, ::-1].copy()
+        if self.segment_extrusion_multiplier is not None:
+            bundle.segment_extrusion_multiplier = np.asarray(self.segment_extrusion_multiplier)[::-1]
+        return bundle
+
+    def to_paths(self):
+        """
+        Returns one 2-point Path per segment, with the settings of the bundle.
+        The travel_path of the bundle is given to the last path only.
+
+        The expansion is cached: as long as no attribute of the bundle is reassigned,
+        every call returns the same Path objects, so their kinematic attributes are
+        computed only once however often the bundle is flattened.
+
+        Returns:
+            list: A list of Path objects.
+        """
+        attrs = {name: value for name, value in self.__dict__.items() if name != '_expanded'}
+        expanded = self.__dict__.get('_expanded')
+        if (expanded is not None and expanded[0].keys() == attrs.keys()
+                and all(expanded[0][name] is value for name, value in attrs.items())):
+            return list(expanded[1])
+
+        shared = {name: value for name, value in attrs.items()
+                  if name not in ('segments', 'settings', 'settings_path', 'optional_settings',
+                                  'segment_extrusion_multiplier', 'travel_path')}
+        multipliers = self.segment_extrusion_multiplier
+        paths = []
+        for i, segment in enumerate(self.segments):
+            path = Path(segment[:, 0], segment[:, 1], segment[:, 2])
+            path.__dict__.update(shared)
+            if multipliers is not None:
+                path.segment_extrusion_multiplier = np.asarray(multipliers)[i:i+1]
+            paths.append(path)
+        if paths:
+            paths[-1].travel_path = self.travel_path
+        # the attribute values are kept (not their ids), so that a reassigned attribute is detected
+        self._expanded = (attrs, paths)
+        return list(paths)
+
+
+def _nearest_neighbour_order(starts, ends, reverse_paths=False):
+    """
+    Greedy nearest-neighbour ordering of paths given by their start and end points.
+
+    Starting from the first path, the path whose entry point is nearest to the end point of the
+    current path comes next (ties go to the earlier path). With reverse_paths, an open path may
+    also be entered from its end point.
+
+    Returns:
+        list: (path index, reversed) pairs in print order.
+    """
+    n_paths = len(starts)
+    # entry points: the start of every path, plus the end of every open path if reversing is allowed
+    entry_path     = np.arange(n_paths)
+    entry_reversed = np.zeros(n_paths, dtype=bool)
+    entries        = starts
+    if reverse_paths:
+        open_paths     = np.nonzero(~np.all(np.isclose(starts, ends), axis=1))[0]
+        entries        = np.concatenate([starts, ends[open_paths]])
+        entry_path     = np.concatenate([entry_path, open_paths])
+        entry_reversed = np.concatenate([entry_reversed, np.ones(len(open_paths), dtype=bool)])
+
+    index = _EntryPointIndex(entries, entry_path, n_paths)
+    # Extract first path and add to sorted list
+    index.remove_path(0)
+    order = [(0, False)]
+    current_end = ends[0]
+    for _ in range(n_paths - 1):
+        # Find the path with the closest entry point among unsorted paths
+        entry = index.nearest(current_end)
+        path_id, reverse = entry_path[entry], entry_reversed[entry]
+        index.remove_path(path_id)
+        order.append((path_id, reverse))
+        current_end = starts[path_id] if reverse else ends[path_id]
+    return order
 
-            # Find the path with the closest starting point among unsorted paths
-            for i, path in enumerate(remaining_paths):
-                distance = np.linalg.norm(current_path.end_coord - path.start_coord)
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_index = i
 
-            # Retrieve the closest path and add it to the sorted list
-            current_path = remaining_paths.pop(nearest_index)
-            sorted_paths.append(current_path)
+class _EntryPointIndex:
+    """
+    A uniform grid hash over the XY components of path entry points, used by PathList.sort_paths.
+
+    The entries are stored cell by cell in one array (with the start offset of every cell) and
+    are deleted lazily: removing a path only flags it and decrements the live-entry count of its
+    cells, flagged entries are filtered out when a cell is read. A nearest-neighbour query
+    inspects a square window of cells around the query point that grows until it provably
+    contains the nearest entry. The grid is rebuilt with a finer cell size when most entries
+    have been removed, so that the search stays local.
+
+    The first n_paths entries must be the entries of paths 0..n_paths-1, any further entry is
+    a second entry point of the path given by entry_path.
+    """
+
+    def __init__(self, points, entry_path, n_paths):
+        self.points       = points
+        self.entry_path   = entry_path
+        self.removed      = np.zeros(n_paths, dtype=bool)
+        self.second_entry = np.full(n_paths, -1)
+        self.second_entry[entry_path[n_paths:]] = np.arange(n_paths, len(points))
+        self.n_alive      = len(points)
+        self._build(np.arange(len(points)))
 
-        self.paths = sorted_paths
+    def _build(self, entries):
+        xy = self.points[entries, :2]
+        self.lo   = xy.min(axis=0)
+        extent    = xy.max(axis=0) - self.lo
+        # aim for about one entry per cell; the second term keeps the number of cells
+        # O(len(entries)) when the entries are (nearly) collinear or identical
+        n_entries = len(entries)
+        self.cell = max(np.sqrt(extent[0] * extent[1] / n_entries), extent.max() / n_entries, 1e-9)
+        keys      = np.floor((xy - self.lo) / self.cell).astype(np.int64)
+        self.shape = tuple(keys.max(axis=0) + 1)
+        flat  = keys[:, 0] * self.shape[1] + keys[:, 1]
+        order = np.argsort(flat, kind='stable')
+        n_cells = self.shape[0] * self.shape[1]
+        self.cell_entries = entries[order]
+        self.cell_size    = np.bincount(flat, minlength=n_cells)
+        self.cell_start   = np.cumsum(self.cell_size) - self.cell_size
+        self.cell_count   = self.cell_size.reshape(self.shape).copy() # number of alive entries
+        self.entry_cell   = np.full(len(self.points), -1)
+        self.entry_cell[entries] = flat
+        self.n_built = len(entries)
+
+    def remove_path(self, path_id):
+        self.removed[path_id] = True
+        for entry in (path_id, self.second_entry[path_id]):
+            if entry >= 0:
+                self.n_alive -= 1
+                if self.entry_cell[entry] >= 0:
+                    self.cell_count.flat[self.entry_cell[entry]] -= 1
+        if 0 < self.n_alive < self.n_built // 4 and self.n_built > 64:
+            alive = np.nonzero(~self.removed[self.entry_path])[0]
+            self._build(alive)
+
+    def nearest(self, point):
+        """
+        Returns the alive entry nearest to `point` (the lowest entry index on ties).
+        """
+        ci, cj = np.floor((point[:2] - self.lo) / self.cell).astype(np.int64)
+        # a window of this half-width covers the whole grid
+        max_width = max(abs(ci), abs(cj), abs(self.shape[0] - ci), abs(self.shape[1] - cj))
+        width = 1
+        while True:
+            found = self._search_window(point, ci, cj, width)
+            if found is None:
+                if width > max_width:
+                    return -1
+                width *= 2
+                continue
+            distance, entry = found
+            # every cell outside the window is at least width * cell away
+            required = int(distance // self.cell) + 1
+            if required <= width:
+                return entry
+            width = required
+
+    def _search_window(self, point, ci, cj, width):
+        i0, i1 = max(ci - width, 0), min(ci + width + 1, self.shape[0])
+        j0, j1 = max(cj - width, 0), min(cj + width + 1, self.shape[1])
+        if i0 >= i1 or j0 >= j1:
+            return None
+        cell_i, cell_j = np.nonzero(self.cell_count[i0:i1, j0:j1])
+        if len(cell_i) == 0:
+            return None
+        cells = (cell_i + i0) * self.shape[1] + (cell_j + j0)
+        cell_index, step = get_subdivision_indices(self.cell_size[cells])
+        candidates = self.cell_entries[self.cell_start[cells][cell_index] + step - 1]
+        candidates = candidates[~self.removed[self.entry_path[candidates]]]
+        distances = np.linalg.norm(self.points[candidates] - point, axis=1)
+        distance  = distances.min()
+        return distance, candidates[distances == distance].min()
 
 
 def flatten_path_list(full_object):
     """
-    the full_object(list) is composed of Path and PathList.
+    the full_object(list) is composed of Path, PathList and SegmentBundle.
     when calcuate, PathList nedds to be flatten.
     this function makes all elements in full_object to Path.
+    a SegmentBundle is kept as it is with Cartesian kinematics,
+    and expanded to one Path per segment otherwise.
 
-    args    : list of Path and PathList
-    returns : list of Path
+    args    : list of Path, PathList and SegmentBundle
+    returns : list of Path and SegmentBundle
     """
     flattened_paths = []
     for item in full_object:
@@ -274,4 +667,11 @@ def flatten_path_list(full_object):
             flattened_paths.extend(flatten_path_list(item.paths))
         elif isinstance(item, Path):
             flattened_paths.append(item)
+        elif isinstance(item, SegmentBundle):
+            if len(item) == 0:
+                continue
+            if item.kinematics == 'Cartesian':
+                flattened_paths.append(item)
+            else:
+                flattened_paths.extend(item.to_paths())
     return flattened_paths
\ No newline at end of file
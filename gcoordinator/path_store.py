@@ -0,0 +1,181 @@
+import numpy as np
+from gcoordinator.path_generator import SegmentBundle, flatten_path_list
+from gcoordinator.utils.geometry import as_points, compute_dtype
+
+
+class PathStore:
+    """
+    A columnar (struct-of-arrays) store of all the points of a full_object.
+
+    The points of every path are packed into contiguous columns, and the points of
+    the i-th path are the rows offsets[i]:offsets[i+1] of the columns. The coordinates
+    rearranged by the kinematics (Path.coords) are packed the same way with their own
+    offsets, because the subdividing kinematics (BedRotate, BedTiltBC) produce more
+    coordinates than input points.
+
+    With bind=True the arrays of every Path are replaced by views into the store, so the
+    model is held in memory only once:
+      - x, y and z are the columns of xyz,
+      - coords shares the memory of xyz when the kinematics does not rearrange the points,
+      - constant normals (0, 0, 1) are a broadcast view that takes no memory at all.
+    A SegmentBundle is stored as the 2n points of its segments; binding replaces its
+    segments array by an (n, 2, 3) view into xyz.
+    In float32 mode (see gcoordinator.utils.geometry.configure_precision) xyz, coords
+    and norms are stored in single precision.
+
+    Attributes:
+        paths (list): The flattened list of Path objects.
+        offsets (numpy.ndarray): Shape (n_paths + 1,). Point offsets of each path.
+        xyz (numpy.ndarray): Shape (n_points, 3). The x, y, z coordinates of all points.
+        rot (numpy.ndarray): Shape (n_points,). The rotation of all points.
+        tilt (numpy.ndarray): Shape (n_points,). The tilt of all points.
+        coord_offsets (numpy.ndarray): Shape (n_paths + 1,). Offsets of each path in coords and norms.
+        coords (numpy.ndarray): Shape (n_coords, 3). The coords of all paths.
+        norms (numpy.ndarray): Shape (n_coords, 3). The norms of all paths.
+
+    Methods:
+        __init__(self, full_object, bind): Packs the paths of full_object into the store.
+        __len__(self): Returns the number of paths.
+        path_lengths(self): Returns the number of coords of each path.
+        points_of(self, i): Returns the slice of the points of the i-th path.
+        coords_of(self, i): Returns the slice of the coords of the i-th path.
+    """
+
+    def __init__(self, full_object, bind=True):
+        """
+        Packs the paths of full_object into the store.
+
+        Args:
+            full_object (list): A list of Path or PathList objects.
+            bind (bool): Whether to replace the arrays of the paths by views into the store.
+        """
+        self.paths = flatten_path_list(full_object)
+        n_points = [len(path.x) for path in self.paths]
+        n_coords = [len(path.coords) for path in self.paths]
+        self.offsets       = _offsets(n_points)
+        self.coord_offsets = _offsets(n_coords)
+
+        xyz_dtype = self._common_dtype([path.x for path in self.paths] + [path.y for path in self.paths]
+                                       + [path.z for path in self.paths])
+        if compute_dtype() == np.float32:
+            # float32 mode: the columns are stored in single precision, whatever the paths hold
+            xyz_dtype = compute_dtype()
+        self.xyz  = np.empty((self.offsets[-1], 3), dtype=xyz_dtype)
+        self.rot  = self._pack([path.rot  for path in self.paths], self.offsets)
+        self.tilt = self._pack([path.tilt for path in self.paths], self.offsets)
+        for i, path in enumerate(self.paths):
+            self.xyz[self.points_of(i)] = np.column_stack([path.x, path.y, path.z])
+
+        # the coords of the kinematics that do not rearrange the points are the points themselves
+        self.shares_xyz = all(self._coords_are_points(path) for path in self.paths)
+        if self.shares_xyz and np.array_equal(self.offsets, self.coord_offsets):
+            self.coords = self.xyz
+        else:
+            self.shares_xyz = False
+            self.coords = self._pack([as_points(path.coords) for path in self.paths],
+                                     self.coord_offsets)
+
+        # the constant normal (0, 0, 1) is stored as a zero-memory broadcast view
+        self.constant_norms = all(path.kinematics in ('Cartesian', 'BedRotate') for path in self.paths)
+        if self.constant_norms:
+            self.norms = np.broadcast_to(as_points([0.0, 0.0, 1.0]), (self.coord_offsets[-1], 3))
+        else:
+            self.norms = self._pack([as_points(path.norms).reshape(-1, 3) for path in self.paths],
+                                    self.coord_offsets)
+
+        if bind:
+            self.bind()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def bind(self):
+        """
+        Replaces the point arrays, coords and norms of every path by views into the store.
+
+        Returns:
+            None
+        """
+        for i, path in enumerate(self.paths):
+            points = self.points_of(i)
+            coords = self.coords_of(i)
+            if isinstance(path, SegmentBundle):
+                # x, y, z, coords, ... of a bundle are derived from its segments
+                path.segments = self.xyz[points].reshape(-1, 2, 3)
+                continue
+            # same values, so the kinematic attributes computed in __init__ stay valid
+            path._bind_points(self.xyz[points, 0], self.xyz[points, 1], self.xyz[points, 2],
+                              self.rot[points], self.tilt[points])
+            path.coords = self.coords[coords]
+            path.norms  = self.norms[coords]
+            path.start_coord = path.coords[0]
+            path.end_coord   = path.coords[-1]
+
+    def path_lengths(self) -> np.ndarray:
+        """
+        Returns the number of coords of each path.
+
+        Returns:
+            numpy.ndarray: Shape (n_paths,).
+        """
+        return np.diff(self.coord_offsets)
+
+    def points_of(self, i) -> slice:
+        """
+        Returns the slice of the points (xyz, rot, tilt) of the i-th path.
+        """
+        return slice(self.offsets[i], self.offsets[i+1])
+
+    def coords_of(self, i) -> slice:
+        """
+        Returns the slice of the coords and norms of the i-th path.
+        """
+        return slice(self.coord_offsets[i], self.coord_offsets[i+1])
+
+    @staticmethod
+    def _pack(arrays, offsets) -> np.ndarray:
+        if not arrays:
+            return np.empty(0)
+        packed = np.empty((offsets[-1],) + np.shape(arrays[0])[1:], dtype=PathStore._common_dtype(arrays))
+        for i, array in enumerate(arrays):
+            packed[offsets[i]:offsets[i+1]] = array
+        return packed
+
+    @staticmethod
+    def _common_dtype(arrays):
+        # np.result_type accepts a limited number of arguments, so promote pairwise
+        dtype = np.dtype(np.int8) if arrays else np.dtype(float)
+        for array in arrays:
+            dtype = np.promote_types(dtype, np.asarray(array).dtype)
+        return dtype
+
+    @staticmethod
+    def _coords_are_points(path) -> bool:
+        # Cartesian and NozzleTilt keep the points as they are
+        return path.kinematics in ('Cartesian', 'NozzleTilt')
+
+
+def pack_coords(paths, dtype=np.float32) -> tuple:
+    """
+    Packs only the coords of paths into one contiguous array of the given dtype,
+    without building a PathStore (e.g. for the float32 preview payload).
+
+    Args:
+        paths (list): A flat list of Path or SegmentBundle objects.
+        dtype: The dtype of the packed coords.
+
+    Returns:
+        tuple: (coords, coord_offsets), coords of shape (n_coords, 3); the coords of
+        the i-th path are the rows coord_offsets[i]:coord_offsets[i+1].
+    """
+    coords_list = [path.coords for path in paths]
+    coord_offsets = _offsets([len(coords) for coords in coords_list])
+    coords = np.empty((coord_offsets[-1], 3), dtype=dtype)
+    for i, path_coords in enumerate(coords_list):
+        # converted per path, so no full-precision copy of the whole model is made
+        coords[coord_offsets[i]:coord_offsets[i+1]] = np.reshape(path_coords, (-1, 3))
+    return coords, coord_offsets
+
+
+def _offsets(counts) -> np.ndarray:
+    return np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
@@ -1,5 +1,12 @@
+import copy
 import numpy as np
-from gcoordinator.path_generator import Path, PathList
+from gcoordinator.path_generator import Path, PathList, SegmentBundle
+from gcoordinator.utils.coords   import get_subdivision_indices
+from gcoordinator.utils.simplify import simplify_polylines, chord_error_stats
+from gcoordinator.utils.geometry import as_points, point_array
+
+
+ANGLE_TOLERANCE = 1e-3 # default largest rot/tilt deviation of the points removed by Transform.simplify, in radians
 
 
 class Transform:
@@ -12,19 +19,16 @@ class Transform:
             Stretches a given path by the specified ratios along each axis.
 
             Args:
-                path (Path): The path to be stretched.
+                path (Path, SegmentBundle or PathList): The path to be stretched.
                 x_stretch_ratio (float): The ratio by which to stretch the path along the x-axis.
                 y_stretch_ratio (float): The ratio by which to stretch the path along the y-axis.
                 z_stretch_ratio (float): The ratio by which to stretch the path along the z-axis.
 
             Returns:
-                Path: The stretched path.
+                Path, SegmentBundle or PathList: The stretched path, with the settings, rot and tilt of the original.
             """
-            x = x_stretch_ratio * path.x
-            y = y_stretch_ratio * path.y
-            z = z_stretch_ratio * path.z
-            output_path = Path(x, y, z)
-            return output_path
+            matrix = np.diag([x_stretch_ratio, y_stretch_ratio, z_stretch_ratio, 1.0])
+            return Transform.affine(path, matrix)
         
     @staticmethod
     def rotate_xy(path, theta):
@@ -32,25 +36,24 @@ class Transform:
             Rotates a 2D path around the origin by a given angle.
 
             Args:
-                path (Path): The path to be rotated.
+                path (Path, SegmentBundle or PathList): The path to be rotated.
                 theta (float): The angle (in radians) by which to rotate the path.
 
             Returns:
-                Path: The rotated path.
+                Path, SegmentBundle or PathList: The rotated path, with the settings, rot and tilt of the original.
             """
-            x = np.cos(theta)*path.x + np.sin(theta)*path.y
-            y = -np.sin(theta)*path.x + np.cos(theta)*path.y
-            z = path.z
-            rotated_path = Path(x, y, z)
-            return  rotated_path
+            matrix = np.identity(4)
+            matrix[:2, :2] = [[ np.cos(theta), np.sin(theta)],
+                              [-np.sin(theta), np.cos(theta)]]
+            return Transform.affine(path, matrix)
     
     @staticmethod
     def move(arg, x=0.0, y=0.0, z=0.0, roll=0.0, pitch=0.0, yaw=0.0):
         """
-        Moves a Path or PathList object in 3D space by the specified amounts of translation and rotation.
+        Moves a Path, SegmentBundle or PathList object in 3D space by the specified amounts of translation and rotation.
         
         Args:
-            arg (Path or PathList): The Path or PathList object to be transformed.
+            arg (Path, SegmentBundle or PathList): The object to be transformed.
             x (float): The amount of translation along the x-axis.
             y (float): The amount of translation along the y-axis.
             z (float): The amount of translation along the z-axis.
@@ -59,19 +62,15 @@ class Transform:
             yaw (float): The amount of rotation around the z-axis, in radians.
         
         Returns:
-            Path or PathList: The transformed Path or PathList object.
+            Path, SegmentBundle or PathList: The transformed object.
         """
-        if isinstance(arg, Path):
-            path = Transform.move_path(arg, x, y, z, roll, pitch, yaw)
-            return path
-        elif isinstance(arg, PathList):
-            path_list = Transform.move_pathlist(arg, x, y, z, roll, pitch, yaw)
-            return path_list
+        return Transform.affine(arg, move_matrix(x, y, z, roll, pitch, yaw))
         
     @staticmethod
     def move_path(path, x=0.0, y=0.0, z=0.0, roll=0.0, pitch=0.0, yaw=0.0):
         """
         Moves a given path by a specified translation vector and rotation angles.
+        The path is translated first and then rotated around the origin.
 
         Args:
             path (Path): The path to be moved.
@@ -83,29 +82,10 @@ class Transform:
             yaw (float): The yaw angle in radians. Defaults to 0.
 
         Returns:
-            Path: The moved path.
+            Path: The moved path, with the settings, rot and tilt of the original.
 
         """
-        translation_vector = np.array([x, y, z])
-
-        rotation_matrix = np.array([[np.cos(yaw) * np.cos(pitch),
-                                    np.cos(yaw) * np.sin(pitch) * np.sin(roll) - np.sin(yaw) * np.cos(roll),
-                                    np.cos(yaw) * np.sin(pitch) * np.cos(roll) + np.sin(yaw) * np.sin(roll)],
-                                    [np.sin(yaw) * np.cos(pitch),
-                                    np.sin(yaw) * np.sin(pitch) * np.sin(roll) + np.cos(yaw) * np.cos(roll),
-                                    np.sin(yaw) * np.sin(pitch) * np.cos(roll) - np.cos(yaw) * np.sin(roll)],
-                                    [-np.sin(pitch),
-                                    np.cos(pitch) * np.sin(roll),
-                                    np.cos(pitch) * np.cos(roll)]])
-
-        path_coords = np.array(path.coords)
-        translated_coords = path_coords + translation_vector
-        transformed_coords = np.dot(rotation_matrix, np.transpose(translated_coords))
-        x_coords = transformed_coords[0]
-        y_coords = transformed_coords[1]
-        z_coords = transformed_coords[2]
-        moved_path = Path(x_coords, y_coords, z_coords)
-        return moved_path
+        return Transform.affine(path, move_matrix(x, y, z, roll, pitch, yaw))
 
     @staticmethod
     def move_pathlist(pathlist, x=0, y=0, z=0, roll=0, pitch=0, yaw=0):
@@ -124,81 +104,394 @@ class Transform:
         Returns:
             PathList: A new PathList instance containing the transformed paths.
         """
-        path_list_buffer = []
-        for path in pathlist.paths:
-            path = Transform.move_path(path, x, y, z, roll, pitch, yaw)
-            path_list_buffer.append(path)
-        path_list_instance = PathList(path_list_buffer)
-        path_list_buffer = []
-        return path_list_instance
+        return Transform.affine(pathlist, move_matrix(x, y, z, roll, pitch, yaw))
+
+    @staticmethod
+    def affine(arg, matrix):
+        """
+        Applies a 4x4 affine transformation matrix to the points of a Path, SegmentBundle or PathList.
+
+        The points of all paths are concatenated and transformed with a single matrix
+        product, then split back into one array per path. Every transformed path is a copy
+        of the original that keeps its settings (print_speed, segment_extrusion_multiplier, ...)
+        and its rot and tilt arrays; only x, y and z are replaced. The new points have the
+        compute dtype (float32 in float32 mode, see utils/geometry.py). A PathList keeps its order.
+
+        Args:
+            arg (Path, SegmentBundle or PathList): The object to be transformed.
+            matrix (array_like): Shape (4, 4). The matrix that maps (x, y, z, 1) to the new point.
+
+        Returns:
+            Path, SegmentBundle or PathList: The transformed object.
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        leaves = _leaf_paths(arg)
+        points  = [_points_of(path) for path in leaves]
+        offsets = np.concatenate([[0], np.cumsum([len(p) for p in points], dtype=np.int64)])
+        stacked = np.concatenate(points) if points else np.empty((0, 3))
+        # shape (3, n_points), so that the x, y and z of every path are contiguous; the product is
+        # computed in float64 and stored in the compute dtype, like the points of a new Path
+        moved   = as_points(matrix[:3, :3] @ stacked.T + matrix[:3, 3:])
+        moved_leaves = iter([_with_points(path, moved[:, offsets[i]:offsets[i+1]])
+                             for i, path in enumerate(leaves)])
+        return _rebuild(arg, moved_leaves)
 
     @staticmethod
-    def offset(path, offset_distance):
+    def offset(path, offset_distance, miter_limit=None, remove_loops=False):
         """
         Computes the offset polygon of a given path by moving each vertex along its normal vector by the offset_distance.
 
+        Each vertex is moved along the bisector of the normals of its two adjacent segments, by the
+        miter length offset_distance / cos(phi / 2), where phi is the turning angle at the vertex.
+        All vertices are processed at once in array form.
+
         Args:
             path (Path): The path to offset.
             offset_distance (float): The distance to offset the path by.
+            miter_limit (float): If given, the maximum ratio of the miter length to offset_distance.
+                Sharp outer corners whose miter would be longer are beveled, i.e. the vertex is
+                replaced by its two offset points along the normals of the adjacent segments.
+                Defaults to None (no limit).
+            remove_loops (bool): Whether to remove the loops that form where the offset path
+                intersects itself, e.g. at concave corners that are sharper than the offset distance.
+                Each loop is cut off at the intersection point. Defaults to False.
 
         Returns:
             Path: The offset path.
         
         """
-        # Generate the offset polygon by computing the normal vectors of each vertex
-        # and moving each vertex along its normal vector by the distance d
-        polygon = path.coords
-        offset_polygon = np.array([])
-        offset_point_x = []
-        offset_point_y = []
-        offset_point_z = []
-        for i in range( len(polygon)):
-            # Compute the normal vector of the current vertex
-            if np.allclose(polygon[0] , polygon[-1]):
-                # closed curve
-                p1 = polygon[(i-1)%(len(polygon)-1)]
-                p2 = polygon[i%(len(polygon)-1)]
-                p3 = polygon[(i+1)%(len(polygon)-1)]
-            else:
-                # open curve
-                if i == 0:
-                    # Processing of the starting point of an open curve
-                    p1 = 2 * polygon[i] - polygon[i+1]
-                    p2 = polygon[i]
-                    p3 = polygon[i+1]
-                elif i == len(polygon)-1:
-                    # End of open curve
-                    p1 = polygon[i-1]
-                    p2 = polygon[i]
-                    p3 = 2 * polygon[i] - polygon[i-1]
-                else:
-                    # Midpoint of open curve
-                    p1 = polygon[i-1]
-                    p2 = polygon[i]
-                    p3 = polygon[i+1]
-            v1 = np.array([p2[0]-p1[0], p2[1]-p1[1]])
-            v2 = np.array([p3[0]-p2[0], p3[1]-p2[1]])
-            n = np.array([v1[1], -v1[0]])
-            m = np.array([v2[1], -v2[0]])
-            n /= np.linalg.norm(n)
-            m /= np.linalg.norm(m)
-            if np.dot(n, m) > 1:
-                n_dot_m = 1
-            elif np.dot(n, m) < -1:
-                n_dot_m = -1
-            else:
-                n_dot_m = np.dot(n, m)
-            phi = np.arccos(n_dot_m)
-            theta = 2 * np.pi - phi - np.pi
-            l = offset_distance / np.sin(theta /2)
-
-            normal = n + m
-            normal /= np.linalg.norm(normal)
-            # Move the current vertex along its normal vector by the distance l
-            offset_point = np.array([p2[0], p2[1]]) + l*normal
-            offset_point_x.append(offset_point[0])
-            offset_point_y.append(offset_point[1])
-            offset_point_z.append(polygon[i, 2])
-        offset_path = Path(offset_point_x, offset_point_y, offset_point_z)
+        polygon = np.asarray(path.coords, dtype=float)
+        closed  = np.allclose(polygon[0] , polygon[-1])
+        # the vertices of a closed curve are processed as a ring, without the closing duplicate
+        points  = _offset_vertices(polygon[:-1] if closed else polygon, offset_distance, closed, miter_limit)
+        if remove_loops:
+            points = _remove_self_intersections(points, closed)
+        if closed:
+            points = np.concatenate([points, points[:1]])
+        offset_path = Path(points[:, 0], points[:, 1], points[:, 2])
 
         return offset_path
+
+    @staticmethod
+    def simplify(arg, tolerance, angle_tolerance=ANGLE_TOLERANCE, return_stats=False):
+        """
+        Removes the points of a Path or of all paths of a PathList that lie within tolerance of the
+        chord between their kept neighbours (Ramer-Douglas-Peucker, see utils/simplify.py), e.g. the
+        collinear points of an oversampled wall.
+
+        The kept points keep their rot and tilt. A point whose rot or tilt differs from the
+        interpolation between its kept neighbours by more than angle_tolerance is kept, and so is
+        every point at which segment_extrusion_multiplier changes, so that every merged segment
+        keeps the multiplier of the segments it replaces. SegmentBundle objects are unchanged.
+        All paths are simplified at once; a PathList keeps its order.
+
+        Args:
+            arg (Path, SegmentBundle or PathList): The object to simplify.
+            tolerance (float): The largest distance of a removed point from the new path, in millimeters.
+            angle_tolerance (float): The largest deviation of the rot and tilt of a removed point from
+                their interpolation, in radians.
+            return_stats (bool): Whether to return the chord error statistics as well.
+
+        Returns:
+            Path, SegmentBundle or PathList: The simplified object, or the tuple (object, stats) with
+            return_stats, where stats is a dict {'points', 'kept', 'removed', 'max_error', 'mean_error',
+            'rms_error'} of the chord errors (the distances of the removed points from the new path).
+        """
+        simplified, stats = simplify_paths(_leaf_paths(arg), tolerance, angle_tolerance)
+        result = _rebuild(arg, iter(simplified))
+        if return_stats:
+            return result, stats
+        return result
+
+
+def move_matrix(x=0.0, y=0.0, z=0.0, roll=0.0, pitch=0.0, yaw=0.0) -> np.ndarray:
+    """
+    Returns the 4x4 matrix of Transform.move: the translation (x, y, z) followed by the
+    rotation R = Rz(yaw) Ry(pitch) Rx(roll) around the origin.
+
+    Returns:
+        numpy.ndarray: Shape (4, 4).
+    """
+    rotation_matrix = np.array([[np.cos(yaw) * np.cos(pitch),
+                                np.cos(yaw) * np.sin(pitch) * np.sin(roll) - np.sin(yaw) * np.cos(roll),
+                                np.cos(yaw) * np.sin(pitch) * np.cos(roll) + np.sin(yaw) * np.sin(roll)],
+                                [np.sin(yaw) * np.cos(pitch),
+                                np.sin(yaw) * np.sin(pitch) * np.sin(roll) + np.cos(yaw) * np.cos(roll),
+                                np.sin(yaw) * np.sin(pitch) * np.cos(roll) - np.cos(yaw) * np.sin(roll)],
+                                [-np.sin(pitch),
+                                np.cos(pitch) * np.sin(roll),
+                                np.cos(pitch) * np.cos(roll)]])
+    matrix = np.identity(4)
+    matrix[:3, :3] = rotation_matrix
+    matrix[:3, 3]  = rotation_matrix @ np.array([x, y, z], dtype=float)
+    return matrix
+
+
+def simplify_paths(paths, tolerance, angle_tolerance=ANGLE_TOLERANCE) -> tuple:
+    """
+    Simplifies a flat list of Path and SegmentBundle objects, see Transform.simplify.
+
+    Returns:
+        tuple: (paths, stats), the simplified copies of the paths (SegmentBundle objects are
+        returned as they are) and the chord error statistics.
+    """
+    polylines = [path for path in paths if not isinstance(path, SegmentBundle)]
+    if not polylines:
+        return list(paths), chord_error_stats(0, 0, [])
+    columns = [np.concatenate([np.asarray(path.x, dtype=float) for path in polylines]),
+               np.concatenate([np.asarray(path.y, dtype=float) for path in polylines]),
+               np.concatenate([np.asarray(path.z, dtype=float) for path in polylines])]
+    # rot and tilt take part in the distances, scaled so that angle_tolerance counts as tolerance
+    for name in ('rot', 'tilt'):
+        angles = np.concatenate([np.asarray(getattr(path, name), dtype=float) for path in polylines])
+        if np.any(angles != angles[0]):
+            columns.append(angles * (tolerance / angle_tolerance))
+    points  = np.column_stack(columns)
+    offsets = np.concatenate([[0], np.cumsum([len(path.x) for path in polylines], dtype=np.int64)])
+
+    # the points at which the extrusion multiplier changes are kept
+    fixed = np.zeros(len(points), dtype=bool)
+    for i, path in enumerate(polylines):
+        if path.segment_extrusion_multiplier is not None:
+            multipliers = np.asarray(path.segment_extrusion_multiplier)[:len(path.x) - 1]
+            fixed[offsets[i] + 1 + np.flatnonzero(multipliers[1:] != multipliers[:-1])] = True
+
+    keep, errors = simplify_polylines(points, offsets, tolerance, fixed)
+    simplified = iter([_with_kept_points(path, keep[offsets[i]:offsets[i+1]])
+                       for i, path in enumerate(polylines)])
+    result = [path if isinstance(path, SegmentBundle) else next(simplified) for path in paths]
+    return result, chord_error_stats(len(points), np.count_nonzero(keep), errors)
+
+
+def _with_kept_points(path, keep):
+    # a copy of path with the points where keep is True, and the multipliers of their segments,
+    # sharing nothing mutable with the original
+    kept = _detached_copy(path)
+    kept.x    = np.asarray(path.x)[keep]
+    kept.y    = np.asarray(path.y)[keep]
+    kept.z    = np.asarray(path.z)[keep]
+    kept.rot  = np.asarray(path.rot)[keep]
+    kept.tilt = np.asarray(path.tilt)[keep]
+    if path.segment_extrusion_multiplier is not None:
+        multipliers = np.asarray(path.segment_extrusion_multiplier)
+        n_segments  = len(path.x) - 1
+        # a merged segment starts at a kept point and has the multiplier of the segment starting there
+        kept.segment_extrusion_multiplier = np.concatenate(
+            [multipliers[:n_segments][np.flatnonzero(keep)[:-1]], multipliers[n_segments:]])
+    return kept
+
+
+def _leaf_paths(item) -> list:
+    # the Path and SegmentBundle objects of item, depth first
+    if isinstance(item, PathList):
+        return [leaf for path in item.paths for leaf in _leaf_paths(path)]
+    return [item]
+
+
+def _rebuild(item, moved_leaves):
+    # rebuilds the (nested) structure of item from the transformed leaves, in _leaf_paths order
+    if isinstance(item, PathList):
+        return PathList([_rebuild(path, moved_leaves) for path in item.paths], sort=False) # keep the order
+    return next(moved_leaves)
+
+
+def _points_of(path) -> np.ndarray:
+    if isinstance(path, SegmentBundle):
+        return path.segments.reshape(-1, 3)
+    return as_points(np.column_stack([path.x, path.y, path.z]))
+
+
+def _detached_copy(path):
+    # a shallow copy of path that shares no mutable per-path attribute with it; the settings
+    # dict is the process-wide cache of gcoordinator.settings, which is shared by all paths
+    detached = copy.copy(path)
+    if path.segment_extrusion_multiplier is not None:
+        detached.segment_extrusion_multiplier = np.array(path.segment_extrusion_multiplier)
+    detached.travel_path = copy.deepcopy(path.travel_path)
+    detached.optional_settings = dict(path.optional_settings)
+    return detached
+
+
+def _with_points(path, points):
+    # a copy of path with new points, sharing nothing mutable with the original
+    # points has shape (3, n_points)
+    moved = _detached_copy(path)
+    if isinstance(path, SegmentBundle):
+        moved.segments = points.T.reshape(-1, 2, 3)
+        return moved
+    moved.x    = points[0]
+    moved.y    = points[1]
+    moved.z    = points[2]
+    moved.rot  = point_array(path.rot)
+    moved.tilt = point_array(path.tilt)
+    return moved
+
+
+def _offset_vertices(polygon, offset_distance, closed, miter_limit=None):
+    """
+    Moves every vertex of polygon (shape (n, 3)) along the bisector of its adjacent segment
+    normals by the miter length. Returns the offset vertices, shape (n + n_beveled, 3).
+    """
+    xy = polygon[:, :2]
+    if closed:
+        prev_xy = np.roll(xy, 1, axis=0)
+        next_xy = np.roll(xy, -1, axis=0)
+    else:
+        # the ends of an open curve are offset along the normal of their only segment
+        prev_xy = np.concatenate([[2 * xy[0] - xy[1]], xy[:-1]])
+        next_xy = np.concatenate([xy[1:], [2 * xy[-1] - xy[-2]]])
+    v1 = xy - prev_xy
+    v2 = next_xy - xy
+    n = np.column_stack([v1[:, 1], -v1[:, 0]])
+    m = np.column_stack([v2[:, 1], -v2[:, 0]])
+    n /= np.linalg.norm(n, axis=1)[:, None]
+    m /= np.linalg.norm(m, axis=1)[:, None]
+    phi   = np.arccos(np.clip(np.sum(n * m, axis=1), -1, 1))
+    theta = 2 * np.pi - phi - np.pi
+    miter = offset_distance / np.sin(theta / 2)
+
+    normal = n + m
+    normal /= np.linalg.norm(normal, axis=1)[:, None]
+    offset_xy = xy + miter[:, None] * normal
+    offset_points = np.column_stack([offset_xy, polygon[:, 2]])
+    if miter_limit is None:
+        return offset_points
+
+    # bevel the outer corners (turning away from the offset side) whose miter is too long
+    turn  = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+    bevel = (np.abs(miter) > miter_limit * abs(offset_distance)) & (turn * offset_distance > 0)
+    if not np.any(bevel):
+        return offset_points
+    counts = np.where(bevel, 2, 1)
+    vertex = np.repeat(np.arange(len(polygon)), counts)
+    points = offset_points[vertex]
+    beveled = np.nonzero(bevel)[0]
+    first   = np.cumsum(counts)[beveled] - 2
+    points[first,     :2] = xy[beveled] + offset_distance * n[beveled]
+    points[first + 1, :2] = xy[beveled] + offset_distance * m[beveled]
+    return points
+
+
+def _segment_intersections(points, closed, max_pairs=1 << 20):
+    """
+    Finds the crossings between the non-adjacent segments of a polyline (or of a ring if closed).
+
+    Candidate pairs are found with a sweep over the x-extents of the segments: after sorting the
+    segments by their minimum x, the segments whose x-extent overlaps segment p are the ones that
+    follow p up to the first one starting beyond its maximum x. The candidates are generated and
+    tested in chunks of about max_pairs pairs.
+
+    Returns:
+        tuple: (i, j, t, u), the segment indices (i < j) and the parameters of the crossing point
+        along segment i and along segment j, sorted by (i, t).
+    """
+    xy = points[:, :2]
+    if closed:
+        start, end = xy, np.roll(xy, -1, axis=0)
+    else:
+        start, end = xy[:-1], xy[1:]
+    n_segments = len(start)
+    lo = np.minimum(start, end)
+    hi = np.maximum(start, end)
+
+    order  = np.argsort(lo[:, 0], kind='stable')
+    lo_x   = lo[order, 0]
+    counts = np.searchsorted(lo_x, hi[order, 0], side='right') - np.arange(1, n_segments + 1)
+    counts = np.maximum(counts, 0)
+
+    found = []
+    total = np.cumsum(counts)
+    first = 0
+    while first < n_segments:
+        # the largest chunk of sweep positions whose pairs fit in max_pairs (at least one position)
+        done = total[first - 1] if first > 0 else 0
+        last = max(int(np.searchsorted(total, done + max_pairs, side='right')), first + 1)
+        last = min(last, n_segments)
+        sweep_index, step = get_subdivision_indices(counts[first:last])
+        a = order[sweep_index + first]
+        b = order[sweep_index + first + step]
+        first = last
+
+        overlap = (lo[a, 1] <= hi[b, 1]) & (lo[b, 1] <= hi[a, 1])
+        i = np.minimum(a, b)[overlap]
+        j = np.maximum(a, b)[overlap]
+        adjacent = (j - i == 1) | (closed & (i == 0) & (j == n_segments - 1))
+        i, j = i[~adjacent], j[~adjacent]
+
+        d1 = end[i] - start[i]
+        d2 = end[j] - start[j]
+        w  = start[j] - start[i]
+        denom = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (w[:, 0] * d2[:, 1] - w[:, 1] * d2[:, 0]) / denom
+            u = (w[:, 0] * d1[:, 1] - w[:, 1] * d1[:, 0]) / denom
+        # half-open parameter ranges, so that a crossing at a vertex is found once
+        cross = (denom != 0) & (t >= 0) & (t < 1) & (u >= 0) & (u < 1)
+        found.append((i[cross], j[cross], t[cross], u[cross]))
+
+    i, j, t, u = (np.concatenate(column) for column in zip(*found)) if found else [np.empty(0)] * 4
+    sort = np.lexsort((t, i))
+    return i[sort].astype(np.int64), j[sort].astype(np.int64), t[sort], u[sort]
+
+
+def _remove_self_intersections(points, closed):
+    """
+    Removes the loops of a self-intersecting polyline (or ring if closed), shape (n, 3).
+
+    At a crossing of the segments i < j, the path splits into the loop through the vertices
+    i+1..j and the rest. The part with the smaller signed area (taking the orientation of the
+    whole ring as positive) is cut off and the crossing point is inserted instead: this removes
+    the inverted loops of an offset, and of two regions pinched apart it keeps the larger one.
+    For open polylines the loop i+1..j is always cut off. The crossings are searched again until
+    none is left; every cut removes at least one vertex.
+    """
+    while len(points) > 3:
+        i, j, t, u = _segment_intersections(points, closed)
+        if len(i) == 0:
+            break
+        points = _cut_loops(points, closed, i, j, t, u)
+    return points
+
+
+def _cut_loops(points, closed, i, j, t, u):
+    """
+    Cuts off the loops of the crossings (i, j, t, u) that do not overlap an earlier cut.
+    See _remove_self_intersections.
+    """
+    n_points   = len(points)
+    next_point = np.roll(points, -1, axis=0)
+    crossing   = points[i] + t[:, None] * (next_point[i] - points[i])
+
+    # twice the signed areas of the loops, from the prefix sums of the shoelace terms
+    x, y  = points[:, 0], points[:, 1]
+    terms = x * next_point[:, 1] - y * next_point[:, 0]
+    if not closed:
+        terms[-1] = 0
+    prefix = np.concatenate([[0], np.cumsum(terms)])
+    cx, cy = crossing[:, 0], crossing[:, 1]
+    inner  = (cx * y[i + 1] - cy * x[i + 1]) + (prefix[j] - prefix[i + 1]) + (x[j] * cy - y[j] * cx)
+    if closed:
+        orientation = np.sign(prefix[-1]) or 1.0
+        outer = prefix[-1] - inner
+        remove_inner = inner * orientation <= outer * orientation
+    else:
+        remove_inner = np.ones(len(i), dtype=bool)
+
+    pieces  = []
+    kept_to = 0         # vertices before kept_to have been copied
+    cut_at  = (-1, -1.0)  # segment and parameter of the end of the last cut
+    for k in range(len(i)):
+        if (i[k], t[k]) <= cut_at:
+            continue
+        if not remove_inner[k]:
+            if pieces:
+                # handled in the next pass
+                continue
+            # the loop is everything outside of i+1..j: keep the inner ring only
+            return np.concatenate([crossing[k:k+1], points[i[k]+1:j[k]+1]])
+        pieces.append(points[kept_to:i[k]+1])
+        pieces.append(crossing[k:k+1])
+        kept_to = j[k] + 1
+        cut_at  = (j[k], u[k])
+    pieces.append(points[kept_to:n_points])
+    return np.concatenate(pieces)
@@ -2,7 +2,8 @@ import urllib.request
 import urllib.error
 import numpy as np
 import msgpack
-from gcoordinator.path_generator import flatten_path_list
+from gcoordinator.path_store     import pack_coords
+from gcoordinator.path_generator import SegmentBundle, flatten_path_list
 
 
 def preview(full_object, port: int = 5163) -> None:
@@ -19,17 +20,54 @@ def preview(full_object, port: int = 5163) -> None:
     Returns:
         None
     """
-    paths = flatten_path_list(full_object)
-    if not paths:
+    data = build_preview_payload(full_object)
+    if data is None:
         print("[gcoordinator] preview: full_object is empty, nothing to send.")
         return
 
-    path_lengths = [len(p.coords) for p in paths]
-    all_coords = np.concatenate([p.coords.astype(np.float32) for p in paths])
+    url = f"http://127.0.0.1:{port}/preview"
+    req = urllib.request.Request(
+        url,
+        data=data,
+        headers={"Content-Type": "application/msgpack"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            resp.read()
+    except urllib.error.URLError as e:
+        print(f"[gcoordinator] preview: Failed to connect to the VSCode extension ({e.reason})")
+        print(f"[gcoordinator] preview: Make sure the gcoordinator extension is installed and VSCode is open.")
+    except Exception as e:
+        print(f"[gcoordinator] preview: Unexpected error: {e}")
+
+
+def build_preview_payload(full_object):
+    """
+    Encodes the coordinate data of full_object as the MessagePack payload sent by preview().
+
+    Args:
+        full_object: A list of Path or PathList objects.
+
+    Returns:
+        bytes: The encoded payload, or None if full_object contains no paths.
+    """
+    paths = flatten_path_list(full_object)
+    if not paths:
+        return None
+
+    path_lengths = []
+    all_coords, coord_offsets = pack_coords(paths, np.float32)
 
     travel_path_lengths = []
     travel_coords_list = []
-    for path in paths:
+    for path, length in zip(paths, np.diff(coord_offsets).tolist()):
+        if isinstance(path, SegmentBundle):
+            # every segment is drawn as a separate 2-point path, the travel path follows the last one
+            path_lengths.extend([2] * len(path))
+            travel_path_lengths.extend([0] * (len(path) - 1))
+        else:
+            path_lengths.append(length)
         if path.travel_path is not None:
             tp = path.travel_path
             wps = np.column_stack([np.atleast_1d(tp[0]), np.atleast_1d(tp[1]), np.atleast_1d(tp[2])]).astype(np.float32)
@@ -40,28 +78,12 @@ def preview(full_object, port: int = 5163) -> None:
 
     travel_coords = np.concatenate(travel_coords_list).tobytes() if travel_coords_list else b''
 
-    data = msgpack.packb(
+    return msgpack.packb(
         {
             "path_lengths": path_lengths,
-            "coords": all_coords.tobytes(),
+            "coords": memoryview(all_coords).cast("B"), # packed without a bytes copy
             "travel_path_lengths": travel_path_lengths,
             "travel_coords": travel_coords,
         },
         use_bin_type=True,
     )
-
-    url = f"http://127.0.0.1:{port}/preview"
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/msgpack"},
-        method="POST",
-    )
-    try:
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            resp.read()
-    except urllib.error.URLError as e:
-        print(f"[gcoordinator] preview: Failed to connect to the VSCode extension ({e.reason})")
-        print(f"[gcoordinator] preview: Make sure the gcoordinator extension is installed and VSCode is open.")
-    except Exception as e:
-        print(f"[gcoordinator] preview: Unexpected error: {e}")
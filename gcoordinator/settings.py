@@ -1,5 +1,18 @@
+import os
 import json
 
+
+TEMP_CONFIG_PATH = '.temp_config.json'
+
+# process-wide cache of the parsed .temp_config.json.
+# 'key' identifies the file version (mtime, size) the cached settings were read from.
+_settings_cache = {
+    'key'       : None,
+    'settings'  : None,
+    'disk_reads': 0,
+    'hits'      : 0,
+}
+
 def get_default_settings(settings):
     """
     This function loads the default settings for a 3D printer from a JSON file and retunrs them as a dictionary.
@@ -21,6 +34,8 @@ def get_default_settings(settings):
     - 'z_hop'                : a boolean indicating whether the printer should raise the nozzle during travel moves
     - 'z_hop_distance'       : the height by which the printer should raise the nozzle during travel moves in millimeters
     - 'extrusion_multiplier' : a scaling factor for the amount of filament extruded by the printer
+    - 'arc_tolerance'        : the tolerance of the G2/G3 arc fitting in millimeters, None to print lines only
+                               (optional, Print.arc_fitting.arc_tolerance)
 
     """
 
@@ -40,7 +55,8 @@ def get_default_settings(settings):
         'unretraction_distance': settings['Print']['travel_option']['unretraction_distance'],
         'z_hop'                : settings['Print']['travel_option']['z_hop'],
         'z_hop_distance'       : settings['Print']['travel_option']['z_hop_distance'],
-        'extrusion_multiplier' : settings['Print']['extrusion_option']['extrusion_multiplier']
+        'extrusion_multiplier' : settings['Print']['extrusion_option']['extrusion_multiplier'],
+        'arc_tolerance'        : settings['Print'].get('arc_fitting', {}).get('arc_tolerance')
     }
 
     return default_settings
@@ -67,13 +83,85 @@ def load_settings(config_path):
     try:
         with open(config_path, 'r') as config_file:
             settings_dict = json.load(config_file)
-        settings_name = '.temp_config.json'
+        settings_name = TEMP_CONFIG_PATH
         with open(settings_name, 'w') as temp_config:
             json.dump(settings_dict, temp_config, indent=4)
+        # populate the cache so that Path and the kinematics never have to read the file back
+        _settings_cache['key']      = _temp_config_key()
+        _settings_cache['settings'] = settings_dict
 
     except json.JSONDecodeError:
         print("Error: Invalid JSON format in the config file. Using default settings.")
-    
+
+
+def _temp_config_key():
+    """
+    Returns a key identifying the current version of the temporary config file,
+    or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(TEMP_CONFIG_PATH)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_settings():
+    """
+    Returns the current settings dictionary.
+
+    The settings written by load_settings() are kept in a process-wide cache.
+    The temporary config file is only read again when its modification time or
+    size changes (e.g. it was rewritten by the GUI) or after reload_settings().
+    If the file does not exist or cannot be parsed, template_settings is returned.
+    The returned dictionary is shared and must not be modified.
+
+    Returns:
+        dict: The settings dictionary.
+    """
+    key = _temp_config_key()
+    if key is None:
+        return template_settings # gcoordinator/settings.py
+    if key == _settings_cache['key']:
+        _settings_cache['hits'] += 1
+        return _settings_cache['settings']
+
+    _settings_cache['disk_reads'] += 1
+    try:
+        with open(TEMP_CONFIG_PATH, 'r') as f:
+            settings = json.load(f)
+    except (OSError, ValueError):
+        settings = template_settings
+    _settings_cache['key']      = key
+    _settings_cache['settings'] = settings
+    return settings
+
+
+def reload_settings():
+    """
+    Invalidates the settings cache, so that the temporary config file is read
+    again on the next access.
+
+    Returns:
+        None
+    """
+    _settings_cache['key']      = None
+    _settings_cache['settings'] = None
+
+
+def settings_cache_info():
+    """
+    Returns statistics of the settings cache.
+
+    Returns:
+        dict: 'disk_reads' is the number of times the temporary config file has been
+            read and parsed, 'hits' the number of lookups served from memory.
+    """
+    return {
+        'disk_reads': _settings_cache['disk_reads'],
+        'hits'      : _settings_cache['hits'],
+    }
+
 
 
 
@@ -0,0 +1,173 @@
+"""
+Vectorized arc fitting: finds the runs of consecutive points of a polyline that lie
+on a circular arc in the XY plane, so that each run can be printed with one G2/G3
+move instead of one G1 move per segment.
+
+The polyline is first split into candidate runs: the maximal sequences of points
+where every three consecutive points turn in the same direction, are not collinear,
+have the same z and join segments with the same key (e.g. the extrusion multiplier).
+Every run is then checked against the circle through its first, middle and last
+point. A run is accepted as an arc if
+
+  - every point is within tolerance of the circle,
+  - every chord is within tolerance of the arc (the sagitta of the longest segment),
+  - the points advance monotonically around the center, by at most max_sweep in total.
+
+A rejected run is split at its point farthest from the circle (or in the middle)
+and both halves are checked again, until they are accepted or shorter than
+min_segments. All runs are checked at once, so the work per round is a few array
+operations over the points, independent of the number of runs.
+"""
+import numpy as np
+
+
+MIN_ARC_SEGMENTS = 3    # shortest run of segments replaced by an arc
+MAX_SWEEP  = np.pi      # largest angle of one arc, in radians
+MAX_RADIUS = 1000.0     # largest arc radius, in millimeters; flatter runs are printed as lines
+MAX_ROUNDS = 64         # number of split rounds, the runs left after them are printed as lines
+
+
+def circumcenters(a, b, c) -> tuple:
+    """
+    Returns the centers of the circles through the XY points a, b and c.
+
+    Args:
+        a, b, c (numpy.ndarray): Shape (n, 2) or more columns, only the first two are used.
+
+    Returns:
+        tuple: (centers, ccw), centers of shape (n, 2) (nan for collinear points) and a bool
+        array that is True where a -> b -> c turns counterclockwise.
+    """
+    # relative to b for precision
+    ax, ay = a[:, 0] - b[:, 0], a[:, 1] - b[:, 1]
+    cx, cy = c[:, 0] - b[:, 0], c[:, 1] - b[:, 1]
+    d = 2 * (ax * cy - ay * cx)
+    a2 = ax**2 + ay**2
+    c2 = cx**2 + cy**2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ux = (cy * a2 - ay * c2) / d
+        uy = (ax * c2 - cx * a2) / d
+    centers = np.column_stack([b[:, 0] + ux, b[:, 1] + uy])
+    return centers, d < 0
+
+
+def fit_arcs(points, tolerance, segment_keys=None, min_segments=MIN_ARC_SEGMENTS,
+             max_sweep=MAX_SWEEP, max_radius=MAX_RADIUS) -> tuple:
+    """
+    Finds the runs of points of a polyline that can be replaced by circular arcs.
+
+    Args:
+        points (array_like): Shape (n, 3). The points of the polyline.
+        tolerance (float): The largest distance of the points and of the chords from the arc,
+            in millimeters.
+        segment_keys (array_like): Shape (n - 1,) or None. An arc only spans segments with
+            equal keys, e.g. the extrusion multiplier of every segment.
+        min_segments (int): The smallest number of segments replaced by one arc.
+        max_sweep (float): The largest angle of one arc, in radians (at most 2 pi).
+        max_radius (float): The largest radius of an arc.
+
+    Returns:
+        tuple: (starts, ends, centers, clockwise), ordered along the polyline. The k-th arc
+        replaces the segments from point starts[k] to point ends[k], around centers[k]
+        (shape (n_arcs, 2)), clockwise (G2) or counterclockwise (G3). The arcs do not overlap.
+    """
+    points = np.asarray(points, dtype=float)
+    empty  = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty((0, 2)), np.empty(0, dtype=bool))
+    n = len(points)
+    if n < min_segments + 1:
+        return empty
+
+    # the triples (i-1, i, i+1) of the interior points i = 1 .. n-2
+    centers, ccw = circumcenters(points[:-2], points[1:-1], points[2:])
+    radii = np.hypot(centers[:, 0] - points[1:-1, 0], centers[:, 1] - points[1:-1, 1])
+    z = points[:, 2]
+    valid = (radii <= max_radius) & (z[:-2] == z[1:-1]) & (z[1:-1] == z[2:])
+    if segment_keys is not None:
+        keys = np.asarray(segment_keys)[:n-1]
+        valid &= keys[:-1] == keys[1:]
+
+    # candidate runs: maximal sequences of valid triples turning the same way
+    joined = valid[:-1] & valid[1:] & (ccw[:-1] == ccw[1:])
+    first  = valid & np.concatenate([[True], ~joined])
+    last   = valid & np.concatenate([~joined, [True]])
+    starts = np.flatnonzero(first)      # triple j spans the points j .. j+2
+    ends   = np.flatnonzero(last) + 2
+    # neighbouring runs may share an end point, but not a segment
+    starts[1:] = np.maximum(starts[1:], ends[:-1])
+
+    accepted = []
+    for _ in range(MAX_ROUNDS):
+        keep = ends - starts >= min_segments
+        starts, ends = starts[keep], ends[keep]
+        if len(starts) == 0:
+            break
+        ok, arc_centers, clockwise, split = _check_runs(points, starts, ends, tolerance, max_sweep, max_radius)
+        accepted.append((starts[ok], ends[ok], arc_centers[ok], clockwise[ok]))
+        starts, split, ends = starts[~ok], split[~ok], ends[~ok]
+        starts, ends = np.concatenate([starts, split]), np.concatenate([split, ends])
+
+    if not accepted:
+        return empty
+    starts, ends, arc_centers, clockwise = (np.concatenate(parts) for parts in zip(*accepted))
+    order = np.argsort(starts, kind='stable')
+    return starts[order], ends[order], arc_centers[order], clockwise[order]
+
+
+def _check_runs(points, starts, ends, tolerance, max_sweep, max_radius) -> tuple:
+    """
+    Checks the runs of points starts[k] .. ends[k] against the circles through their first,
+    middle and last points. Returns (ok, centers, clockwise, split), where split is the point
+    at which a rejected run is divided.
+    """
+    middles = (starts + ends) // 2
+    centers, ccw = circumcenters(points[starts], points[middles], points[ends])
+    radii = np.hypot(*(points[starts, :2] - centers).T)
+    valid = np.isfinite(radii) & (radii <= max_radius)
+    centers[~valid] = 0.0
+    radii[~valid]   = 0.0
+
+    # the points of all runs, packed: run k holds the rows offsets[k]:offsets[k+1]
+    counts  = ends - starts + 1
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    run     = np.repeat(np.arange(len(starts)), counts)
+    index   = np.arange(offsets[-1]) - np.repeat(offsets[:-1] - starts, counts)
+    relative = points[index, :2] - centers[run]
+    deviation = np.abs(np.hypot(relative[:, 0], relative[:, 1]) - radii[run])
+    max_deviation = np.maximum.reduceat(deviation, offsets[:-1])
+
+    # the segments of all runs: every point but the last of its run
+    is_segment = np.ones(offsets[-1], dtype=bool)
+    is_segment[offsets[1:] - 1] = False
+    v0, v1 = relative[:-1][is_segment[:-1]], relative[1:][is_segment[:-1]]
+    angles  = np.arctan2(v0[:, 0] * v1[:, 1] - v0[:, 1] * v1[:, 0], np.sum(v0 * v1, axis=1))
+    angles  = np.where(np.repeat(ccw, counts - 1), angles, -angles) # positive along the arc
+    segment_offsets = offsets[:-1] - np.arange(len(starts))
+    sweep     = np.add.reduceat(angles, segment_offsets)
+    backwards = np.minimum.reduceat(angles, segment_offsets) <= 0
+    chords    = np.hypot(*(points[index[1:], :2] - points[index[:-1], :2])[is_segment[:-1]].T)
+    longest   = np.maximum.reduceat(chords, segment_offsets)
+    sagitta   = radii - np.sqrt(np.maximum(radii**2 - longest**2 / 4, 0))
+
+    ok = (valid & (max_deviation <= tolerance) & (sagitta <= tolerance) & ~backwards
+          & (sweep <= max_sweep + 1e-9))
+
+    # split a run that is off the circle at its farthest point, any other at the middle
+    interior = deviation.copy()
+    interior[offsets[:-1]] = -1.0
+    interior[offsets[1:] - 1] = -1.0
+    farthest = (np.maximum.reduceat(interior, offsets[:-1]))[run] == interior
+    positions = np.flatnonzero(farthest)
+    runs_with, first = np.unique(run[positions], return_index=True)
+    farthest_point = middles.copy()
+    farthest_point[runs_with] = index[positions[first]]
+    off_circle = valid & ~(max_deviation <= tolerance) & (farthest_point > starts) & (farthest_point < ends)
+    split = np.where(off_circle, farthest_point, middles)
+    return ok, centers, ~ccw, split
+
+
+if __name__ == '__main__':
+    arg = np.linspace(0, np.pi, 50)
+    points = np.column_stack([10 * np.cos(arg), 10 * np.sin(arg), np.full_like(arg, 0.2)])
+    starts, ends, centers, clockwise = fit_arcs(points, 0.01)
+    print(starts, ends, np.round(centers, 6), clockwise)
+    # Expected output: [0] [49] [[0. 0.]] [False]
@@ -0,0 +1,200 @@
+"""
+Vectorized marching squares over a sparse set of grid cells.
+
+contourpy contours a full 2-D array. When only a few cells of a fine grid are of
+interest (e.g. the cells near the zero level set found by adaptive sampling), the
+zero contour can instead be extracted from those cells alone:
+
+  - every cell with four valid corners is contoured as a quad, a saddle quad is
+    resolved with the mean of its corners, like contourpy does,
+  - every cell with three valid corners is contoured as the triangle of these
+    corners (contourpy's corner_mask), the line ends on its diagonal,
+  - the segments are oriented with the positive side on their left, so that every
+    crossing point has at most one incoming and one outgoing segment, and are
+    chained into polylines by pointer jumping.
+
+A crossing point is identified by the grid edge it lies on, so the segments of
+neighbouring cells meet exactly. All steps are array operations over the cells and
+crossing points, independent of the size of the full grid.
+"""
+import numpy as np
+
+
+# corner k of a cell is the node (row + _CORNER_ROW[k], col + _CORNER_COL[k]),
+# counterclockwise from the lowest node; edge k runs from corner k to corner k + 1
+_CORNER_ROW = np.array([0, 0, 1, 1])
+_CORNER_COL = np.array([0, 1, 1, 0])
+
+
+def cell_contours(x, y, rows, cols, values, valid) -> list:
+    """
+    Extracts the zero contour of a field sampled on the nodes of a set of grid cells.
+
+    Args:
+        x (numpy.ndarray): Shape (n_x,). The ascending x coordinates of the grid columns.
+        y (numpy.ndarray): Shape (n_y,). The ascending y coordinates of the grid rows.
+        rows, cols (numpy.ndarray): Shape (m,). The lowest node of every cell, the cells must
+            be distinct.
+        values (numpy.ndarray): Shape (4, m). The field on the corners of every cell,
+            counterclockwise from the lowest node: (row, col), (row, col + 1),
+            (row + 1, col + 1), (row + 1, col).
+        valid (numpy.ndarray): Shape (4, m), bool. The corners where the field is defined
+            (NaN values are not).
+
+    Returns:
+        list: The contour lines, as arrays of shape (n, 2). A closed line repeats its first point.
+    """
+    n_x = len(x)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    nodes = (rows + _CORNER_ROW[:, None]) * n_x + (cols + _CORNER_COL[:, None])
+    valid = valid & ~np.isnan(values)
+    above = values > 0
+    n_valid = valid.sum(axis=0)
+
+    src, dst = [], []
+    quad = n_valid == 4
+    if quad.any():
+        _quad_segments(nodes[:, quad], values[:, quad], above[:, quad], x, y, src, dst)
+    tri = n_valid == 3
+    if tri.any():
+        _triangle_segments(nodes[:, tri], values[:, tri], above[:, tri], valid[:, tri],
+                           len(x) * len(y), x, y, src, dst)
+    if not src:
+        return []
+    src_key, src_xy = (np.concatenate(parts) for parts in zip(*src))
+    dst_key, dst_xy = (np.concatenate(parts) for parts in zip(*dst))
+    return _chain_segments(src_key, src_xy, dst_key, dst_xy)
+
+
+def _crossings(p, q, vp, vq, x, y, key):
+    # the zero crossing on the edge between the nodes p and q, computed from the lower
+    # node so that both cells sharing the edge get the same point
+    swap = p > q
+    p, q   = np.where(swap, q, p), np.where(swap, p, q)
+    vp, vq = np.where(swap, vq, vp), np.where(swap, vp, vq)
+    n_x = len(x)
+    frac = vq / (vq - vp)
+    xy = np.column_stack([x[p % n_x] * frac + x[q % n_x] * (1 - frac),
+                          y[p // n_x] * frac + y[q // n_x] * (1 - frac)])
+    return key, xy
+
+
+def _edge_keys(p, q):
+    # horizontal and vertical grid edges get even and odd keys
+    low = np.minimum(p, q)
+    return 2 * low + (np.abs(q - p) != 1)
+
+
+def _quad_segments(nodes, values, above, x, y, src, dst):
+    m = nodes.shape[1]
+    nxt = [1, 2, 3, 0]
+    cross = above != above[nxt]        # edge k crosses zero
+    down  = cross & above              # edge k goes from the positive to the negative side
+    up    = cross & ~above
+    n_cross = cross.sum(axis=0)
+    cells = np.arange(m)
+
+    # one segment from the down edge to the up edge, the positive corners on its left
+    single = n_cross == 2
+    seg_cell = [cells[single]]
+    seg_from = [np.argmax(down[:, single], axis=0)]
+    seg_to   = [np.argmax(up[:, single], axis=0)]
+
+    # a saddle has two segments: each down edge is joined to the next up edge if the
+    # center is positive (the negative corners are cut off), otherwise to the previous one
+    saddle = np.flatnonzero(n_cross == 4)
+    if len(saddle):
+        center_above = values[:, saddle].mean(axis=0) > 0
+        first_down = np.where(above[0, saddle], 0, 1)
+        for down_edge in (first_down, first_down + 2):
+            seg_cell.append(saddle)
+            seg_from.append(down_edge)
+            seg_to.append(np.where(center_above, down_edge + 1, down_edge + 3) % 4)
+
+    seg_cell = np.concatenate(seg_cell)
+    for edges, out in ((np.concatenate(seg_from), src), (np.concatenate(seg_to), dst)):
+        p = nodes[edges, seg_cell]
+        q = nodes[(edges + 1) % 4, seg_cell]
+        out.append(_crossings(p, q, values[edges, seg_cell], values[(edges + 1) % 4, seg_cell],
+                              x, y, _edge_keys(p, q)))
+
+
+def _triangle_segments(nodes, values, above, valid, n_nodes, x, y, src, dst):
+    m = nodes.shape[1]
+    cells = np.arange(m)
+    missing = np.argmin(valid, axis=0)
+    # the corners of the triangle, counterclockwise, and its edges: two cell edges and the diagonal
+    corner = (missing + np.arange(1, 4)[:, None]) % 4
+    tri_nodes  = nodes[corner, cells]
+    tri_values = values[corner, cells]
+    tri_above  = above[corner, cells]
+    nxt = [1, 2, 0]
+    cross = tri_above != tri_above[nxt]
+    down  = cross & tri_above
+    up    = cross & ~tri_above
+    has = cross.any(axis=0)
+    cells = cells[has]
+    for edges, out in ((np.argmax(down[:, has], axis=0), src), (np.argmax(up[:, has], axis=0), dst)):
+        p = tri_nodes[edges, cells]
+        q = tri_nodes[(edges + 1) % 3, cells]
+        # a diagonal belongs to one cell only, it gets a key after all grid edges
+        key = np.where(edges == 2, 2 * n_nodes + nodes[0, cells], _edge_keys(p, q))
+        out.append(_crossings(p, q, tri_values[edges, cells], tri_values[(edges + 1) % 3, cells],
+                              x, y, key))
+
+
+def _chain_segments(src_key, src_xy, dst_key, dst_xy) -> list:
+    keys, inverse = np.unique(np.concatenate([src_key, dst_key]), return_inverse=True)
+    n = len(keys)
+    n_seg = len(src_key)
+    xy = np.empty((n, 2))
+    xy[inverse] = np.concatenate([src_xy, dst_xy])
+    src, dst = inverse[:n_seg], inverse[n_seg:]
+    points = np.arange(n)
+    succ = np.full(n, -1)
+    pred = np.full(n, -1)
+    succ[src] = dst
+    pred[dst] = src
+    steps = max(1, int(np.ceil(np.log2(n + 1))))
+
+    # pointer jumping along succ, where the last point of a chain points to itself: the points
+    # of an open chain end up at its last point, those of a cycle keep circling; every cycle
+    # is opened at its lowest point, which becomes the first point of a closed line
+    pointer = np.where(succ >= 0, succ, points)
+    lowest  = points
+    for _ in range(steps):
+        lowest  = np.minimum(lowest, lowest[pointer])
+        pointer = pointer[pointer]
+    on_cycle = succ[pointer] >= 0
+    cycle_heads = np.flatnonzero(on_cycle & (lowest == points))
+    succ[pred[cycle_heads]] = -1
+    pred[cycle_heads] = -1
+
+    # the same along pred gives the first point of every chain and the rank of every point in it
+    pointer = np.where(pred >= 0, pred, points)
+    rank = (pred >= 0).astype(np.int64)
+    for _ in range(steps):
+        rank = rank + rank[pointer]
+        pointer = pointer[pointer]
+    head = pointer
+
+    order = np.lexsort((rank, head))
+    starts = np.flatnonzero(np.concatenate([[True], head[order][1:] != head[order][:-1]]))
+    closed = np.zeros(n, dtype=bool)
+    closed[cycle_heads] = True
+    lines = []
+    for points, first in zip(np.split(order, starts[1:]), order[starts]):
+        line = xy[points]
+        if closed[first]:
+            line = np.vstack([line, line[:1]])
+        lines.append(line)
+    return lines
+
+
+if __name__ == '__main__':
+    x = y = np.arange(3.0)
+    values = np.array([[1.0], [-1.0], [-1.0], [-1.0]])
+    print(cell_contours(x, y, [0], [0], values, np.ones((4, 1), dtype=bool)))
+    # Expected output: [array([[0.5, 0. ],
+    #        [0. , 0.5]])]
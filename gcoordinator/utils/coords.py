@@ -1,8 +1,10 @@
 import numpy as np
+from gcoordinator.utils.geometry import segment_lengths, sum_by_segment
 
 def get_distances_between_coords(coordinates: np.ndarray) -> np.ndarray:
     """
     Given a list of coordinates, calculate the distance between the nth and n+1st coordinates and store it in the nth ndarray of the distance.
+    Same as gcoordinator.utils.geometry.segment_lengths.
     
     Args:
     coordinates (np.ndarray): A numpy array of shape (n, m) where n is the number of coordinates and m is the number of dimensions
@@ -10,11 +12,26 @@ def get_distances_between_coords(coordinates: np.ndarray) -> np.ndarray:
     Returns:
     np.ndarray: A numpy array of shape (n-1,) containing the distances between the coordinates
     """
-    distances = np.empty(coordinates.shape[0] - 1)
-    for i in range(coordinates.shape[0] - 1):
-        distance = np.linalg.norm(coordinates[i+1] - coordinates[i])
-        distances[i] = distance
-    return distances
+    return segment_lengths(coordinates)
+
+
+def get_subdivision_indices(counts) -> tuple:
+    """
+    Given the number of sub-points each segment is divided into, return for every
+    sub-point the index of its segment and its 1-based step within that segment.
+    This allows all sub-points of a subdivided path to be computed at once.
+
+    Args:
+    counts (array_like): An integer array of shape (n,) with the number of sub-points of each segment
+
+    Returns:
+    tuple: (segment_index, step), two integer arrays of shape (sum(counts),)
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    segment_index = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    step = np.arange(len(segment_index)) - offsets[segment_index] + 1
+    return segment_index, step
 
 
 if __name__ == '__main__':
@@ -22,4 +39,14 @@ if __name__ == '__main__':
     coordinates = np.array([[0, 0, 0], [1, 1, 1], [2, 2, 2]])
     distances = get_distances_between_coords(coordinates)
     print(distances)
-    # Expected output: [1.73205081 1.73205081]
\ No newline at end of file
+    # Expected output: [1.73205081 1.73205081]
+
+    # Test get_subdivision_indices
+    segment_index, step = get_subdivision_indices([2, 0, 3])
+    print(segment_index, step)
+    # Expected output: [0 0 2 2 2] [1 2 1 2 3]
+
+    # Test sum_by_segment
+    sums = sum_by_segment(np.array([1.0, 2.0, 3.0, 4.0, 5.0]), [2, 0, 3])
+    print(sums)
+    # Expected output: [ 3.  0. 12.]
\ No newline at end of file
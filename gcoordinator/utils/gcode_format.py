@@ -0,0 +1,85 @@
+import numpy as np
+
+
+def format_g1_block(feed, axes, extrusion) -> str:
+    """
+    Renders a block of extruding G1 moves in one batched formatting operation.
+
+    Every line has the form ``G1 F{feed} <W1>{v1:.5f} <W2>{v2:.5f} ... E{e:.5f}``,
+    which is exactly what the kinematics classes used to build with one f-string
+    concatenation per word and per segment.  Here the values of all lines are
+    stacked into a single array and formatted with one ``%`` operation on a
+    repeated line template, which is an order of magnitude faster for long paths.
+
+    Args:
+        feed: The feed rate written after ``F``. It is formatted with ``str()``,
+            so ints stay ints (``F2400``) and floats stay floats (``F2400.0``).
+        axes (list): A list of ``(word, values)`` pairs, e.g.
+            ``[('X', x), ('Y', y), ('Z', z), ('B', tilt)]``. All value arrays
+            must have the same length as ``extrusion``.
+        extrusion (numpy.ndarray): The extrusion amount of each line.
+
+    Returns:
+        str: The G-code block, one line per element of ``extrusion``.
+    """
+    line = g1_line_template(feed, [word for word, _ in axes])
+    return format_lines(line, [values for _, values in axes] + [extrusion])
+
+
+def g1_line_template(feed, words) -> str:
+    """
+    Returns the %-format template of an extruding G1 line,
+    ``G1 F{feed} <W1>%.5f <W2>%.5f ... E%.5f`` followed by a newline.
+    Literal ``%`` characters of feed and words are escaped.
+    """
+    # escape user supplied text so that it survives the %-formatting
+    line = escape_template(f'G1 F{feed} ')
+    for word in words:
+        line += escape_template(word) + '%.5f '
+    return line + 'E%.5f\n'
+
+
+def arc_line_template(command, feed) -> str:
+    """
+    Returns the %-format template of an extruding arc move,
+    ``<command> F{feed} X%.5f Y%.5f Z%.5f I%.5f J%.5f E%.5f`` followed by a newline,
+    where command is 'G2' (clockwise) or 'G3' (counterclockwise) and I, J are the
+    offsets of the center from the start point.
+    """
+    return escape_template(f'{command} F{feed} ') + 'X%.5f Y%.5f Z%.5f I%.5f J%.5f E%.5f\n'
+
+
+def escape_template(txt: str) -> str:
+    """Escapes the literal ``%`` characters of txt for use in a %-format template."""
+    return txt.replace('%', '%%')
+
+
+def format_lines(template: str, columns) -> str:
+    """
+    Formats one copy of template per row of the value columns, in one ``%`` operation.
+
+    Args:
+        template (str): A %-format template with one ``%.5f`` (or similar)
+            placeholder per column.
+        columns (list): Value arrays of equal length, in placeholder order.
+
+    Returns:
+        str: The concatenated formatted rows.
+    """
+    columns = [np.asarray(values, dtype=float) for values in columns]
+    n_rows = len(columns[0]) if columns else 0
+    if n_rows == 0:
+        return ''
+    values = np.column_stack(columns).ravel().tolist()
+    return (template * n_rows) % tuple(values)
+
+
+if __name__ == '__main__':
+    x = np.array([1.0, 2.0])
+    y = np.array([0.5, -0.5])
+    z = np.array([0.2, 0.2])
+    e = np.array([0.01, 0.02])
+    print(format_g1_block(2400, [('X', x), ('Y', y), ('Z', z)], e), end='')
+    # Expected output:
+    # G1 F2400 X1.00000 Y0.50000 Z0.20000 E0.01000
+    # G1 F2400 X2.00000 Y-0.50000 Z0.20000 E0.02000
@@ -0,0 +1,162 @@
+"""
+Vectorized polyline simplification (Ramer-Douglas-Peucker).
+
+The Ramer-Douglas-Peucker algorithm keeps the end points of a polyline and,
+recursively, the point farthest from the chord between two kept points, as long
+as that distance exceeds the tolerance. Here the recursion is unrolled into
+rounds: every round measures the distances of the interior points of all open
+intervals of all polylines at once, closes the intervals whose farthest point is
+within the tolerance and splits the others at their farthest point. The number
+of rounds is the depth of the recursion (about log2 of the number of points for
+smooth curves), and the work per round is a few array operations.
+
+The distance of a removed point from the chord that replaces it is its chord
+error. simplify_polylines returns the chord errors of all removed points, which
+chord_error_stats summarizes.
+"""
+import numpy as np
+
+
+MAX_ROUNDS = 256 # the intervals still open after this many rounds keep all their points
+
+
+def point_segment_distances(points, starts, ends) -> np.ndarray:
+    """
+    Returns the distance of every point from the segment between the corresponding
+    start and end point (from the start point if both coincide).
+
+    Args:
+        points, starts, ends (numpy.ndarray): Shape (n, m).
+
+    Returns:
+        numpy.ndarray: Shape (n,).
+    """
+    chord  = ends - starts
+    offset = points - starts
+    length2 = np.sum(chord**2, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(length2 > 0, np.sum(offset * chord, axis=1) / length2, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    return np.sqrt(np.sum((offset - t[:, None] * chord)**2, axis=1))
+
+
+def simplify_polylines(points, offsets, tolerance, fixed=None, error_columns=3) -> tuple:
+    """
+    Simplifies many polylines at once with the Ramer-Douglas-Peucker algorithm.
+
+    Args:
+        points (array_like): Shape (N, m). The points of all polylines. Extra columns (e.g.
+            scaled rotation angles) take part in the distances like coordinates do.
+        offsets (array_like): Shape (n_polylines + 1,). The points of the i-th polyline are
+            points[offsets[i]:offsets[i+1]].
+        tolerance (float): The largest distance of a removed point from its chord.
+        fixed (numpy.ndarray): Shape (N,), bool, or None. Points that are always kept.
+        error_columns (int): The number of leading columns the chord errors are measured in.
+
+    Returns:
+        tuple: (keep, errors), keep of shape (N,) (bool, True for the points that are kept)
+        and errors of shape (N - keep.sum(),), the chord error of every removed point,
+        measured in the first error_columns columns.
+    """
+    points  = np.asarray(points, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    keep = np.zeros(len(points), dtype=bool)
+    # the end points of every polyline (with at least one point) are kept
+    lengths = np.diff(offsets)
+    keep[offsets[:-1][lengths > 0]] = True
+    keep[offsets[1:][lengths > 0] - 1] = True
+    if fixed is not None:
+        keep |= np.asarray(fixed, dtype=bool)
+
+    # the initial intervals run from every kept point to the next one of the same polyline
+    kept   = np.flatnonzero(keep)
+    starts, ends = kept[:-1], kept[1:]
+    polyline = np.searchsorted(offsets, kept, side='right')
+    same = polyline[:-1] == polyline[1:]
+    starts, ends = starts[same], ends[same]
+
+    errors = []
+    for _ in range(MAX_ROUNDS):
+        # intervals without interior points are done
+        open_ = ends - starts > 1
+        starts, ends = starts[open_], ends[open_]
+        if len(starts) == 0:
+            break
+        counts  = ends - starts - 1
+        group   = np.concatenate([[0], np.cumsum(counts)])
+        run     = np.repeat(np.arange(len(starts)), counts)
+        index   = np.arange(group[-1]) - np.repeat(group[:-1] - starts - 1, counts)
+        distances = point_segment_distances(points[index], points[starts[run]], points[ends[run]])
+        farthest  = np.maximum.reduceat(distances, group[:-1])
+
+        done = farthest <= tolerance
+        removed = done[run]
+        errors.append(point_segment_distances(points[index[removed], :error_columns],
+                                              points[starts[run[removed]], :error_columns],
+                                              points[ends[run[removed]], :error_columns]))
+
+        # split the other intervals at their (first) farthest point
+        at_max = np.flatnonzero(distances == farthest[run])
+        intervals, first = np.unique(run[at_max], return_index=True)
+        split = np.empty(len(starts), dtype=np.int64)
+        split[intervals] = index[at_max[first]]
+        keep[split[~done]] = True
+        starts, split, ends = starts[~done], split[~done], ends[~done]
+        starts, ends = np.concatenate([starts, split]), np.concatenate([split, ends])
+    else:
+        # give up on the intervals that are still open: keep all their points
+        for start, end in zip(starts, ends):
+            keep[start:end] = True
+
+    errors = np.concatenate(errors) if errors else np.empty(0)
+    return keep, errors
+
+
+def chord_error_stats(n_points, n_kept, errors) -> dict:
+    """
+    Summarizes the chord errors of a simplification.
+
+    Args:
+        n_points (int): The number of points before the simplification.
+        n_kept (int): The number of points kept.
+        errors (numpy.ndarray): The chord errors of the removed points.
+
+    Returns:
+        dict: {'points', 'kept', 'removed', 'max_error', 'mean_error', 'rms_error'}
+    """
+    errors = np.asarray(errors, dtype=float)
+    return {
+        'points'    : int(n_points),
+        'kept'      : int(n_kept),
+        'removed'   : int(n_points - n_kept),
+        'max_error' : float(errors.max()) if len(errors) else 0.0,
+        'mean_error': float(errors.mean()) if len(errors) else 0.0,
+        'rms_error' : float(np.sqrt(np.mean(errors**2))) if len(errors) else 0.0,
+    }
+
+
+def merge_chord_error_stats(a, b) -> dict:
+    """
+    Returns the chord_error_stats of two simplifications together.
+    """
+    removed = a['removed'] + b['removed']
+    def weighted(key, power=1):
+        if removed == 0:
+            return 0.0
+        return ((a[key]**power * a['removed'] + b[key]**power * b['removed']) / removed)**(1 / power)
+    return {
+        'points'    : a['points'] + b['points'],
+        'kept'      : a['kept'] + b['kept'],
+        'removed'   : removed,
+        'max_error' : max(a['max_error'], b['max_error']),
+        'mean_error': weighted('mean_error'),
+        'rms_error' : weighted('rms_error', 2),
+    }
+
+
+if __name__ == '__main__':
+    x = np.linspace(0, 10, 11)
+    points = np.column_stack([x, np.where(x == 5, 1.0, 0.0), np.zeros_like(x)])
+    keep, errors = simplify_polylines(points, [0, 11], 0.1)
+    print(np.flatnonzero(keep), errors.max())
+    # Expected output: [ 0  4  5  6 10] 0.0
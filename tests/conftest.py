@@ -0,0 +1,29 @@
+import json
+import pathlib
+import pytest
+import gcoordinator as gc
+
+
+SAMPLE_SETTINGS = pathlib.Path(__file__).resolve().parents[1] / 'sample_settings' / 'settings.json'
+
+
+@pytest.fixture
+def load_kinematics(tmp_path, monkeypatch):
+    """
+    Runs the test in a temporary directory (gcoordinator writes .temp_config.json to the
+    working directory) and returns a function that loads the sample settings with the
+    given kinematics.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def load(kinematics='Cartesian'):
+        with open(SAMPLE_SETTINGS) as f:
+            settings = json.load(f)
+        settings['Hardware']['kinematics'] = kinematics
+        config_path = tmp_path / f'settings_{kinematics}.json'
+        with open(config_path, 'w') as f:
+            json.dump(settings, f)
+        gc.load_settings(str(config_path))
+        return settings
+
+    return load
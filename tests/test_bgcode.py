@@ -0,0 +1,71 @@
+"""
+Round trip of the binary G-code writer and reader: the decoded G-code is the text
+that was written, byte for byte.
+"""
+import io
+import numpy as np
+import pytest
+import gcoordinator as gc
+from gcoordinator.bgcode import BGCodeWriter, decode_bgcode, load_bgcode, encode_meatpack, decode_meatpack
+
+
+TEXTS = {
+    'plain'              : 'G28\nG1 F1200 X10.00000 Y20.00000 Z0.20000 E0.01000\nM84\n',
+    'odd_length_lines'   : 'G1\nG1 X1\n\nM84 S\nX\n',
+    'non_ascii_comments' : '; Düse 0,4 mm ✓\nG1 X1.5 ; 移動\nM117 Привет\n',
+    'missing_final_newline': 'G28\nG1 X1.5 Y2.5\nM84 ; end',
+    'empty'              : '',
+}
+
+
+@pytest.mark.parametrize('text', TEXTS.values(), ids=TEXTS.keys())
+def test_meatpack_round_trip_of_every_prefix(text):
+    data = text.encode('utf-8')
+    for end in range(len(data) + 1):
+        assert decode_meatpack(encode_meatpack(data[:end])) == data[:end]
+
+
+@pytest.mark.parametrize('encoding, compression', [('meatpack', 'deflate'), ('meatpack', 'none'),
+                                                   ('none', 'deflate'), ('none', 'none')])
+@pytest.mark.parametrize('text', TEXTS.values(), ids=TEXTS.keys())
+def test_writer_round_trip(text, encoding, compression):
+    f = io.BytesIO()
+    metadata = {'printer': {'kinematics': 'Cartesian'}, 'slicer': {'comment': 'ä=ö'}}
+    writer = BGCodeWriter(f, metadata, encoding=encoding, compression=compression, block_size=16)
+    for i in range(0, len(text), 7): # chunks that do not end at line ends
+        writer.write(text[i:i + 7])
+    writer.close()
+    decoded = decode_bgcode(f.getvalue())
+    assert decoded['gcode'] == text
+    assert decoded['printer'] == {'kinematics': 'Cartesian'}
+    assert decoded['slicer'] == {'comment': 'ä=ö'}
+    assert writer.text_bytes == len(text.encode('utf-8'))
+
+
+def test_corrupted_block_is_rejected():
+    f = io.BytesIO()
+    writer = BGCodeWriter(f)
+    writer.write(TEXTS['plain'])
+    writer.close()
+    data = bytearray(f.getvalue())
+    data[-6] ^= 0x01
+    with pytest.raises(ValueError):
+        decode_bgcode(bytes(data))
+
+
+def test_saved_bgcode_matches_the_gcode_file(load_kinematics, tmp_path):
+    load_kinematics('Cartesian')
+    (tmp_path / 'start.gcode').write_text('; Düse 0,4 mm\nG28\n', encoding='utf-8')
+    (tmp_path / 'end.gcode').write_text('M84 ; end', encoding='utf-8') # no final newline
+    arg = np.linspace(0, 2 * np.pi, 51) # 50 segments, lines of odd and even length
+    full_object = [gc.Path(10 * np.cos(arg), 10 * np.sin(arg), np.full_like(arg, 0.2 * (i + 1)))
+                   for i in range(3)]
+    gcode = gc.GCode(full_object)
+    gcode.start_gcode(str(tmp_path / 'start.gcode'))
+    gcode.end_gcode(str(tmp_path / 'end.gcode'))
+    gcode.save(str(tmp_path / 'out.gcode'))
+    gcode.save(str(tmp_path / 'out.bgcode'), format='bgcode')
+
+    text = (tmp_path / 'out.gcode').read_text(encoding='utf-8')
+    assert not text.endswith('\n')
+    assert load_bgcode(str(tmp_path / 'out.bgcode'))['gcode'] == text
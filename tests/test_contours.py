@@ -0,0 +1,74 @@
+"""
+The sparse marching squares of gcoordinator.utils.contours and the adaptive implicit
+infill built on it, against contourpy on the full grid.
+"""
+import numpy as np
+import pytest
+from contourpy import contour_generator
+import gcoordinator as gc
+from gcoordinator.infill_generator import _CustomImplicitInfillGenerator, _even_odd_grid_mask
+from gcoordinator.utils.contours import cell_contours
+
+
+def segment_set(lines, decimals=9):
+    segments = set()
+    for line in lines:
+        points = [tuple(p) for p in np.round(line, decimals)]
+        segments.update(tuple(sorted(pair)) for pair in zip(points[:-1], points[1:]))
+    return segments
+
+
+def all_cells(z):
+    n_y, n_x = z.shape
+    rows, cols = np.meshgrid(np.arange(n_y - 1), np.arange(n_x - 1), indexing='ij')
+    rows, cols = rows.ravel(), cols.ravel()
+    values = np.stack([z[rows, cols], z[rows, cols + 1], z[rows + 1, cols + 1], z[rows + 1, cols]])
+    return rows, cols, values
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_cell_contours_match_contourpy(seed):
+    rng = np.random.default_rng(seed)
+    n_y, n_x = rng.integers(3, 30, 2)
+    x = np.sort(rng.uniform(0, 10, n_x))
+    y = np.sort(rng.uniform(0, 10, n_y))
+    X, Y = np.meshgrid(x, y)
+    z = np.sin(X * rng.uniform(0.5, 3)) + np.cos(Y * rng.uniform(0.5, 3)) + rng.normal(0, 0.3, X.shape)
+    if seed % 2:
+        # masked nodes: quads with three valid corners are contoured as triangles
+        z[rng.random(z.shape) < 0.15] = np.nan
+    expected = contour_generator(x=x, y=y, z=z).lines(0.0)
+
+    rows, cols, values = all_cells(z)
+    lines = cell_contours(x, y, rows, cols, values, np.ones(values.shape, dtype=bool))
+    assert len(lines) == len(expected)
+    assert sum(len(line) for line in lines) == sum(len(line) for line in expected)
+    assert segment_set(lines) == segment_set(expected)
+
+
+def test_adaptive_contours_match_full_evaluation(load_kinematics):
+    load_kinematics('Cartesian')
+    def gyroid(X, Y, z):
+        p = 2 * np.pi / 6.0
+        return np.sin(X * p) * np.cos(Y * p) + np.sin(Y * p) * np.cos(z * p) + np.sin(z * p) * np.cos(X * p)
+
+    arg = np.linspace(0, 2 * np.pi, 200)
+    outer = gc.Path(20 * np.cos(arg), 14 * np.sin(arg), np.full_like(arg, 0.4))
+    hole  = gc.Path(5 * np.cos(-arg) + 3, 5 * np.sin(-arg), np.full_like(arg, 0.4))
+    boundary = gc.PathList([outer, hole])
+    generator = _CustomImplicitInfillGenerator(gyroid, 0.1, adaptive_levels=3)
+    lines = generator._adaptive_contours(boundary, 0.4)
+
+    # the same fine grid, evaluated and masked everywhere
+    coarse_step = 0.1 * 8
+    n_x = int(np.ceil(40 / coarse_step)) * 8 + 1
+    n_y = int(np.ceil((outer.y.max() - outer.y.min()) / coarse_step)) * 8 + 1
+    x = np.linspace(outer.x.min(), outer.x.max(), n_x)
+    y = np.linspace(outer.y.min(), outer.y.max(), n_y)
+    X, Y = np.meshgrid(x, y)
+    inside = _even_odd_grid_mask([np.column_stack([p.x, p.y]) for p in boundary.paths], x, y)
+    z = gyroid(X, Y, 0.4) * np.where(inside, -1.0, np.nan)
+    expected = contour_generator(x=x, y=y, z=z).lines(0.0)
+
+    assert len(lines) == len(expected)
+    assert segment_set(lines, 7) == segment_set(expected, 7)
@@ -0,0 +1,26 @@
+"""
+G-code formatting of the moves written by GCode.
+"""
+import numpy as np
+import gcoordinator as gc
+
+
+def test_first_travel_is_formatted_like_the_moves(load_kinematics, tmp_path):
+    load_kinematics('Cartesian')
+    gc.configure_precision(float32=True)
+    try:
+        arg  = np.linspace(0, 2 * np.pi, 20)
+        wall = gc.Path(10 * np.cos(arg), 10 * np.sin(arg), np.full_like(arg, 0.2))
+        assert wall.z.dtype == np.float32
+        (tmp_path / 'start.gcode').write_text('G28\n')
+        (tmp_path / 'end.gcode').write_text('M84\n')
+        gcode = gc.GCode([wall])
+        gcode.start_gcode(str(tmp_path / 'start.gcode'))
+        gcode.end_gcode(str(tmp_path / 'end.gcode'))
+        gcode.save(str(tmp_path / 'out.gcode'))
+    finally:
+        gc.configure_precision(float32=False)
+    lines = (tmp_path / 'out.gcode').read_text().splitlines()
+    first_travel = next(line for line in lines if line.startswith('G1 ') and ' E' not in line)
+    x, y = 10 + wall.x_origin, wall.y_origin
+    assert first_travel == f'G1 F{wall.travel_speed} X{x:.5f} Y{y:.5f} Z0.20000'
@@ -0,0 +1,141 @@
+"""
+Parity of the vectorized update_attrs of the subdividing kinematics with the
+per-point loops they replaced, which are kept here as the reference.
+"""
+import math
+import numpy as np
+import pytest
+import gcoordinator as gc
+
+
+def legacy_bed_rotate(x, y, z, rot, div_distance, pre_move_div=10):
+    # the loop of BedRotate.update_attrs before it was vectorized
+    coords = []
+    sub_segment_cnt = []
+    ppx = px = x[0]
+    ppy = py = y[0]
+    ppz = pz = z[0]
+    prot = rot[0]
+    bx2 = px * math.cos(-prot) - py * math.sin(-prot)
+    by2 = px * math.sin(-prot) + py * math.cos(-prot)
+    bz2 = pz
+    coords.append((bx2, by2, bz2))
+    for (nx, ny, nz, nrot) in zip(x[1:], y[1:], z[1:], rot[1:]):
+        Dis = 0.0
+        for i in range(pre_move_div):
+            bx1 = (nx - px) * (i+1) / pre_move_div + px
+            by1 = (ny - py) * (i+1) / pre_move_div + py
+            bz1 = (nz - pz) * (i+1) / pre_move_div + pz
+            brot = (nrot - prot) * (i+1) / pre_move_div + prot
+            bx2 = bx1 * math.cos(-brot) - by1 * math.sin(-brot)
+            by2 = bx1 * math.sin(-brot) + by1 * math.cos(-brot)
+            bz2 = bz1
+            Dis += math.sqrt((bx2-ppx)**2 + (by2-ppy)**2 + (bz2-ppz)**2)
+            ppx, ppy, ppz = bx2, by2, bz2
+        div = int(np.ceil(Dis / div_distance))
+        sub_segment_cnt.append(div)
+        for i in range(div):
+            bx1 = (nx - px) * (i+1) / div + px
+            by1 = (ny - py) * (i+1) / div + py
+            bz1 = (nz - pz) * (i+1) / div + pz
+            brot = (nrot - prot) * (i+1) / div + prot
+            bx2 = bx1 * math.cos(-brot) - by1 * math.sin(-brot)
+            by2 = bx1 * math.sin(-brot) + by1 * math.cos(-brot)
+            bz2 = bz1
+            coords.append((bx2, by2, bz2))
+        px, py, pz, prot = bx2, by2, bz2, brot
+    return np.array(coords), np.array(sub_segment_cnt, dtype=np.int64)
+
+
+def _bed_tilt_bc_point(x, y, z, rot, tilt):
+    bx2 = x * math.cos(tilt) - z * math.sin(tilt)
+    by2 = y
+    bz2 = x * math.sin(tilt) + z * math.cos(tilt)
+    bx3 = bx2 * math.cos(-rot) - by2 * math.sin(-rot)
+    by3 = bx2 * math.sin(-rot) + by2 * math.cos(-rot)
+    return bx3, by3, bz2
+
+
+def _bed_tilt_bc_norm(rot, tilt):
+    return (math.cos(rot) * math.sin(-tilt), -math.sin(rot) * math.sin(-tilt), math.cos(-tilt))
+
+
+def legacy_bed_tilt_bc(x, y, z, rot, tilt, div_distance, pre_move_div=10):
+    # the loop of BedTiltBC.update_attrs before it was vectorized
+    coords = []
+    norms = []
+    sub_segment_cnt = []
+    px, py, pz, prot, ptilt = x[0], y[0], z[0], rot[0], tilt[0]
+    bx3, by3, bz3 = _bed_tilt_bc_point(px, py, pz, prot, ptilt)
+    ppx, ppy, ppz = px, py, pz
+    coords.append((bx3, by3, bz3))
+    norms.append(_bed_tilt_bc_norm(prot, ptilt))
+    for (nx, ny, nz, nrot, ntilt) in zip(x[1:], y[1:], z[1:], rot[1:], tilt[1:]):
+        Dis = 0.0
+        for i in range(pre_move_div):
+            t = (i+1) / pre_move_div
+            brot  = (nrot - prot) * t + prot
+            btilt = (ntilt - ptilt) * t + ptilt
+            bx3, by3, bz3 = _bed_tilt_bc_point((nx - px) * t + px, (ny - py) * t + py,
+                                               (nz - pz) * t + pz, brot, btilt)
+            Dis += math.sqrt((bx3-ppx)**2 + (by3-ppy)**2 + (bz3-ppz)**2)
+            ppx, ppy, ppz = bx3, by3, bz3
+        div = int(np.ceil(Dis / div_distance))
+        sub_segment_cnt.append(div)
+        for i in range(div):
+            brot  = (nrot - prot) * (i+1) / div + prot
+            btilt = (ntilt - ptilt) * (i+1) / div + ptilt
+            bx3, by3, bz3 = _bed_tilt_bc_point((nx - px) * (i+1) / div + px, (ny - py) * (i+1) / div + py,
+                                               (nz - pz) * (i+1) / div + pz, brot, btilt)
+            coords.append((bx3, by3, bz3))
+            norms.append(_bed_tilt_bc_norm(brot, btilt))
+        px, py, pz, prot, ptilt = bx3, by3, bz3, brot, btilt
+    return np.array(coords), np.array(norms), np.array(sub_segment_cnt, dtype=np.int64)
+
+
+def random_paths(seed):
+    """
+    Random walks with the edge cases of the subdivision: zero-length segments
+    (repeated points with the same angles), single-point and two-point paths.
+    """
+    rng = np.random.default_rng(seed)
+    paths = []
+    for n in (1, 2, 3, 17, 120):
+        x = np.cumsum(rng.normal(0, 2, n)) + 30
+        y = np.cumsum(rng.normal(0, 2, n))
+        z = np.cumsum(np.abs(rng.normal(0, 0.1, n))) + 0.2
+        rot  = np.cumsum(rng.normal(0, 0.2, n))
+        tilt = np.cumsum(rng.normal(0, 0.1, n))
+        if n > 3:
+            # zero-length segments: repeat some points with their angles
+            repeat = rng.choice(n, size=n // 5, replace=False)
+            order  = np.sort(np.concatenate([np.arange(n), repeat]))
+            x, y, z, rot, tilt = x[order], y[order], z[order], rot[order], tilt[order]
+        paths.append((x, y, z, rot, tilt))
+    return paths
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bed_rotate_matches_legacy_loop(load_kinematics, seed):
+    settings = load_kinematics('BedRotate')
+    div_distance = settings['Kinematics']['BedRotate']['div_distance']
+    for x, y, z, rot, tilt in random_paths(seed):
+        path = gc.Path(x, y, z, rot=rot, tilt=tilt)
+        coords, counts = legacy_bed_rotate(x, y, z, rot, div_distance)
+        np.testing.assert_array_equal(path.sub_segment_cnt, counts)
+        np.testing.assert_allclose(path.coords, coords, rtol=0, atol=1e-9)
+        np.testing.assert_array_equal(path.norms, np.tile([0.0, 0.0, 1.0], (len(coords), 1)))
+        np.testing.assert_allclose(path.center, coords.mean(axis=0), rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bed_tilt_bc_matches_legacy_loop(load_kinematics, seed):
+    settings = load_kinematics('BedTiltBC')
+    div_distance = settings['Kinematics']['BedTiltBC']['div_distance']
+    for x, y, z, rot, tilt in random_paths(seed):
+        path = gc.Path(x, y, z, rot=rot, tilt=tilt)
+        coords, norms, counts = legacy_bed_tilt_bc(x, y, z, rot, tilt, div_distance)
+        np.testing.assert_array_equal(path.sub_segment_cnt, counts)
+        np.testing.assert_allclose(path.coords, coords, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(path.norms, norms, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(path.center, coords.mean(axis=0), rtol=0, atol=1e-9)
@@ -0,0 +1,86 @@
+"""
+Transformed paths share no mutable per-path attributes with the original and keep the compute dtype.
+"""
+import numpy as np
+import pytest
+import gcoordinator as gc
+
+
+def make_path():
+    path = gc.Path(np.arange(4.0), np.zeros(4), np.full(4, 0.2), print_speed=1200)
+    path.segment_extrusion_multiplier = np.ones(3)
+    path.travel_path = [np.array([5.0]), np.array([5.0]), np.array([1.0])]
+    return path
+
+
+def assert_detached(original, moved):
+    moved.segment_extrusion_multiplier[0] = 2.0
+    moved.travel_path[0][0] = -5.0
+    moved.optional_settings['print_speed'] = 600
+    np.testing.assert_array_equal(original.segment_extrusion_multiplier,
+                                  np.ones(len(original.segment_extrusion_multiplier)))
+    np.testing.assert_array_equal(original.travel_path[0], [5.0])
+    assert original.optional_settings['print_speed'] == 1200
+    assert moved.settings is original.settings
+
+
+def test_moved_path_is_detached(load_kinematics):
+    load_kinematics('Cartesian')
+    path = make_path()
+    moved = gc.Transform.move(path, x=1)
+    np.testing.assert_array_equal(moved.x, path.x + 1)
+    assert_detached(path, moved)
+
+
+def test_moved_bundle_is_detached(load_kinematics):
+    load_kinematics('Cartesian')
+    segments = np.array([[[0.0, 0.0, 0.2], [10.0, 0.0, 0.2]],
+                         [[10.0, 1.0, 0.2], [0.0, 1.0, 0.2]]])
+    bundle = gc.SegmentBundle(segments, sort=False, print_speed=1200)
+    bundle.segment_extrusion_multiplier = np.ones(2)
+    bundle.travel_path = [np.array([5.0]), np.array([5.0]), np.array([1.0])]
+    matrix = np.eye(4)
+    matrix[1, 3] = 1.0
+    moved = gc.Transform.affine(bundle, matrix)
+    np.testing.assert_array_equal(moved.segments[..., 1], segments[..., 1] + 1)
+    assert_detached(bundle, moved)
+
+
+def test_simplified_path_is_detached(load_kinematics):
+    load_kinematics('Cartesian')
+    path = make_path()
+    simplified = gc.Transform.simplify(path, tolerance=0.01)
+    np.testing.assert_array_equal(simplified.x, [0.0, 3.0])
+    np.testing.assert_array_equal(simplified.segment_extrusion_multiplier, [1.0])
+    assert_detached(path, simplified)
+
+
+def test_move_accepts_a_bundle(load_kinematics):
+    load_kinematics('Cartesian')
+    arg  = np.linspace(0, 2 * np.pi, 40)
+    wall = gc.Path(10 * np.cos(arg), 10 * np.sin(arg), np.full_like(arg, 0.2))
+    bundle = gc.Infill.line(wall, output='bundle')
+    assert isinstance(bundle, gc.SegmentBundle)
+    moved = gc.Transform.move(bundle, x=1, z=0.2)
+    assert isinstance(moved, gc.SegmentBundle)
+    np.testing.assert_allclose(moved.segments, bundle.segments + [1.0, 0.0, 0.2])
+
+
+@pytest.mark.parametrize('transform', [
+    lambda arg: gc.Transform.move(arg, x=1, yaw=0.3),
+    lambda arg: gc.Transform.stretch(arg, 2, 1, 1),
+    lambda arg: gc.Transform.rotate_xy(arg, 0.5),
+])
+def test_transforms_keep_float32(load_kinematics, transform):
+    load_kinematics('Cartesian')
+    gc.configure_precision(float32=True)
+    try:
+        arg  = np.linspace(0, 2 * np.pi, 40)
+        wall = gc.Path(10 * np.cos(arg), 10 * np.sin(arg), np.full_like(arg, 0.2))
+        bundle = gc.Infill.line(wall, output='bundle')
+        moved_wall, moved_bundle = transform(gc.PathList([wall, bundle], sort=False)).paths
+    finally:
+        gc.configure_precision(float32=False)
+    for column in (moved_wall.x, moved_wall.y, moved_wall.z, moved_wall.rot, moved_wall.tilt):
+        assert column.dtype == np.float32
+    assert moved_bundle.segments.dtype == np.float32
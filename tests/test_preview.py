@@ -0,0 +1,20 @@
+"""
+The preview payload packs the float32 coords of all paths in order.
+"""
+import msgpack
+import numpy as np
+import gcoordinator as gc
+from gcoordinator.preview import build_preview_payload
+
+
+def test_payload_coords_match_paths():
+    t = np.linspace(0, 2 * np.pi, 50)
+    paths = [gc.Path(10 * np.cos(t), 10 * np.sin(t), np.full_like(t, 0.2 * (i + 1))) for i in range(3)]
+    paths[1].travel_path = ([0.0, 1.0], [0.0, 1.0], [0.4, 0.4])
+    payload = msgpack.unpackb(build_preview_payload([gc.PathList(paths)]), raw=False)
+
+    expected = np.concatenate([np.asarray(path.coords, dtype=np.float32) for path in paths])
+    assert payload['path_lengths'] == [50, 50, 50]
+    assert payload['coords'] == expected.tobytes()
+    assert payload['travel_path_lengths'] == [0, 2, 0]
+    assert build_preview_payload([]) is None
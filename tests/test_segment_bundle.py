@@ -0,0 +1,36 @@
+"""
+Expansion of a SegmentBundle into Path objects with non-Cartesian kinematics.
+"""
+import numpy as np
+import gcoordinator as gc
+from gcoordinator.path_generator import flatten_path_list
+
+
+def make_bundle():
+    segments = np.array([[[0.0, 0.0, 0.2], [10.0, 0.0, 0.2]],
+                         [[10.0, 1.0, 0.2], [0.0, 1.0, 0.2]],
+                         [[0.0, 2.0, 0.2], [10.0, 2.0, 0.2]]])
+    return gc.SegmentBundle(segments, sort=False, print_speed=1200)
+
+
+def test_expansion_is_cached(load_kinematics):
+    load_kinematics('BedRotate')
+    bundle = make_bundle()
+    first = flatten_path_list([bundle])
+    assert len(first) == 3
+    assert all(a is b for a, b in zip(first, flatten_path_list([bundle])))
+    np.testing.assert_array_equal(first[1].coords[[0, -1]], bundle.segments[1])
+
+
+def test_reassigned_attributes_invalidate_the_cache(load_kinematics):
+    load_kinematics('BedTiltBC')
+    bundle = make_bundle()
+    first = flatten_path_list([bundle])
+    bundle.print_speed = 600
+    second = flatten_path_list([bundle])
+    assert second[0] is not first[0]
+    assert all(path.print_speed == 600 for path in second)
+    bundle.segments = bundle.segments[::-1].copy()
+    third = flatten_path_list([bundle])
+    np.testing.assert_array_equal(third[0].x, [0.0, 10.0])
+    np.testing.assert_array_equal(third[0].y, [2.0, 2.0])
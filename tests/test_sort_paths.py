@@ -0,0 +1,42 @@
+"""
+Nearest-neighbour ordering of PathList.sort_paths on degenerate entry points.
+"""
+import numpy as np
+import pytest
+from gcoordinator.path_generator import _EntryPointIndex, _nearest_neighbour_order
+
+
+def brute_force_order(starts, ends):
+    # the greedy ordering with a linear scan, ties go to the earlier path
+    remaining = list(range(1, len(starts)))
+    order = [0]
+    current_end = ends[0]
+    while remaining:
+        distances = [np.linalg.norm(starts[i] - current_end) for i in remaining]
+        path_id = remaining.pop(int(np.argmin(distances)))
+        order.append(path_id)
+        current_end = ends[path_id]
+    return order
+
+
+def degenerate_starts(kind, n, rng):
+    if kind == 'identical':
+        return np.tile([10.0, 20.0, 0.2], (n, 1))
+    if kind == 'collinear':
+        return np.column_stack([rng.permutation(n) * 0.5, np.full(n, 20.0), np.full(n, 0.2)])
+    # collinear up to a tiny jitter across the line
+    return np.column_stack([rng.uniform(0, 200, n), rng.uniform(0, 1e-6, n), np.full(n, 0.2)])
+
+
+@pytest.mark.parametrize('kind', ['identical', 'collinear', 'nearly_collinear'])
+def test_degenerate_entry_points(kind):
+    rng = np.random.default_rng(1)
+    n = 300
+    starts = degenerate_starts(kind, n, rng)
+    ends = starts + rng.uniform(-1, 1, (n, 3)) * [1, 1, 0]
+
+    index = _EntryPointIndex(starts, np.arange(n), n)
+    assert index.cell_size.size <= 4 * n
+
+    order = _nearest_neighbour_order(starts, ends)
+    assert [path_id for path_id, _ in order] == brute_force_order(starts, ends)